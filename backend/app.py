@@ -1,74 +1,253 @@
-﻿from flask import Flask, request, jsonify, render_template, send_from_directory
+﻿from flask import Blueprint, Flask, Response, abort, current_app, request, jsonify, render_template, send_from_directory, url_for
 from flask_cors import CORS, cross_origin
+import pymongo
 from pymongo import MongoClient
-from flask_bcrypt import Bcrypt
 import pickle
 import numpy as np
 import os
 import sys
-from datetime import datetime, timezone
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
 import json
-import ollama
-import joblib
 import requests
 from dotenv import load_dotenv
 import random
-import pandas as pd
+import threading
 import time
-from werkzeug.utils import secure_filename
+from werkzeug.local import LocalProxy
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.middleware.proxy_fix import ProxyFix
 import warnings
-import base64
+import hashlib
 import io
-from sklearn.exceptions import InconsistentVersionWarning
-
-app = Flask(__name__)
-CORS(app) 
-bcrypt = Bcrypt(app)
-
-warnings.filterwarnings("ignore", category=InconsistentVersionWarning) 
+from skill_gap import SkillGapEngine
+from ttl_cache import LRUCache
+from compiled_model import compile_model
+from stream_predictor import StreamPredictor
+from log_writer import BatchedLogWriter
+from job_cache import MongoCacheStore, StaleWhileRevalidateCache
+from http_client import CircuitBreaker, CircuitOpenError, UpstreamClient
+from job_aggregator import aggregate_listings
+from salary_trends import SalaryTrendStore
+from llm_scheduler import LLMScheduler, RouteConfig, SchedulerRejected
+from question_pool import QuestionPool
+from llm_client import LLMClient
+from llm_backends import create_backend
+from structured_output import IntField, Schema, StructuredGenerator, StructuredOutputError, TextField, TextListField
+from lazy_resources import ResourceRegistry
+from portfolio import ImageSource, PortfolioRenderer
+from image_assets import ImageAssetStore, stream_zip
+from upload_store import TEMP_SUFFIXES, StreamingUploadRequest, UploadJanitor, UploadStore, UploadTooLarge
+from password_hasher import PasswordHasher, PasswordHasherBusy, workers_per_process
+from rate_limit import RateLimiter
+from concurrent.futures import ThreadPoolExecutor
+
+# Routes live on a blueprint and create_app() builds the Flask app around it; importing
+# this module builds no app and touches neither the network nor the disk. Models and
+# database clients are lazy resources that load on first use (or up front with APP_PRELOAD=1).
+api = Blueprint('api', __name__)
+resources = ResourceRegistry()
 
 # Loading environment variables from .env file
 load_dotenv()
 ADZUNA_APP_ID = os.getenv('ADZUNA_APP_ID')
 ADZUNA_APP_KEY = os.getenv('ADZUNA_APP_KEY')
 ADZUNA_LOCATION = os.getenv('ADZUNA_LOCATION', 'us')
+ADZUNA_API_URL = os.getenv('ADZUNA_API_URL', 'https://api.adzuna.com/v1/api')
 
 # CONNECTING MONGODB ->
-client = MongoClient("mongodb://localhost:27017/")
-db = client['career_guide_db']
-users_collection = db['users']
-try:
-    client.admin.command('ping')
-    print("MongoDB connection successful!")
-except Exception as e:
-    print(f"ERROR: Failed to connect to MongoDB! Is the server running? Details: {e}", file=sys.stderr)
+def connect_mongo():
+    client = MongoClient("mongodb://localhost:27017/")
+    try:
+        # Only a startup diagnostic; the first request using MongoDB should not wait 30s for it.
+        with pymongo.timeout(2):
+            client.admin.command('ping')
+        print("MongoDB connection successful!")
+    except Exception as e:
+        print(f"ERROR: Failed to connect to MongoDB! Is the server running? Details: {e}", file=sys.stderr)
+    return client
+
+
+# MongoClient starts monitor threads, so it is created per process on first use and
+# never before a fork. The proxies resolve to the real objects on every access.
+mongo_client = resources.register('mongodb', connect_mongo, required=True)
+db = LocalProxy(lambda: mongo_client.get()['career_guide_db'])
+users_collection = LocalProxy(lambda: db['users'])
+
+# Prediction logs are written in the background so endpoints never wait on MongoDB.
+prediction_logger = BatchedLogWriter(
+    db,
+    max_queue=int(os.getenv('LOG_QUEUE_SIZE', 10000)),
+    batch_size=int(os.getenv('LOG_BATCH_SIZE', 500)),
+    flush_interval=float(os.getenv('LOG_FLUSH_INTERVAL', 1.0)),
+    overflow=os.getenv('LOG_OVERFLOW_POLICY', 'spill'),
+    spill_path=os.getenv('LOG_SPILL_PATH', 'prediction_log_spill.jsonl')
+)
 
 
 # OLLAMA INTEGRATION ->
-MODEL_NAME = 'llama3.2:1b'
-print(f"Using Ollama with model: {MODEL_NAME} for Cover Letter & Mock Interview generation")
+MODEL_NAME = os.getenv('LLM_MODEL', 'llama3.2:1b')
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'ollama')
+# Backends: 'ollama' (default), 'openai' for any /v1/chat/completions server, or
+# 'stub' for a deterministic in-process model when load-testing the web tier.
+llm_backend = create_backend(
+    LLM_BACKEND,
+    base_url=os.getenv('LLM_OPENAI_BASE_URL', 'http://localhost:8000/v1'),
+    api_key=os.getenv('LLM_OPENAI_API_KEY'),
+    latency_ms=float(os.getenv('LLM_STUB_LATENCY_MS', 200)),
+    tokens_per_sec=float(os.getenv('LLM_STUB_TOKENS_PER_SEC', 50))
+)
+print(f"Using {LLM_BACKEND} backend with model: {MODEL_NAME} for Cover Letter & Mock Interview generation")
+
+# Every LLM call goes through one scheduler so a burst of slow cover letters cannot
+# starve interactive interview grading. Lower priority numbers are served first.
+LLM_MAX_QUEUE = int(os.getenv('LLM_MAX_QUEUE', 20))
+
+
+def llm_route(name, priority, max_concurrency, max_wait):
+    """Scheduler config for one route; LLM_CONCURRENCY_<ROUTE> overrides its concurrency cap."""
+    max_concurrency = int(os.getenv(f"LLM_CONCURRENCY_{name.upper()}", max_concurrency))
+    return name, RouteConfig(priority, max_concurrency=max_concurrency, max_wait=max_wait, max_queue=LLM_MAX_QUEUE)
+
+
+llm_scheduler = LLMScheduler(dict([
+    llm_route('interview_evaluate', priority=0, max_concurrency=2, max_wait=20),
+    llm_route('interview_question', priority=1, max_concurrency=1, max_wait=10),
+    llm_route('linkedin_audit', priority=2, max_concurrency=1, max_wait=30),
+    llm_route('cover_letter', priority=3, max_concurrency=1, max_wait=30),
+    llm_route('question_pool', priority=4, max_concurrency=1, max_wait=120)
+]), max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', 2)))
+
+# Keeps the model resident (keep_alive on every call plus periodic warm-up pings) and
+# records load vs. eval time per route so cold starts show up in /llm/stats.
+# LLM_MODEL_<ROUTE> (e.g. LLM_MODEL_COVER_LETTER) overrides the model for one route.
+LLM_ROUTE_MODELS = {
+    route: os.environ[f"LLM_MODEL_{route.upper()}"]
+    for route in llm_scheduler.routes if os.getenv(f"LLM_MODEL_{route.upper()}")
+}
+llm_client = LLMClient(
+    MODEL_NAME, llm_scheduler, llm_backend,
+    route_models=LLM_ROUTE_MODELS,
+    keep_alive=os.getenv('LLM_KEEP_ALIVE', '30m'),
+    cold_threshold_ms=float(os.getenv('LLM_COLD_THRESHOLD_MS', 500))
+)
+LLM_WARM_INTERVAL = float(os.getenv('LLM_WARM_INTERVAL', 600))
+
+
+def llm_user(data):
+    """Who an LLM job is queued for, so the scheduler can share slots fairly between users."""
+    data = data or {}
+    return data.get('user_email') or data.get('email') or data.get('userName') or request.remote_addr or 'anonymous'
+
+
+def llm_busy_response(error):
+    response = jsonify({"error": "The AI model is busy right now. Please try again shortly.", "reason": error.reason})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+@api.route('/llm/scheduler/stats', methods=['GET'])
+@cross_origin()
+def llm_scheduler_stats():
+    return jsonify(llm_scheduler.stats())
+
+
+# JSON routes stream their output, stop once the object is complete, repair it and
+# re-request only the fields that are still missing or invalid.
+structured_llm = StructuredGenerator(llm_client, max_followups=int(os.getenv('LLM_JSON_FOLLOWUPS', 1)))
+
+
+@api.route('/llm/stats', methods=['GET'])
+@cross_origin()
+def llm_client_stats():
+    return jsonify({**llm_client.stats(), 'structured_output': structured_llm.stats()})
+
+
+# Users resubmit the same profile or job description while iterating in the UI, so
+# generated audits and cover letters are cached by a hash of their normalized input
+# and the model. Cached requests use a seed derived from that hash, so identical input
+# gives identical output even after the entry expires; `regenerate: true` bypasses
+# the cache with a random seed and stores the fresh result.
+LLM_CACHE_SIZE = int(os.getenv('LLM_CACHE_SIZE', 1000))
+LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', 86400))
+llm_response_cache = LRUCache(maxsize=LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL or None)
+
+
+def llm_cache_key(route, *parts):
+    """Content address for an LLM result: route, model and whitespace-normalized inputs."""
+    normalized = [route, llm_client.model_for(route)] + [" ".join(str(part or '').split()) for part in parts]
+    return hashlib.sha256("\x1f".join(normalized).encode('utf-8')).hexdigest()
+
+
+def llm_seed(cache_key, regenerate):
+    return random.randint(1, 1000000) if regenerate else int(cache_key[:8], 16) % 1000000 + 1
+
+
+@api.route('/llm/cache/stats', methods=['GET'])
+@cross_origin()
+def llm_cache_stats():
+    return jsonify(llm_response_cache.stats())
+
+def _ignore_sklearn_version_warnings():
+    from sklearn.exceptions import InconsistentVersionWarning
+    warnings.filterwarnings("ignore", category=InconsistentVersionWarning)
+
+
+StreamModel = namedtuple('StreamModel', ['pipeline', 'predictor'])
+CareerModel = namedtuple('CareerModel', ['estimator', 'label_encoder', 'predictor'])
+
 
 # LOADING STREAM PREDICTION MODEL
-try:
-    stream_model = joblib.load('10_stream_predictor_model.pkl')
-    print("Pipeline model loaded successfully.")
-except Exception as e:
-    print(f"Error loading model: {e}")
-    model = None
+def load_stream_model():
+    import joblib
+    _ignore_sklearn_version_warnings()
+    try:
+        pipeline = joblib.load('10_stream_predictor_model.pkl')
+        print("Pipeline model loaded successfully.")
+    except Exception as e:
+        print(f"Error loading model: {e}")
+        return None
+
+    # Precomputed encodings + compiled forest, so requests skip DataFrame construction.
+    predictor = None
+    try:
+        predictor = StreamPredictor(pipeline)
+        print("Stream prediction fast path ready.")
+    except Exception as e:
+        print(f"WARNING: Stream fast path unavailable, using the pipeline directly: {e}")
+    return StreamModel(pipeline, predictor)
+
 
 # LOADING PROFESSION PREDICTION MODEL
-try:
-    with open('career_model.pkl', 'rb') as f:
-        model = pickle.load(f)
-    with open('label_encoder.pkl', 'rb') as f:
-        label_encoder = pickle.load(f)
-    print("Career Prediction model loaded successfully.")
-except FileNotFoundError:
-    print("WARNING: Career model files not found. Prediction route disabled.")
-    model = None
-except ModuleNotFoundError as e:
-    print(f"FATAL ERROR: Failed to load ML model due to missing module: {e}")
-    model = None
+def load_career_model():
+    _ignore_sklearn_version_warnings()
+    try:
+        with open('career_model.pkl', 'rb') as f:
+            model = pickle.load(f)
+        with open('label_encoder.pkl', 'rb') as f:
+            label_encoder = pickle.load(f)
+        print("Career Prediction model loaded successfully.")
+    except FileNotFoundError:
+        print("WARNING: Career model files not found. Prediction route disabled.")
+        return None
+    except ModuleNotFoundError as e:
+        print(f"FATAL ERROR: Failed to load ML model due to missing module: {e}")
+        return None
+
+    # Flat-array copy of the career model keeps sklearn out of the request path.
+    predictor = model
+    try:
+        predictor = compile_model(model)
+        print("Career Prediction model compiled to flat arrays.")
+    except Exception as e:
+        print(f"WARNING: Could not compile career model, using sklearn directly: {e}")
+    return CareerModel(model, label_encoder, predictor)
+
+
+# Models hold no sockets or threads, so they are safe to preload before forking.
+stream_model = resources.register('stream_model', load_stream_model, preload=True)
+career_model = resources.register('career_model', load_career_model, preload=True, required=True)
  
 
 rating_map = {
@@ -77,6 +256,23 @@ rating_map = {
 }
 
 
+def bounded_number(data, name, default, low, high, cast=int):
+    """
+    data[name] (or `default`) converted with `cast` and clamped to [low, high].
+    Raises ValueError with a message for the client if it is not a number.
+    """
+    value = data.get(name, default)
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        value = cast(value)
+        if value != value:  # NaN
+            raise ValueError
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be {'an integer' if cast is int else 'a number'}")
+    return max(low, min(value, high))
+
+
 
 JOB_DESCRIPTIONS = {
     "Data Scientist": """A Data Scientist explores large datasets to extract insights and develop predictive models. They clean, preprocess, and analyze data using statistical and machine learning techniques. Their work includes feature engineering, algorithm selection, and model validation. Data scientists collaborate with teams to solve business problems using data. They visualize results using dashboards and meaningful reports. They experiment with advanced techniques to improve accuracy and efficiency. Their insights support strategic planning and innovation. Their expertise drives data-driven decision-making.""",
@@ -133,94 +329,217 @@ IDEAL_SKILLS_DATA = {
 }
 
 
-def image_to_base64_data_uri(file_storage):
+def save_portfolio_image(file_storage):
+    """Store an uploaded image in the asset store; None (the template's stock photo) if it cannot be saved."""
+    if file_storage is None or file_storage.filename == '':
+        return None
     try:
-        file_content = file_storage.read()
-        filename = file_storage.filename.lower()
-        if filename.endswith('.png'):
-            mime_type = 'image/png'
-        elif filename.endswith(('.jpg', '.jpeg')):
-            mime_type = 'image/jpeg'
-        elif filename.endswith('.gif'):
-            mime_type = 'image/gif'
-        elif filename.endswith('.webp'):
-            mime_type = 'image/webp'
-        else:
-            mime_type = 'image/jpeg'
-    
-        base64_encoded = base64.b64encode(file_content).decode('utf-8')
-        return f"data:{mime_type};base64,{base64_encoded}"
-    
+        return image_assets.save(file_storage)
     except Exception as e:
-        print(f"Error converting image to base64: {e}")
-        return "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-
+        print(f"Error storing image {file_storage.filename}: {e}", file=sys.stderr)
+        return None
+
+
+# AUTHENTICATION ->
+
+# bcrypt runs in a process pool so a login burst does not hold the request workers.
+# BCRYPT_LOG_ROUNDS is the work factor for new hashes; logins with a hash of any
+# other cost are rehashed at this one.
+# Every web worker process gets its own pool, so by default each takes its share of
+# the CPUs (WEB_WORKERS is exported by gunicorn.conf.py) instead of all of them.
+password_hasher = PasswordHasher(
+    rounds=int(os.getenv('BCRYPT_LOG_ROUNDS', 12)),
+    workers=int(os.getenv('PASSWORD_HASH_WORKERS', workers_per_process(int(os.getenv('WEB_WORKERS', 1))))),
+    max_pending=int(os.getenv('PASSWORD_HASH_MAX_PENDING', 64)),
+    timeout=float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+)
+# Every signup/login attempt counts against the client IP; a whole class behind one
+# school NAT must fit in the burst. Failed logins also count against the email.
+auth_ip_limiter = RateLimiter(
+    per_minute=float(os.getenv('AUTH_IP_PER_MINUTE', 120)),
+    burst=int(os.getenv('AUTH_IP_BURST', 600))
+)
+login_email_limiter = RateLimiter(
+    per_minute=float(os.getenv('LOGIN_EMAIL_FAILURES_PER_MINUTE', 1)),
+    burst=int(os.getenv('LOGIN_EMAIL_FAILURE_BURST', 10))
+)
+
+
+def too_many_attempts_response(retry_after):
+    response = jsonify({"message": "Too many attempts. Please try again later."})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, int(min(retry_after, 3600) + 0.999)))
+    return response
+
+
+def hasher_busy_response(error):
+    response = jsonify({"message": "The server is busy. Please try again shortly.", "reason": error.reason})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def credentials(data):
+    """(email, password) from a signup/login body; email is trimmed and lower-cased."""
+    if not isinstance(data, dict):
+        return None, None
+    email, password = data.get('email'), data.get('password')
+    if not isinstance(email, str) or not isinstance(password, str) or not email.strip() or not password:
+        return None, None
+    return email.strip().lower(), password
+
+
+def find_user(email, typed):
+    """
+    The account for a normalized email. Accounts created before emails were
+    normalized are stored as typed at signup, so that spelling is tried as well.
+    """
+    return users_collection.find_one({'email': {'$in': list(dict.fromkeys([email, typed.strip()]))}})
 
 
-@app.route('/signup', methods=['POST'])
+@api.route('/signup', methods=['POST'])
 @cross_origin()
 def signup():
     data = request.json
-    if users_collection.find_one({'email': data['email']}):
+    email, password = credentials(data)
+    name = data.get('name') if email is not None else None
+    if not isinstance(name, str) or not name.strip():
+        return jsonify({"message": "Name, email and password are required"}), 400
+    retry_after = auth_ip_limiter.hit(request.remote_addr)
+    if retry_after:
+        return too_many_attempts_response(retry_after)
+    if find_user(email, data['email']):
         return jsonify({"message": "User already exists"}), 400
-    
-    hashed_password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+
+    try:
+        hashed_password = password_hasher.hash(password)
+    except PasswordHasherBusy as e:
+        return hasher_busy_response(e)
     users_collection.insert_one({
-        'name': data['name'], 
-        'email': data['email'], 
+        'name': name.strip(),
+        'email': email,
         'password': hashed_password
     })
     return jsonify({"message": "User created successfully"}), 201
 
-@app.route('/login', methods=['POST'])
+@api.route('/login', methods=['POST'])
 @cross_origin()
 def login():
     data = request.json
-    user = users_collection.find_one({'email': data['email']})
-    if user and bcrypt.check_password_hash(user['password'], data['password']):
-        return jsonify({"message": "Login successful", "name": user['name']}), 200
-    return jsonify({"message": "Invalid credentials"}), 401
+    email, password = credentials(data)
+    if email is None:
+        return jsonify({"message": "Email and password are required"}), 400
+    retry_after = login_email_limiter.retry_after(email) or auth_ip_limiter.hit(request.remote_addr)
+    if retry_after:
+        return too_many_attempts_response(retry_after)
+    user = find_user(email, data['email'])
+    try:
+        ok = user is not None and password_hasher.check(password, user['password'])
+    except PasswordHasherBusy as e:
+        return hasher_busy_response(e)
+    if not ok:
+        login_email_limiter.hit(email)
+        return jsonify({"message": "Invalid credentials"}), 401
+    if password_hasher.needs_rehash(user['password']):
+        # Only replaces the hash that was checked, in case the password changed meanwhile.
+        password_hasher.rehash_async(password, lambda hashed: users_collection.update_one(
+            {'_id': user['_id'], 'password': user['password']}, {'$set': {'password': hashed}}))
+    return jsonify({"message": "Login successful", "name": user['name']}), 200
+
+
+@api.route('/auth/stats', methods=['GET'])
+@cross_origin()
+def auth_stats():
+    return jsonify({"hasher": password_hasher.stats(), "ip_limiter": auth_ip_limiter.stats(),
+                    "email_limiter": login_email_limiter.stats()})
 
 
 
 
 # ROADMAP GENERATOR FEATURE ->
 
-def generate_roadmap(career, user_scores, ideal_scores):
-    """Generate a roadmap based on skill gap analysis."""
-    roadmap = []
-    skills = FEATURE_ORDER
-    for i in range(len(skills)):
-        gap = ideal_scores[i] - user_scores[i]
-        
-        if gap > 2:
-            roadmap.append({
-                "skill": skills[i],
-                "status": "Critical Gap",
-                "priority": 1,
-                "note": "High priority: Essential for this role."
-            })
-        elif gap > 0:
-            roadmap.append({
-                "skill": skills[i],
-                "status": "Improvement Needed",
-                "priority": 2,
-                "note": "Moderate priority: Refine these skills."
-            })
-    return sorted(roadmap, key=lambda x: x['priority'])
-  
+# Role x skill matrix and roadmap tables are compiled once here and shared by every request.
+skill_gap_engine = SkillGapEngine(FEATURE_ORDER, IDEAL_SKILLS_DATA)
+
+
+
+# PREDICTION CACHE ->
+
+# 17 skills x 7 ratings is a tiny input space and most users leave many skills at
+# "Not Interested", so model outputs are cached per encoded skill vector.
+PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', 50000))
+PREDICTION_CACHE_TTL = float(os.getenv('PREDICTION_CACHE_TTL', 3600))
+prediction_cache = LRUCache(maxsize=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL or None)
+
+
+def _career_confidences(matrix, predictions):
+    """
+    Per-class confidences that rank the classes the way predict() picks them, so the
+    top career is always the predicted one. The linear SVC has no predict_proba; its
+    one-vs-one votes, counted by predict's rule, are softmaxed, and tied classes get
+    equal confidences (top_careers() then keeps predict's lowest-index tie-break).
+    """
+    predictor = career_model.get().predictor
+    if hasattr(predictor, 'predict_proba'):
+        return predictor.predict_proba(matrix)
+    if hasattr(predictor, 'vote_counts'):
+        scores = predictor.vote_counts(matrix)
+    else:
+        # No vote counts to rank by (an uncompiled model): only the prediction is known.
+        scores = np.zeros((len(matrix), len(predictor.classes_)))
+        scores[np.arange(len(matrix)), np.searchsorted(predictor.classes_, predictions)] = 1.0
+    scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return scores / scores.sum(axis=1, keepdims=True)
+
+
+def career_scores(matrix):
+    """Predicted class index and class confidences per row, using the prediction cache."""
+    matrix = np.asarray(matrix, dtype=np.int8)
+    keys = [row.tobytes() for row in matrix]
+    results = [prediction_cache.get(key) for key in keys]
+    missing = {}
+    for i, (key, result) in enumerate(zip(keys, results)):
+        if result is None:
+            missing.setdefault(key, []).append(i)
+    if missing:
+        rows = [indices[0] for indices in missing.values()]
+        miss_matrix = matrix[rows]
+        predictions = career_model.get().predictor.predict(miss_matrix)
+        confidences = _career_confidences(miss_matrix, predictions)
+        for (key, indices), prediction, confidence in zip(missing.items(), predictions, confidences):
+            result = (int(prediction), confidence)
+            prediction_cache.set(key, result)
+            for i in indices:
+                results[i] = result
+    return np.array([r[0] for r in results]), [r[1] for r in results]
+
+
+def top_careers(confidences, k=3):
+    """Ranked top-k careers with confidences; equal confidences keep class order, as predict() does."""
+    order = np.argsort(-confidences, kind='stable')[:k]
+    classes = career_model.get().label_encoder.classes_
+    return [
+        {"career": classes[i], "confidence": round(float(confidences[i]), 4)}
+        for i in order
+    ]
+
 
 
 # PROFESSION PREDICTION FEATURE ->
 
-@app.route('/predict', methods=['POST'])
+@api.route('/predict', methods=['POST'])
 @cross_origin()
 def predict():
-    if model is None:
+    career = career_model.get()
+    if career is None:
         return jsonify({"error": "Prediction model is not available."}), 503
     data = request.json
     user_skills = data.get('skills', {})
     user_email = data.get('user_email', 'anonymous')
+    try:
+        top_k = bounded_number(data, 'top_k', 3, 1, len(career.label_encoder.classes_))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     feature_order = FEATURE_ORDER
     input_vector = []
     for feature in feature_order:
@@ -231,8 +550,8 @@ def predict():
     job_description = JOB_DESCRIPTIONS.get(predicted_role)
     
     try:
-        prediction_index = model.predict([np.array(input_vector)])[0]
-        predicted_role = label_encoder.inverse_transform([prediction_index])[0]
+        prediction_indices, confidences = career_scores([input_vector])
+        predicted_role = career.label_encoder.inverse_transform(prediction_indices)[0]
         
         job_description = JOB_DESCRIPTIONS.get(
             predicted_role, 
@@ -245,32 +564,188 @@ def predict():
             'timestamp': datetime.now(timezone.utc),
             'user_email': user_email
         }
-        
-        try:
-            db.career_predictions.insert_one(career_record)
-            print(f"Successfully logged career prediction: {predicted_role}")
-        except Exception as log_e:
-            print(f"ERROR logging career prediction to MongoDB: {log_e}")
+        prediction_logger.submit('career_predictions', career_record)
 
-        ideal_scores = IDEAL_SKILLS_DATA.get(predicted_role, [3] * len(FEATURE_ORDER))
-        roadmap_steps = generate_roadmap(predicted_role, user_numeric_scores, ideal_scores)
+        ideal_scores = skill_gap_engine.ideal_scores(predicted_role)
+        roadmap_steps = skill_gap_engine.roadmap(user_numeric_scores, predicted_role)
         return jsonify({
             "career": predicted_role,
             "description": job_description,
             "user_scores": user_numeric_scores,
             "ideal_scores": ideal_scores,
             "labels": FEATURE_ORDER,
-            "roadmap": roadmap_steps
+            "roadmap": roadmap_steps,
+            "closest_careers": skill_gap_engine.closest_roles(user_numeric_scores)[0],
+            "top_careers": top_careers(confidences[0], top_k)
         })
     except Exception as e:
         print(f"Prediction Runtime Error: {e}")
         return jsonify({"error": "Error during model prediction."}), 500
 
 
+def encode_skill_matrix(skill_dicts):
+    """Encode a list of skill-rating dicts into an (N, len(FEATURE_ORDER)) matrix."""
+    return np.array([
+        [rating_map.get(skills.get(f, 'Not Interested'), 0) for f in FEATURE_ORDER]
+        for skills in skill_dicts
+    ], dtype=np.int64).reshape(len(skill_dicts), len(FEATURE_ORDER))
+
+
+@api.route('/predict/batch', methods=['POST'])
+@cross_origin()
+def predict_batch():
+    """Predict careers for many skill profiles with a single model call."""
+    career = career_model.get()
+    if career is None:
+        return jsonify({"error": "Prediction model is not available."}), 503
+    data = request.json or {}
+    profiles = data.get('profiles')
+    if not isinstance(profiles, list) or not profiles:
+        return jsonify({"error": "A non-empty 'profiles' list is required."}), 400
+    default_email = data.get('user_email', 'anonymous')
+    try:
+        top_k = bounded_number(data, 'top_k', 3, 1, len(career.label_encoder.classes_))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    skill_dicts = [p.get('skills', {}) if isinstance(p, dict) else {} for p in profiles]
+
+    try:
+        user_matrix = encode_skill_matrix(skill_dicts)
+        prediction_indices, confidences = career_scores(user_matrix)
+        predicted_roles = career.label_encoder.inverse_transform(prediction_indices)
+        ideal_matrix = skill_gap_engine.ideal_matrix[skill_gap_engine.role_indices(predicted_roles)]
+        roadmaps = skill_gap_engine.roadmaps(user_matrix, predicted_roles)
+        closest = skill_gap_engine.closest_roles(user_matrix)
+    except Exception as e:
+        print(f"Batch Prediction Runtime Error: {e}")
+        return jsonify({"error": "Error during model prediction."}), 500
+
+    timestamp = datetime.now(timezone.utc)
+    results = []
+    career_records = []
+    for i, predicted_role in enumerate(predicted_roles.tolist()):
+        profile = profiles[i] if isinstance(profiles[i], dict) else {}
+        results.append({
+            "career": predicted_role,
+            "description": JOB_DESCRIPTIONS.get(
+                predicted_role,
+                f"A detailed description for the role: {predicted_role} is not yet available in our database."
+            ),
+            "user_scores": user_matrix[i].tolist(),
+            "ideal_scores": ideal_matrix[i].tolist(),
+            "roadmap": roadmaps[i],
+            "closest_careers": closest[i],
+            "top_careers": top_careers(confidences[i], top_k)
+        })
+        career_records.append({
+            'inputs_skills': skill_dicts[i],
+            'predicted_career': predicted_role,
+            'timestamp': timestamp,
+            'user_email': profile.get('user_email', default_email)
+        })
+
+    prediction_logger.submit_many('career_predictions', career_records)
+
+    return jsonify({
+        "labels": FEATURE_ORDER,
+        "count": len(results),
+        "results": results
+    })
+
+
+@api.route('/predict/cache/stats', methods=['GET'])
+@cross_origin()
+def prediction_cache_stats():
+    """Hit/miss/eviction counters of the career prediction cache."""
+    return jsonify(prediction_cache.stats())
+
+
+@api.route('/predict/log/stats', methods=['GET'])
+@cross_origin()
+def prediction_log_stats():
+    """Queue depth, throughput and flush latency of the background prediction logger."""
+    return jsonify(prediction_logger.stats())
+
+
+@api.route('/skill-gap', methods=['POST'])
+@cross_origin()
+def skill_gap():
+    """Skill shortfall of one profile against every known role."""
+    data = request.json or {}
+    try:
+        k = bounded_number(data, 'top_k', 3, 1, len(skill_gap_engine.roles))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    user_matrix = encode_skill_matrix([data.get('skills', {})])
+    return jsonify({
+        "labels": FEATURE_ORDER,
+        "roles": skill_gap_engine.roles,
+        "gaps": skill_gap_engine.gap_matrix(user_matrix)[0].tolist(),
+        "closest_careers": skill_gap_engine.closest_roles(user_matrix, k=k)[0]
+    })
+
+
 
 # JOB INSIGHTS FEATURE ->
 
-@app.route('/job-insights', methods=['POST'])
+# Adzuna answers are cached per (role, location, page); popular roles are served from
+# memory or the job_insights_cache collection instead of blocking on the API.
+job_insights_cache = StaleWhileRevalidateCache(
+    ttl=int(os.getenv('JOB_CACHE_TTL', 900)),
+    stale_ttl=int(os.getenv('JOB_CACHE_STALE_TTL', 3600)),
+    max_stale=int(os.getenv('JOB_CACHE_MAX_STALE', 86400)),
+    store=LocalProxy(resources.register('job_cache_store', lambda: MongoCacheStore(
+        db['job_insights_cache'], timeout=float(os.getenv('JOB_CACHE_STORE_TIMEOUT', 0.5))
+    )).get)
+)
+
+# Every live Adzuna fetch is queued for the daily salary rollups behind the trends endpoint.
+salary_trends = LocalProxy(resources.register('salary_trends', lambda: SalaryTrendStore(db['salary_trends'])).get)
+
+# Shared keep-alive connection pool with retries and a circuit breaker for Adzuna.
+adzuna_client = UpstreamClient(
+    'adzuna',
+    pool_size=int(os.getenv('ADZUNA_POOL_SIZE', 20)),
+    max_retries=int(os.getenv('ADZUNA_MAX_RETRIES', 2)),
+    breaker=CircuitBreaker(
+        failure_threshold=int(os.getenv('ADZUNA_BREAKER_THRESHOLD', 5)),
+        reset_timeout=float(os.getenv('ADZUNA_BREAKER_RESET', 30))
+    )
+)
+
+
+def fetch_adzuna_listings(role, location, page=1, results_per_page=5):
+    """Fetch one page of Adzuna results and trim it to the fields the frontend uses."""
+    url = f"{ADZUNA_API_URL}/jobs/{location}/search/{page}"
+    params = {
+        'app_id': ADZUNA_APP_ID,
+        'app_key': ADZUNA_APP_KEY,
+        'results_per_page': results_per_page,
+        'what': role,
+        'content-type': 'application/json'
+    }
+
+    response = adzuna_client.get(url, params=params)
+    response.raise_for_status()
+    job_data = response.json()
+    listings = []
+    for job in job_data.get('results', []):
+        listings.append({
+            'title': job.get('title'),
+            'company': job.get('company', {}).get('display_name', 'N/A'),
+            'location': job.get('location', {}).get('display_name', 'Remote'),
+            'salary_min': job.get('salary_min'),
+            'salary_max': job.get('salary_max'),
+            'url': job.get('redirect_url'),
+            'description': job.get('description', '')[:200]
+        })
+
+    print(f"Fetched {len(listings)} job listings for role: {role} from Adzuna")
+    salary_trends.record(role, location, listings)
+    return {"listings": listings, "count": job_data.get('count', 0)}
+
+
+@api.route('/job-insights', methods=['POST'])
 def get_job_insights():
     """
     Fetch live job market data from Adzuna API based on predicted job role.
@@ -287,38 +762,30 @@ def get_job_insights():
                 "error": "Adzuna API credentials not found.... Please set ADZUNA_APP_ID and ADZUNA_APP_KEY in .env file"
             }), 500
 
-        url = f"https://api.adzuna.com/v1/api/jobs/{location}/search/1"
-        params = {
-            'app_id': ADZUNA_APP_ID,
-            'app_key': ADZUNA_APP_KEY,
-            'results_per_page': 5,
-            'what': role,
-            'content-type': 'application/json'
-        }
-
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        job_data = response.json()
-        listings = []
-        for job in job_data.get('results', []):
-            listings.append({
-                'title': job.get('title'),
-                'company': job.get('company', {}).get('display_name', 'N/A'),
-                'location': job.get('location', {}).get('display_name', 'Remote'),
-                'salary_min': job.get('salary_min'),
-                'salary_max': job.get('salary_max'),
-                'url': job.get('redirect_url'),
-                'description': job.get('description', '')[:200]
-            })
-
-        print(f"Fetched {len(listings)} job listings for role: {role} from Adzuna")
-        
-        return jsonify({
-            "listings": listings,
-            "count": job_data.get('count', 0),
+        page = 1
+        cache_key = f"{role.strip().lower()}|{location.lower()}|{page}"
+        try:
+            result, cache_status = job_insights_cache.get(
+                cache_key, lambda: fetch_adzuna_listings(role, location, page)
+            )
+        except requests.exceptions.RequestException:
+            # Upstream is failing: fall back to an older cached answer if there is one.
+            result = job_insights_cache.peek(cache_key)
+            if result is None:
+                raise
+            cache_status = 'degraded'
+
+        response = jsonify({
+            "listings": result['listings'],
+            "count": result['count'],
             "role": role,
             "location": location
         })
+        response.headers['X-Cache'] = cache_status.upper()
+        return response
+    except CircuitOpenError:
+        print("ERROR: Adzuna circuit open, failing fast")
+        return jsonify({"error": "Job market service is temporarily unavailable. Please try again shortly."}), 503
     except requests.exceptions.Timeout:
         print("ERROR: Adzuna API request timed out")
         return jsonify({"error": "API request timed out. Please try again."}), 504
@@ -330,46 +797,157 @@ def get_job_insights():
         return jsonify({"error": str(e)}), 500
 
 
+@api.route('/job-insights/cache/stats', methods=['GET'])
+def job_insights_cache_stats():
+    return jsonify(job_insights_cache.stats())
+
+
+@api.route('/job-insights/upstream/stats', methods=['GET'])
+def job_insights_upstream_stats():
+    """Retry, circuit breaker and latency histogram metrics per outbound upstream."""
+    return jsonify({adzuna_client.name: adzuna_client.stats()})
+
+
+@api.route('/job-insights/trends', methods=['GET'])
+@cross_origin()
+def job_insight_trends():
+    """Salary percentiles over time for a role and location, from the daily rollups."""
+    role = request.args.get('role')
+    if not role:
+        return jsonify({"error": "Role is required"}), 400
+    location = request.args.get('location', ADZUNA_LOCATION)
+    interval = request.args.get('interval', 'day')
+    if interval not in ('day', 'week', 'month'):
+        return jsonify({"error": "interval must be one of day, week, month"}), 400
+    try:
+        days = max(1, min(int(request.args.get('days', 365)), 3660))
+    except ValueError:
+        return jsonify({"error": "days must be an integer"}), 400
+
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    try:
+        series = salary_trends.query(role, location, today - timedelta(days=days - 1), today, interval)
+    except Exception as e:
+        print(f"ERROR: Salary trend query failed: {e}")
+        return jsonify({"error": "Server error while reading salary trends."}), 500
+    return jsonify({"role": role, "location": location, "interval": interval, "series": series})
+
+
+@api.route('/job-insights/trends/stats', methods=['GET'])
+def job_insight_trends_stats():
+    """Queued, recorded, duplicate and dropped salary observations."""
+    return jsonify(salary_trends.stats())
+
+
+# Shared by all aggregation requests, so its size is the global cap on concurrent Adzuna calls.
+ADZUNA_MAX_CONCURRENCY = int(os.getenv('ADZUNA_MAX_CONCURRENCY', 8))
+adzuna_executor = ThreadPoolExecutor(max_workers=ADZUNA_MAX_CONCURRENCY, thread_name_prefix='adzuna')
+
+
+@api.route('/job-insights/aggregate', methods=['POST'])
+@cross_origin()
+def aggregate_job_insights():
+    """
+    Compare job markets: fetch several countries and pages concurrently, merge and dedupe
+    the listings and summarise salaries per location. With "stream": true the response is
+    NDJSON with one line per finished page followed by the summary.
+    """
+    data = request.json or {}
+    role = data.get('role')
+    if not role:
+        return jsonify({"error": "Role is required"}), 400
+    if not ADZUNA_APP_ID or not ADZUNA_APP_KEY:
+        return jsonify({
+            "error": "Adzuna API credentials not found.... Please set ADZUNA_APP_ID and ADZUNA_APP_KEY in .env file"
+        }), 500
+    countries = data.get('countries') or [ADZUNA_LOCATION]
+    if not isinstance(countries, list) or len(countries) > 20:
+        return jsonify({"error": "'countries' must be a list of at most 20 country codes"}), 400
+    try:
+        pages = bounded_number(data, 'pages', 1, 1, 10)
+        results_per_page = bounded_number(data, 'results_per_page', 20, 1, 50)
+        deadline = time.monotonic() + bounded_number(data, 'timeout', 15, 1.0, 60.0, cast=float)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def fetch(country, page):
+        cache_key = f"{role.strip().lower()}|{country.lower()}|{page}|{results_per_page}"
+        result, _ = job_insights_cache.get(
+            cache_key, lambda: fetch_adzuna_listings(role, country, page, results_per_page)
+        )
+        return result
+
+    tasks = [(country, page) for country in countries for page in range(1, pages + 1)]
+    events = aggregate_listings(fetch, tasks, adzuna_executor, deadline)
+
+    if data.get('stream'):
+        def generate():
+            for event in events:
+                if event['type'] == 'summary':
+                    event = dict(event, role=role, countries=countries)
+                yield json.dumps(event) + "\n"
+        return Response(generate(), mimetype='application/x-ndjson')
+
+    summary = [e for e in events if e['type'] == 'summary'][0]
+    summary.pop('type')
+    return jsonify(dict(summary, role=role, countries=countries))
+
+
 
 # FOR STREAM PREDICTION FEATURE ->
 
-@app.route('/api/predict_stream', methods=['POST'])
+def parse_stream_input(data):
+    """Validate and coerce one student's stream prediction inputs."""
+    return {
+        'math_marks': float(data.get('math_marks', 0)),
+        'science_marks': float(data.get('science_marks', 0)),
+        'social_marks': float(data.get('social_marks', 0)),
+        'english_marks': float(data.get('english_marks', 0)),
+        'hobby': data.get('hobby', 'Technical'),
+        'activity': data.get('activity', 'Robotics'),
+        'logic_score': int(data.get('logic_score', 0)),
+        'creative_score': int(data.get('creative_score', 0)),
+        'leadership_score': int(data.get('leadership_score', 0))
+    }
+
+
+def stream_reason(predicted_stream, input_data):
+    if predicted_stream == 'Science':
+        return f"Your strong Logic score ({input_data['logic_score']}/5) and marks in Math/Science suggest a great fit for Science."
+    elif predicted_stream == 'Commerce':
+        return f"High Leadership ({input_data['leadership_score']}/5) and interest in {input_data['hobby']} align well with Commerce."
+    elif predicted_stream == 'Humanities':
+        return f"Your Creativity score ({input_data['creative_score']}/5) and Social Studies marks indicate potential in Humanities."
+    return "Analysis based on provided academic and aptitude profile."
+
+
+def predict_streams(inputs):
+    """Predict streams for a list of parsed inputs, avoiding pandas when the fast path is available."""
+    loaded = stream_model.get()
+    if loaded.predictor is not None:
+        return [str(p) for p in loaded.predictor.predict(inputs)]
+    import pandas as pd
+    return [str(p) for p in loaded.pipeline.predict(pd.DataFrame(inputs))]
+
+
+@api.route('/api/predict_stream', methods=['POST'])
 @cross_origin()
 def predict_stream():
     """Predicts stream using the Pipeline Model and logs to MongoDB."""
     data = request.json
     user_email = data.get('user_email', 'anonymous')
     try:
-        input_data = {
-            'math_marks': float(data.get('math_marks', 0)),
-            'science_marks': float(data.get('science_marks', 0)),
-            'social_marks': float(data.get('social_marks', 0)),
-            'english_marks': float(data.get('english_marks', 0)),
-            'hobby': data.get('hobby', 'Technical'),
-            'activity': data.get('activity', 'Robotics'),
-            'logic_score': int(data.get('logic_score', 0)),
-            'creative_score': int(data.get('creative_score', 0)),
-            'leadership_score': int(data.get('leadership_score', 0))
-        }
-        input_df = pd.DataFrame([input_data])
-
+        input_data = parse_stream_input(data)
     except (ValueError, TypeError) as e:
         return jsonify({'error': f'Invalid input data: {str(e)}'}), 400
 
     predicted_stream = "Unsure"
     reason = "Analysis based on provided academic and aptitude profile."
 
-    if stream_model:
+    if stream_model.get():
         try:
-            prediction = stream_model.predict(input_df)[0]
-            predicted_stream = str(prediction)
-            if predicted_stream == 'Science':
-                reason = f"Your strong Logic score ({input_data['logic_score']}/5) and marks in Math/Science suggest a great fit for Science."
-            elif predicted_stream == 'Commerce':
-                reason = f"High Leadership ({input_data['leadership_score']}/5) and interest in {input_data['hobby']} align well with Commerce."
-            elif predicted_stream == 'Humanities':
-                reason = f"Your Creativity score ({input_data['creative_score']}/5) and Social Studies marks indicate potential in Humanities."
-            
+            predicted_stream = predict_streams([input_data])[0]
+            reason = stream_reason(predicted_stream, input_data)
         except Exception as e:
             print(f"Prediction Error: {e}")
             predicted_stream = "Error"
@@ -384,35 +962,57 @@ def predict_stream():
         'prediction': predicted_stream,
         'reason': reason
     }
-    try:
-        db.stream_predictions.insert_one(log_entry)
-        print("Prediction logged to MongoDB.")
-    except Exception as e:
-        print(f"MongoDB Error: {e}")
+    prediction_logger.submit('stream_predictions', log_entry)
     return jsonify({
         'stream': predicted_stream,
         'reasoning': reason
     })
 
 
+@api.route('/api/predict_stream/batch', methods=['POST'])
+@cross_origin()
+def predict_stream_batch():
+    """Predicts streams for many students with one model call and one bulk log write."""
+    data = request.json or {}
+    students = data.get('students')
+    if not isinstance(students, list) or not students:
+        return jsonify({'error': "A non-empty 'students' list is required."}), 400
+    if not stream_model.get():
+        return jsonify({'error': 'ML Model not loaded on server.'}), 503
+    default_email = data.get('user_email', 'anonymous')
+    try:
+        inputs = [parse_stream_input(s) for s in students]
+    except (ValueError, TypeError, AttributeError) as e:
+        return jsonify({'error': f'Invalid input data: {str(e)}'}), 400
 
-# COVER LETTER GENERATION ->
+    try:
+        predictions = predict_streams(inputs)
+    except Exception as e:
+        print(f"Batch Prediction Error: {e}")
+        return jsonify({'error': f'Model prediction failed: {str(e)}'}), 500
+
+    timestamp = datetime.now(timezone.utc)
+    results = []
+    log_entries = []
+    for student, input_data, predicted_stream in zip(students, inputs, predictions):
+        reason = stream_reason(predicted_stream, input_data)
+        results.append({'stream': predicted_stream, 'reasoning': reason})
+        log_entries.append({
+            'user_email': student.get('user_email', default_email),
+            'timestamp': timestamp,
+            'inputs': input_data,
+            'prediction': predicted_stream,
+            'reason': reason
+        })
+    prediction_logger.submit_many('stream_predictions', log_entries)
+    return jsonify({'count': len(results), 'results': results})
 
-@app.route('/api/generate_cover_letter', methods=['POST'])
-@cross_origin()
-def generate_cover_letter_route():
-    data = request.get_json()
-    job_description = data.get('jobDescription')
-    user_name = data.get('userName')
-    
-    if not job_description or not user_name:
-        return jsonify({"error": "Name and job description are required"}), 400
 
-    prompt = f"""You are an expert career assistant. Write a professional, persuasive cover letter.
 
-Candidate Name: {user_name}
-Job Description:
-{job_description}
+# COVER LETTER GENERATION ->
+
+# Static instructions go in the system prompt so every call shares the same prefix.
+COVER_LETTER_SYSTEM = """You are an expert career assistant. Write a professional, persuasive cover letter.
 
 Generate a professional cover letter that:
 - Uses a confident, professional tone
@@ -420,34 +1020,155 @@ Generate a professional cover letter that:
 - Highlights relevant skills matching the job
 - Includes specific examples where relevant
 - Has proper formatting (date, greeting, body, signature)
-- Is ready to submit
+- Is ready to submit"""
+
+
+def build_cover_letter_prompt(user_name, job_description):
+    return f"""Candidate Name: {user_name}
+Job Description:
+{job_description}
 
 Cover Letter:"""
+
+
+COVER_LETTER_OPTIONS = {
+    'temperature': 0.5,
+    'top_p': 0.9,
+    'top_k': 40
+}
+
+
+@api.route('/api/generate_cover_letter', methods=['POST'])
+@cross_origin()
+def generate_cover_letter_route():
+    data = request.get_json()
+    job_description = data.get('jobDescription')
+    user_name = data.get('userName')
+    
+    if not job_description or not user_name:
+        return jsonify({"error": "Name and job description are required"}), 400
+
+    prompt = build_cover_letter_prompt(user_name, job_description)
+    regenerate = bool(data.get('regenerate'))
+    cache_key = llm_cache_key('cover_letter', user_name, job_description)
+    if not regenerate:
+        cached = llm_response_cache.get(cache_key)
+        if cached is not None:
+            response = jsonify({"cover_letter": cached})
+            response.headers['X-Cache'] = 'HIT'
+            return response
     
     try:
-        response = ollama.generate(
-            model=MODEL_NAME,
+        response = llm_client.generate(
+            'cover_letter', llm_user(data),
             prompt=prompt,
-            options={
-                'temperature': 0.5,
-                'top_p': 0.9,
-                'top_k': 40
-            }
+            system=COVER_LETTER_SYSTEM,
+            options={**COVER_LETTER_OPTIONS, 'seed': llm_seed(cache_key, regenerate)}
         )
         cover_letter_text = response['response'].strip()
+        llm_response_cache.set(cache_key, cover_letter_text)
         
-        return jsonify({
+        response = jsonify({
             "cover_letter": cover_letter_text
         })
+        response.headers['X-Cache'] = 'BYPASS' if regenerate else 'MISS'
+        return response
+    except SchedulerRejected as e:
+        return llm_busy_response(e)
     except Exception as e:
         print(f"Ollama Cover Letter Error: {e}", file=sys.stderr)
         return jsonify({"error": "Failed to generate cover letter. Please ensure Ollama is running."}), 500
 
 
+def sse_event(data, event=None):
+    """Format one Server-Sent Events message."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@api.route('/api/generate_cover_letter/stream', methods=['POST'])
+@cross_origin()
+def stream_cover_letter_route():
+    """
+    Stream the cover letter as Server-Sent Events while Ollama generates it.
+
+    Each token arrives as a `data: {"token": ...}` message; the last message is an
+    `event: done` carrying the full letter plus time-to-first-token and tokens/sec.
+    If the client disconnects, the Ollama stream is closed so generation stops.
+    """
+    data = request.get_json()
+    job_description = data.get('jobDescription')
+    user_name = data.get('userName')
+
+    if not job_description or not user_name:
+        return jsonify({"error": "Name and job description are required"}), 400
+
+    prompt = build_cover_letter_prompt(user_name, job_description)
+
+    # The model slot is held for the whole stream and released when the response is
+    # closed, which also happens if the client disconnects before the first token.
+    try:
+        llm_scheduler.acquire('cover_letter', llm_user(data))
+    except SchedulerRejected as e:
+        return llm_busy_response(e)
+    outcome = {'failed': False}
+
+    def generate():
+        started = time.perf_counter()
+        first_token_at = None
+        parts = []
+        tokens = 0
+        final = {}
+        stream = None
+        try:
+            stream = llm_client.stream('cover_letter', prompt, system=COVER_LETTER_SYSTEM, options=COVER_LETTER_OPTIONS)
+            for chunk in stream:
+                token = chunk['response']
+                if token:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    tokens += 1
+                    parts.append(token)
+                    yield sse_event({"token": token})
+                if chunk.get('done'):
+                    final = chunk
+            elapsed = time.perf_counter() - started
+            eval_count = final.get('eval_count') or tokens
+            eval_seconds = (final.get('eval_duration') or 0) / 1e9
+            if not eval_seconds and first_token_at is not None:
+                eval_seconds = time.perf_counter() - first_token_at
+            metrics = {
+                "ttft_ms": round((first_token_at - started) * 1000, 1) if first_token_at else None,
+                "total_ms": round(elapsed * 1000, 1),
+                "tokens": eval_count,
+                "tokens_per_sec": round(eval_count / eval_seconds, 2) if eval_seconds else None
+            }
+            print(f"Cover letter streamed: {metrics}")
+            yield sse_event({"cover_letter": "".join(parts).strip(), "metrics": metrics}, event="done")
+        except GeneratorExit:
+            print(f"Cover letter stream abandoned by client after {tokens} tokens")
+            raise
+        except Exception as e:
+            print(f"Ollama Cover Letter Stream Error: {e}", file=sys.stderr)
+            outcome['failed'] = True
+            yield sse_event({"error": "Failed to generate cover letter. Please ensure Ollama is running."}, event="error")
+        finally:
+            # Closing the Ollama stream drops its HTTP connection, which stops generation.
+            if stream is not None and hasattr(stream, 'close'):
+                stream.close()
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.call_on_close(lambda: llm_scheduler.release('cover_letter', failed=outcome['failed']))
+    return response
+
+
 
 
 
-@app.route('/api/profile', methods=['POST'])
+@api.route('/api/profile', methods=['POST'])
 @cross_origin()
 def manage_profile():
     """Creates a new profile or updates an existing one using upsert."""
@@ -483,7 +1204,7 @@ def manage_profile():
         print(f"Error managing profile for {user_email}: {e}")
         return jsonify({"error": "Server error while saving profile data."}), 500
 
-@app.route('/api/profile/<email>', methods=['GET'])
+@api.route('/api/profile/<email>', methods=['GET'])
 @cross_origin()
 def get_profile(email):
     """Retrieves an existing profile by email."""
@@ -509,7 +1230,41 @@ def get_profile(email):
 
 # LINKEDIN AUDITOR FEATURE ->        
 
-@app.route('/audit-linkedin', methods=['POST'])
+LINKEDIN_AUDIT_SYSTEM = """You are a world-class LinkedIn Profile Optimizer and Executive Recruiter.
+
+REQUIREMENTS:
+1. Write a punchy, keyword-rich 'headline'.
+2. Write a professional, first-person 'summary' (About section) that highlights achievements.
+3. Provide 5 'suggestions' that are specific to the target career's industry.
+
+Return ONLY valid JSON in this format:
+{
+    "headline": "string",
+    "summary": "string",
+    "suggestions": ["list", "of", "5", "strings"]
+}"""
+
+LINKEDIN_AUDIT_SCHEMA = Schema(
+    headline=TextField('"string"'),
+    summary=TextField('"string"'),
+    suggestions=TextListField('["list", "of", "5", "strings"]', length=5)
+)
+
+
+def linkedin_audit_fallback(career):
+    return {
+        "headline": f"{career} Specialist | Transforming Challenges into Solutions",
+        "summary": f"A dedicated professional aiming to excel in {career}. Highly skilled in analyzing complex data and implementing efficient workflows to drive business growth.",
+        "suggestions": [
+            f"Identify 3 key {career} skills you possess and add them to your top skills.",
+            "Quantify your experience (e.g., 'Reduced costs by 15%').",
+            "Request recommendations from former colleagues to build social proof.",
+            "Ensure your summary mentions specific tools used in the industry.",
+            "Update your headline to include your primary value proposition."
+        ]
+    }
+
+@api.route('/audit-linkedin', methods=['POST'])
 @cross_origin()
 def audit_linkedin():
     """Audit LinkedIn profile using Ollama and generate personalized suggestions."""
@@ -517,500 +1272,484 @@ def audit_linkedin():
     content = data.get('content', '')
     career = data.get('career', 'Professional')
     input_type = data.get('type', 'paste') 
-    MODEL_NAME = 'llama3.2:1b'
+    regenerate = bool(data.get('regenerate'))
+    cache_key = llm_cache_key('linkedin_audit', content, career.lower(), input_type)
+    if not regenerate:
+        cached = llm_response_cache.get(cache_key)
+        if cached is not None:
+            response = jsonify(cached)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+    # Only a regeneration needs a unique context line; cached audits keep the prompt stable.
+    context_line = f"Context ID: {int(time.time())}" if regenerate else ""
     prompt = f"""
-    Context ID: {int(time.time())}
-    You are a world-class LinkedIn Profile Optimizer and Executive Recruiter.
-    
+    {context_line}
     TASK: 
     Analyze the following LinkedIn profile data (Source: {input_type}) and optimize it for a career in "{career}".
     
     PROFILE DATA:
     {content}
-
-    REQUIREMENTS:
-    1. Write a punchy, keyword-rich 'headline'.
-    2. Write a professional, first-person 'summary' (About section) that highlights achievements.
-    3. Provide 5 'suggestions' that are specific to the {career} industry.
-    
-    Return ONLY valid JSON in this format:
-    {{
-        "headline": "string",
-        "summary": "string",
-        "suggestions": ["list", "of", "5", "strings"]
-    }}
     """
 
     try:
-        response = ollama.generate(
-            model=MODEL_NAME,
-            prompt=prompt,
-            format='json',
+        result = structured_llm.generate(
+            'linkedin_audit', llm_user(data),
+            prompt,
+            LINKEDIN_AUDIT_SCHEMA,
+            system=LINKEDIN_AUDIT_SYSTEM,
             options={
                 'temperature': 0.8,
-                'seed': random.randint(1, 1000000)
+                'seed': llm_seed(cache_key, regenerate)
             }
         )
-        result = json.loads(response['response'])
-        return jsonify(result)
-
+        llm_response_cache.set(cache_key, result)
+        response = jsonify(result)
+        response.headers['X-Cache'] = 'BYPASS' if regenerate else 'MISS'
+        return response
+
+    except SchedulerRejected as e:
+        return llm_busy_response(e)
+    except StructuredOutputError as e:
+        # Keep whatever the model got right and fill only the missing fields.
+        print(f"Ollama Audit Error: {e}", file=sys.stderr)
+        return jsonify({**linkedin_audit_fallback(career), **e.partial})
     except Exception as e:
         print(f"Ollama Audit Error: {e}", file=sys.stderr)
-        return jsonify({
-            "headline": f"{career} Specialist | Transforming Challenges into Solutions",
-            "summary": f"A dedicated professional aiming to excel in {career}. Highly skilled in analyzing complex data and implementing efficient workflows to drive business growth.",
-            "suggestions": [
-                f"Identify 3 key {career} skills you possess and add them to your top skills.",
-                "Quantify your experience (e.g., 'Reduced costs by 15%').",
-                "Request recommendations from former colleagues to build social proof.",
-                "Ensure your summary mentions specific tools used in the industry.",
-                "Update your headline to include your primary value proposition."
-            ]
-        })
+        return jsonify(linkedin_audit_fallback(career))
 
 
 
 # FOR MOCK INTERVIEW FEATURE ->         
 
-@app.route('/mock-interview', methods=['POST'])
+FALLBACK_QUESTIONS = {
+    'Data Science': ['How do you handle imbalanced datasets?', 'Explain the Bias-Variance tradeoff.'],
+    'Software Development': ['Explain the difference between REST and GraphQL.', 'How do you ensure code scalability?'],
+    'Database Admin': ['How do you optimize a slow SQL query?', 'Explain Database Normalization vs Denormalization.'],
+    'Cyber Security': ['What is Zero Trust Architecture?', 'How do you prevent SQL Injection?']
+}
+
+
+# The fields the mock interview page offers (frontend MockInterview.js), plus the
+# default. Only these get a question pool; anything else is generated live.
+INTERVIEW_FIELDS = (
+    'Data Science', 'Software Development', 'Database Admin', 'Cyber Security', 'Networking',
+    'Cloud Computing', 'DevOps', 'Machine Learning', 'Full Stack Development', 'Frontend Development',
+    'Backend Development', 'Mobile Development', 'Data Engineering', 'QA/Testing', 'Java Developer',
+    'Python Developer', 'JavaScript Developer', 'UI/UX Design', 'Blockchain Developer', 'General Technology'
+)
+
+
+INTERVIEW_QUESTION_SYSTEM = """You are a professional technical interviewer.
+Generate ONE specific, challenging question that tests deep technical knowledge of the given field.
+The question should focus on practical experience and architectural reasoning.
+Provide ONLY the question text, nothing else."""
+
+INTERVIEW_EVALUATION_SYSTEM = """You are a senior technical interviewer.
+Evaluate the candidate's answer based on technical accuracy, depth, and clarity.
+
+Instructions:
+1. Assign a score from 0-10 (0 is gibberish, 10 is perfect).
+2. Provide constructive feedback (mention what was good and what was missing).
+3. Provide an 'ideal_answer' which is a perfect, expert-level response to the question.
+
+Return ONLY a JSON object in this format:
+{
+    "score": integer,
+    "feedback": "string",
+    "ideal_answer": "string"
+}"""
+
+INTERVIEW_EVALUATION_SCHEMA = Schema(
+    score=IntField('integer from 0 to 10', 0, 10),
+    feedback=TextField('"string"'),
+    ideal_answer=TextField('"string"')
+)
+
+
+def generate_interview_question(field, route='interview_question', user='anonymous'):
+    response = llm_client.generate(
+        route, user,
+        prompt=f"FIELD: {field}\nQUESTION:",
+        system=INTERVIEW_QUESTION_SYSTEM,
+        options={
+            'temperature': 0.8,
+            'seed': random.randint(1, 1000000)
+        }
+    )
+    return response['response'].strip()
+
+
+# Questions are pre-generated per field at the lowest scheduler priority and served
+# from memory. A field's first request is generated live and starts its refill; a
+# live generation also happens when a pool runs dry or the field is not one of
+# INTERVIEW_FIELDS.
+question_pool = QuestionPool(
+    lambda field: generate_interview_question(field, route='question_pool', user='question_pool'),
+    INTERVIEW_FIELDS,
+    target=int(os.getenv('QUESTION_POOL_SIZE', 8)),
+    low_water=int(os.getenv('QUESTION_POOL_LOW_WATER', 3))
+)
+
+
+@api.route('/mock-interview/pool/stats', methods=['GET'])
+@cross_origin()
+def question_pool_stats():
+    return jsonify(question_pool.stats())
+
+
+MIN_ANSWER_WORDS = 5
+SHORT_ANSWER_FEEDBACK = "Your answer is too short. Please provide more technical detail. "
+EVALUATION_FALLBACK = {
+    "score": 0,
+    "feedback": "Error analyzing answer. Please try providing a more detailed response.",
+    "ideal_answer": "Check documentation for the best practices regarding this specific topic."
+}
+INTERVIEW_BATCH_MAX = int(os.getenv('INTERVIEW_BATCH_MAX', 30))
+# Bounds how many answers of one batch are in flight; the scheduler's
+# interview_evaluate cap still limits how many reach the model at once.
+interview_executor = ThreadPoolExecutor(max_workers=int(os.getenv('INTERVIEW_BATCH_WORKERS', 4)),
+                                        thread_name_prefix='interview-eval')
+
+
+def evaluate_answer(field, question, user_answer, user):
+    """Grade one answer with the LLM, capping the score of answers under MIN_ANSWER_WORDS."""
+    eval_prompt = f"""FIELD: {field}
+        INTERVIEW QUESTION: {question}
+        CANDIDATE ANSWER: {user_answer}"""
+    result = structured_llm.generate(
+        'interview_evaluate', user,
+        eval_prompt,
+        INTERVIEW_EVALUATION_SCHEMA,
+        system=INTERVIEW_EVALUATION_SYSTEM,
+        options={'temperature': 0.2} 
+    )
+    if len(user_answer.split()) < MIN_ANSWER_WORDS:
+        result['score'] = min(result['score'], 2)
+        result['feedback'] = SHORT_ANSWER_FEEDBACK + result['feedback']
+    return result
+
+
+def heuristic_evaluation(user_answer):
+    """Score answers that are empty or too short without asking the LLM; None if it needs grading."""
+    words = len(user_answer.split())
+    if words == 0:
+        return {"score": 0, "feedback": "No answer was provided.",
+                "ideal_answer": EVALUATION_FALLBACK['ideal_answer'], "graded_by": "heuristic"}
+    if words < MIN_ANSWER_WORDS:
+        return {"score": 1, "feedback": SHORT_ANSWER_FEEDBACK.strip(),
+                "ideal_answer": EVALUATION_FALLBACK['ideal_answer'], "graded_by": "heuristic"}
+    return None
+
+
+def evaluate_session(field, items, user):
+    """Grade a whole interview: heuristics first, then the remaining answers in parallel."""
+    results = [None] * len(items)
+    futures = {}
+    for index, item in enumerate(items):
+        question, user_answer = item.get('question'), item.get('answer') or ''
+        results[index] = heuristic_evaluation(user_answer)
+        if results[index] is None:
+            futures[interview_executor.submit(evaluate_answer, field, question, user_answer, user)] = index
+    for future, index in futures.items():
+        try:
+            results[index] = {**future.result(), "graded_by": "llm"}
+        except SchedulerRejected as e:
+            results[index] = {**EVALUATION_FALLBACK, "graded_by": "none", "error": e.reason}
+        except Exception as e:
+            print(f"Evaluation Error (batch item {index}): {e}", file=sys.stderr)
+            results[index] = {**EVALUATION_FALLBACK, "graded_by": "none", "error": "evaluation failed"}
+
+    graded = [r for r in results if r['graded_by'] != 'none']
+    scores = [int(r.get('score') or 0) for r in graded]
+    return {
+        "results": [{"question": item.get('question'), **result} for item, result in zip(items, results)],
+        "aggregate": {
+            "questions": len(items),
+            "graded": len(graded),
+            "graded_by_llm": sum(1 for r in graded if r['graded_by'] == 'llm'),
+            "failed": len(items) - len(graded),
+            "total_score": sum(scores),
+            "max_score": 10 * len(graded),
+            "average_score": round(sum(scores) / len(scores), 2) if scores else None
+        }
+    }
+
+
+@api.route('/mock-interview', methods=['POST'])
 @cross_origin()
 def mock_interview():
-    """Handle mock interview questions and answer evaluations with Ollama LLM (llama3.2:1b)."""
+    """Handle mock interview questions and answer evaluations with the configured LLM backend."""
     data = request.json
     action = data.get('action')
     field = data.get('field', 'General Technology')
-    
-    MODEL_NAME = 'llama3.2:1b'
+    if not isinstance(field, str):
+        return jsonify({"error": "'field' must be a string"}), 400
+
     if action == 'get_question':
-        prompt = f"""You are a professional technical interviewer for {field}.
-        Generate ONE specific, challenging question that tests deep technical knowledge.
-        The question should focus on practical experience and architectural reasoning.
-        Provide ONLY the question text, nothing else."""
+        question = question_pool.take(field)
+        if question:
+            return jsonify({"question": question})
         try:
-            response = ollama.generate(
-                model=MODEL_NAME,
-                prompt=prompt,
-                options={
-                    'temperature': 0.8,
-                    'seed': random.randint(1, 1000000)
-                }
-            )
-            return jsonify({"question": response['response'].strip()})
+            question = generate_interview_question(field, user=llm_user(data))
+            question_pool.remember(field, question)
+            return jsonify({"question": question})
+        except SchedulerRejected as e:
+            return llm_busy_response(e)
         except Exception as e:
             print(f"Ollama error (get_question): {e}", file=sys.stderr)
-            questions = {
-                'Data Science': ['How do you handle imbalanced datasets?', 'Explain the Bias-Variance tradeoff.'],
-                'Software Development': ['Explain the difference between REST and GraphQL.', 'How do you ensure code scalability?'],
-                'Database Admin': ['How do you optimize a slow SQL query?', 'Explain Database Normalization vs Denormalization.'],
-                'Cyber Security': ['What is Zero Trust Architecture?', 'How do you prevent SQL Injection?']
-            }
-            fallback_list = questions.get(field, ["Tell me about a challenging technical project you worked on."])
+            fallback_list = FALLBACK_QUESTIONS.get(field, ["Tell me about a challenging technical project you worked on."])
             return jsonify({"question": random.choice(fallback_list)})
 
     elif action == 'evaluate':
         question = data.get('question')
         user_answer = data.get('answer', '')
-        eval_prompt = f"""You are a senior {field} interviewer. 
-        Evaluate this candidate's answer based on technical accuracy, depth, and clarity.
-
-        INTERVIEW QUESTION: {question}
-        CANDIDATE ANSWER: {user_answer}
-
-        Instructions:
-        1. Assign a score from 0-10 (0 is gibberish, 10 is perfect).
-        2. Provide constructive feedback (mention what was good and what was missing).
-        3. Provide an 'ideal_answer' which is a perfect, expert-level response to the question.
-
-        Return ONLY a JSON object in this format:
-        {{
-            "score": integer,
-            "feedback": "string",
-            "ideal_answer": "string"
-        }}"""
         try:
-            response = ollama.generate(
-                model=MODEL_NAME,
-                prompt=eval_prompt,
-                format='json',
-                options={'temperature': 0.2} 
-            )
-            result = json.loads(response['response'])
-            if len(user_answer.split()) < 5:
-                result['score'] = min(result['score'], 2)
-                result['feedback'] = "Your answer is too short. Please provide more technical detail. " + result['feedback']
-            return jsonify(result)
+            return jsonify(evaluate_answer(field, question, user_answer, llm_user(data)))
+        except SchedulerRejected as e:
+            return llm_busy_response(e)
         except Exception as e:
             print(f"Evaluation Error: {e}", file=sys.stderr)
-            return jsonify({
-                "score": 0,
-                "feedback": "Error analyzing answer. Please try providing a more detailed response.",
-                "ideal_answer": "Check documentation for the best practices regarding this specific topic."
-            }), 500
+            return jsonify(EVALUATION_FALLBACK), 500
+
+    elif action == 'evaluate_batch':
+        items = data.get('answers')
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "'answers' must be a non-empty list of {question, answer} objects"}), 400
+        if len(items) > INTERVIEW_BATCH_MAX:
+            return jsonify({"error": f"At most {INTERVIEW_BATCH_MAX} answers per batch"}), 400
+        if not all(isinstance(item, dict) and isinstance(item.get('question'), str)
+                   and isinstance(item.get('answer') or '', str) for item in items):
+            return jsonify({"error": "Each answer must be an object with 'question' and 'answer'"}), 400
+        return jsonify(evaluate_session(field, items, llm_user(data)))
 
     return jsonify({"error": "Invalid action"}), 400
 
 UPLOAD_FOLDER = 'uploads'
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-@app.route('/uploads/<filename>')
+ASSET_FOLDER = os.getenv('ASSET_FOLDER', os.path.join(UPLOAD_FOLDER, 'assets'))
+ASSET_MAX_AGE = 365 * 24 * 3600
+MB = 1024 * 1024
+MAX_UPLOAD_BYTES = int(float(os.getenv('MAX_UPLOAD_MB', 32)) * MB)
+UPLOAD_RETENTION_DAYS = float(os.getenv('UPLOAD_RETENTION_DAYS', 0))
+UPLOAD_GC_INTERVAL = int(os.getenv('UPLOAD_GC_INTERVAL', 3600))
+PORTFOLIO_IMAGE_MODES = ('url', 'inline', 'zip')
+portfolio_renderer = PortfolioRenderer(
+    chunk_size=int(os.getenv('PORTFOLIO_CHUNK_BYTES', 64 * 1024)),
+    cache_size=int(os.getenv('PORTFOLIO_CACHE_SIZE', 256)),
+    max_entry_bytes=int(os.getenv('PORTFOLIO_CACHE_MAX_ENTRY_BYTES', 256 * 1024))
+)
+image_assets = ImageAssetStore(
+    ASSET_FOLDER,
+    max_dimension=int(os.getenv('IMAGE_MAX_DIMENSION', 1600)),
+    jpeg_quality=int(os.getenv('IMAGE_QUALITY', 82))
+)
+resume_store = UploadStore(
+    UPLOAD_FOLDER,
+    max_bytes=int(float(os.getenv('RESUME_MAX_MB', 10)) * MB),
+    allowed_extensions=('.pdf', '.doc', '.docx')
+)
+# Generated portfolios link to resumes and assets by URL, and those URLs are served
+# as immutable for a year, so assets are never aged out (only their temp files are)
+# and resumes only when UPLOAD_RETENTION_DAYS is set.
+upload_janitor = UploadJanitor({UPLOAD_FOLDER: UPLOAD_RETENTION_DAYS * 86400, ASSET_FOLDER: 0})
+
+
+@api.app_errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    return jsonify({"error": f"Request is larger than the {MAX_UPLOAD_BYTES / MB:g} MB upload limit"}), 413
+
+
+@api.route('/uploads/<filename>')
 def uploaded_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    # Uploads are stored under content hashes and never rewritten, so they can be cached
+    # for the retention period; conditional and Range requests are answered from the file.
+    if filename.endswith(TEMP_SUFFIXES):
+        abort(404)
+    response = send_from_directory(current_app.config['UPLOAD_FOLDER'], filename, max_age=ASSET_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    return response
+
+
+@api.route('/uploads/stats', methods=['GET'])
+@cross_origin()
+def upload_stats():
+    return jsonify({"resumes": resume_store.stats(), "cleanup": upload_janitor.stats(),
+                    "max_request_bytes": MAX_UPLOAD_BYTES})
+
+
+@api.route('/assets/<name>')
+def asset_file(name):
+    # Asset names are content hashes, so a URL always means the same bytes; files still
+    # being written or optimized are not assets yet.
+    if name.endswith(TEMP_SUFFIXES):
+        abort(404)
+    response = send_from_directory(ASSET_FOLDER, name, max_age=ASSET_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    return response
 
 
-@app.route('/generate-portfolio', methods=['POST'])
+@api.route('/assets/stats', methods=['GET'])
+@cross_origin()
+def asset_stats():
+    return jsonify(image_assets.stats())
+
+
+@api.route('/generate-portfolio/stats', methods=['GET'])
+@cross_origin()
+def portfolio_stats():
+    return jsonify({"sections": portfolio_renderer.stats(), "images": image_assets.stats()})
+
+
+@api.route('/generate-portfolio', methods=['POST'])
 @cross_origin()
 def generate_portfolio():
+    """
+    Images are stored once in the asset store and referenced by URL (?images=url, the
+    default), embedded as data URIs (?images=inline) or packaged with the page as a
+    streamed ZIP (?images=zip). ?format=html returns the bare page instead of JSON.
+    """
+    image_mode = request.args.get('images', 'url')
+    if image_mode not in PORTFOLIO_IMAGE_MODES:
+        return jsonify({"error": f"images must be one of {', '.join(PORTFOLIO_IMAGE_MODES)}"}), 400
     try:
-        hero_image_b64 = None
-        about_image_b64 = None
         resume_url = "#"
-        
-        if 'heroImage' in request.files:
-            file = request.files['heroImage']
-            if file.filename != '':
-                hero_image_b64 = image_to_base64_data_uri(file)
-                
-        if 'aboutImage' in request.files:
-            file = request.files['aboutImage']
-            if file.filename != '':
-                about_image_b64 = image_to_base64_data_uri(file)
-
-        if 'resume' in request.files:
-            file = request.files['resume']
-            if file.filename != '':
-                filename = secure_filename(f"resume_{int(time.time())}_{file.filename}")
-                file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-                resume_url = f"http://localhost:5000/uploads/{filename}"
+        hero_image = save_portfolio_image(request.files.get('heroImage'))
+        about_image = save_portfolio_image(request.files.get('aboutImage'))
+
+        resume = request.files.get('resume')
+        if resume is not None and resume.filename != '':
+            try:
+                stored = resume_store.save(resume)
+            except UploadTooLarge as e:
+                return jsonify({"error": str(e)}), 413
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            resume_url = url_for('api.uploaded_file', filename=stored.name, _external=True)
 
         user_data = json.loads(request.form.get('userData', '{}'))
-        name = user_data.get('name', 'User Name')
-        role = user_data.get('role', 'Creative Professional')
-        bio = user_data.get('bio', 'Passionate about creating digital experiences.')
-        exp_years = user_data.get('experienceYears', '1+')
-        completed_projects_count = user_data.get('projectsCompleted', '10+')
-        companies_count = user_data.get('companiesWorked', '1+')
-        skills_list = user_data.get('skills', [])
-        projects = user_data.get('projects', [])
-        education = user_data.get('education', [])
-        contact = user_data.get('contact', {})
-        email = contact.get('email', 'contact@example.com')
-        phone = contact.get('phone', '+123 456 7890')
-        location = contact.get('location', 'Remote')
-        has_hero_image = user_data.get('hasHeroImage', True)
-        has_about_image = user_data.get('hasAboutImage', True)
-
-        # Convert project images to base64
-        project_images_b64 = {}
-        for i, proj in enumerate(projects):
-            file_key = f'projectImage_{i}'
-            if file_key in request.files:
-                p_file = request.files[file_key]
-                if p_file.filename != '':
-                    project_images_b64[i] = image_to_base64_data_uri(p_file)
-
-        def render_hero_image():
-            img_src = hero_image_b64 if hero_image_b64 else "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?q=80&w=600&h=600&auto=format&fit=crop"
-            if not has_hero_image: return ""
-            return f"""
-            <div class="relative w-full max-w-lg mx-auto lg:mr-0">
-                <div class="absolute top-0 -left-4 w-72 h-72 bg-violet-300 rounded-full mix-blend-multiply filter blur-xl opacity-70 animate-blob"></div>
-                <div class="absolute top-0 -right-4 w-72 h-72 bg-purple-300 rounded-full mix-blend-multiply filter blur-xl opacity-70 animate-blob animation-delay-2000"></div>
-                <div class="absolute -bottom-8 left-20 w-72 h-72 bg-pink-300 rounded-full mix-blend-multiply filter blur-xl opacity-70 animate-blob animation-delay-4000"></div>
-                <div class="relative overflow-hidden" style="border-radius: 60% 40% 30% 70% / 60% 30% 70% 40%; box-shadow: 0 20px 25px -5px rgba(124, 58, 237, 0.2);">
-                    <img src="{img_src}" alt="{name}" class="w-full h-full object-cover transform hover:scale-105 transition duration-500">
-                </div>
-            </div>
-            """
-        def render_about_image():
-            img_src = about_image_b64 if about_image_b64 else "https://images.unsplash.com/photo-1498050108023-c5249f4df085?q=80&w=600&h=800&auto=format&fit=crop"
-            if not has_about_image: return ""
-            return f"""
-            <div class="lg:w-1/2 mb-10 lg:mb-0">
-                <div class="relative w-full max-w-md mx-auto">
-                    <div class="absolute inset-0 bg-violet-200 rounded-3xl transform rotate-3 scale-105"></div>
-                    <img src="{img_src}" alt="About {name}" class="relative z-10 rounded-3xl shadow-xl w-full h-auto object-cover">
-                </div>
-            </div>
-            """
-        def render_skills_list():
-            if not skills_list: return ""
-            html = ""
-            for skill in skills_list:
-                s_name = skill.get('name', '')
-                s_level = skill.get('level', 80)
-                if s_name:
-                    html += f"""
-                    <div class="mb-5">
-                        <div class="flex justify-between mb-1">
-                            <span class="text-base font-medium text-slate-700">{s_name}</span>
-                            <span class="text-sm font-medium text-violet-600">{s_level}%</span>
-                        </div>
-                        <div class="w-full bg-slate-200 rounded-full h-2.5">
-                            <div class="bg-violet-600 h-2.5 rounded-full" style="width: {s_level}%"></div>
-                        </div>
-                    </div>
-                    """
-            return html
-
-        def render_education_section():
-            if not education: return ""
-            edu_html = ""
-            for item in education:
-                degree = item.get('degree', 'Degree')
-                inst = item.get('institution', 'Institution')
-                year = item.get('year', 'Year')
-                edu_html += f"""
-                <div class="relative pl-8 pb-10 border-l-2 border-violet-200 last:border-0">
-                    <div class="absolute -left-[9px] top-0 w-4 h-4 bg-violet-600 rounded-full border-4 border-white"></div>
-                    <span class="text-sm font-bold text-violet-600 uppercase tracking-wider">{year}</span>
-                    <h4 class="text-xl font-bold text-slate-800 mt-1">{degree}</h4>
-                    <p class="text-slate-500 font-medium">{inst}</p>
-                </div>
-                """
-            return f"""
-            <section id="education" class="py-20 bg-slate-50">
-                <div class="container mx-auto px-6">
-                    <div class="text-center mb-16">
-                        <h2 class="text-3xl md:text-4xl font-bold text-slate-800">My <span class="text-violet-600">Qualification</span></h2>
-                        <div class="w-20 h-1.5 bg-violet-600 mx-auto mt-4 rounded-full"></div>
-                    </div>
-                    <div class="max-w-3xl mx-auto">{edu_html}</div>
-                </div>
-            </section>
-            """
-        def render_projects_grid():
-            html = ""
-            for i, proj in enumerate(projects):
-                title = proj.get('title', f'Project {i+1}')
-                desc = proj.get('desc', 'No description provided.')
-                link = proj.get('githubLink', '#')
-                img_src = project_images_b64.get(i, f"https://source.unsplash.com/random/800x600/?tech,website&sig={i}")
-                
-                html += f"""
-                <div class="bg-white rounded-2xl shadow-lg overflow-hidden hover:-translate-y-2 transition-all duration-300 group">
-                    <div class="h-56 overflow-hidden relative">
-                        <img src="{img_src}" alt="{title}" class="w-full h-full object-cover transform group-hover:scale-110 transition duration-500">
-                        <div class="absolute inset-0 bg-violet-900 bg-opacity-0 group-hover:bg-opacity-30 transition duration-300 flex items-center justify-center opacity-0 group-hover:opacity-100">
-                             <button onclick="openModal('{title}', `{desc}`, '{img_src}', '{link}')" class="bg-white text-violet-600 px-6 py-2 rounded-full font-bold shadow-lg transform translate-y-4 group-hover:translate-y-0 transition duration-300">Quick View</button>
-                        </div>
-                    </div>
-                    <div class="p-6">
-                        <h3 class="text-xl font-bold text-slate-800 mb-2">{title}</h3>
-                        <p class="text-slate-600 mb-4 line-clamp-2">{desc}</p>
-                        <a href="{link}" target="_blank" class="inline-flex items-center text-violet-600 font-semibold hover:text-violet-800 transition">
-                            View Project <svg xmlns="http://www.w3.org/2000/svg" class="h-5 w-5 ml-1" viewBox="0 0 20 20" fill="currentColor"><path fill-rule="evenodd" d="M12.293 5.293a1 1 0 011.414 0l6 6a1 1 0 010 1.414l-6 6a1 1 0 01-1.414-1.414L16.586 11H3a1 1 0 110-2h13.586l-4.293-4.293a1 1 0 010-1.414z" clip-rule="evenodd" /></svg>
-                        </a>
-                    </div>
-                </div>
-                """
-            return html
-
-        html_template = f"""<!DOCTYPE html>
-<html lang="en" class="scroll-smooth">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{name} - Portfolio</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    <style>
-        body {{ font-family: 'Poppins', sans-serif; }}
-        .animate-blob {{ animation: blob 7s infinite; }}
-        .animation-delay-2000 {{ animation-delay: 2s; }}
-        .animation-delay-4000 {{ animation-delay: 4s; }}
-        @keyframes blob {{
-            0% {{ transform: translate(0px, 0px) scale(1); }}
-            33% {{ transform: translate(30px, -50px) scale(1.1); }}
-            66% {{ transform: translate(-20px, 20px) scale(0.9); }}
-            100% {{ transform: translate(0px, 0px) scale(1); }}
-        }}
-        .modal-active {{ overflow: hidden; }}
-    </style>
-</head>
-<body class="bg-slate-50 text-slate-800">
-    <header class="fixed w-full bg-white/80 backdrop-blur-md z-50 shadow-sm">
-        <nav class="container mx-auto px-6 py-4 flex justify-between items-center">
-            <a href="#" class="text-2xl font-bold text-violet-700">{name.split(' ')[0]}</a>
-            <div class="hidden md:flex space-x-8 font-medium text-slate-600">
-                <a href="#home" class="hover:text-violet-600 transition">Home</a>
-                <a href="#about" class="hover:text-violet-600 transition">About</a>
-                <a href="#skills" class="hover:text-violet-600 transition">Skills</a>
-                <a href="#education" class="hover:text-violet-600 transition">Education</a>
-                <a href="#portfolio" class="hover:text-violet-600 transition">Portfolio</a>
-                <a href="#contact" class="hover:text-violet-600 transition">Contact</a>
-            </div>
-            <a href="#contact" class="px-6 py-2 bg-violet-600 text-white font-semibold rounded-full hover:bg-violet-700 transition">Hire Me</a>
-        </nav>
-    </header>
-    <section id="home" class="pt-32 pb-20 overflow-hidden">
-        <div class="container mx-auto px-6 flex flex-col-reverse lg:flex-row items-center gap-12">
-            <div class="lg:w-1/2 text-center lg:text-left">
-                <h2 class="text-violet-600 font-bold text-xl mb-4">{role}</h2>
-                <h1 class="text-4xl md:text-6xl font-bold mb-6">Hi, I'm <span class="text-violet-700">{name}</span></h1>
-                <p class="text-lg text-slate-600 mb-10 leading-relaxed">{bio}</p>
-                <div class="flex justify-center lg:justify-start gap-4">
-                    <a href="#contact" class="px-8 py-3 bg-violet-600 text-white font-bold rounded-full shadow-lg hover:-translate-y-1 transition-all">Contact Me</a>
-                    <a href="{resume_url}" download class="px-8 py-3 bg-white text-violet-600 font-bold rounded-full border-2 border-violet-100 hover:bg-violet-50 transition-all flex items-center">
-                        Download CV <svg class="w-5 h-5 ml-2" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path d="M4 16v1a3 3 0 003 3h10a3 3 0 003-3v-1m-4-4l-4 4m0 0l-4-4m4 4V4"/></svg>
-                    </a>
-                </div>
-            </div>
-            <div class="lg:w-1/2">{render_hero_image()}</div>
-        </div>
-    </section>
-
-    <section id="about" class="py-20 bg-white">
-        <div class="container mx-auto px-6">
-            <div class="text-center mb-16">
-                <h2 class="text-3xl md:text-4xl font-bold text-slate-800">About <span class="text-violet-600">Me</span></h2>
-                <div class="w-20 h-1.5 bg-violet-600 mx-auto mt-4 rounded-full"></div>
-            </div>
-            <div class="flex flex-col lg:flex-row items-center gap-16">
-                {render_about_image()}
-                <div class="lg:w-1/2">
-                    <h3 class="text-2xl font-bold mb-6 text-slate-800">My Introduction</h3>
-                    <p class="text-slate-600 text-lg leading-relaxed mb-10">{bio}</p>
-                    
-                    <div class="grid grid-cols-3 gap-6 text-center mb-10">
-                        <div class="p-4 bg-slate-50 rounded-2xl shadow-sm border border-slate-100">
-                            <h4 class="text-3xl font-bold text-violet-600">{exp_years}</h4>
-                            <p class="text-sm text-slate-500 font-medium">Years Exp</p>
-                        </div>
-                        <div class="p-4 bg-slate-50 rounded-2xl shadow-sm border border-slate-100">
-                            <h4 class="text-3xl font-bold text-violet-600">{completed_projects_count}</h4>
-                            <p class="text-sm text-slate-500 font-medium">Projects</p>
-                        </div>
-                        <div class="p-4 bg-slate-50 rounded-2xl shadow-sm border border-slate-100">
-                            <h4 class="text-3xl font-bold text-violet-600">{companies_count}</h4>
-                            <p class="text-sm text-slate-500 font-medium">Companies</p>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </section>
-    <section id="skills" class="py-20 bg-slate-50">
-        <div class="container mx-auto px-6">
-            <div class="text-center mb-16">
-                <h2 class="text-3xl md:text-4xl font-bold text-slate-800">My <span class="text-violet-600">Skills</span></h2>
-                <div class="w-20 h-1.5 bg-violet-600 mx-auto mt-4 rounded-full"></div>
-                <p class="text-slate-600 mt-4">Technical Proficiency</p>
-            </div>
-            <div class="max-w-3xl mx-auto bg-white p-8 md:p-12 rounded-3xl shadow-xl">
-                {render_skills_list()}
-            </div>
-        </div>
-    </section>
-    {render_education_section()}
-    <section id="portfolio" class="py-20 bg-white">
-        <div class="container mx-auto px-6 text-center">
-            <h2 class="text-3xl md:text-4xl font-bold mb-16 text-slate-800">My <span class="text-violet-600">Portfolio</span></h2>
-            <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8 text-left">
-                {render_projects_grid()}
-            </div>
-        </div>
-    </section>
-    <section id="contact" class="py-20 relative overflow-hidden bg-slate-50">
-        <div class="container mx-auto px-6 relative z-10">
-            <div class="text-center mb-16">
-                <h2 class="text-3xl md:text-4xl font-bold text-slate-800">Contact <span class="text-violet-600">Me</span></h2>
-                <div class="w-20 h-1.5 bg-violet-600 mx-auto mt-4 rounded-full"></div>
-            </div>
-            <div class="flex flex-col lg:flex-row gap-12 max-w-6xl mx-auto">
-                <div class="lg:w-1/3 space-y-8">
-                    <div class="flex items-start">
-                        <div class="flex-shrink-0 w-12 h-12 bg-violet-100 text-violet-600 rounded-2xl flex items-center justify-center text-2xl shadow-sm">
-                            <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path d="M3 5a2 2 0 012-2h3.28a1 1 0 01.948.684l1.498 4.493a1 1 0 01-.502 1.21l-2.257 1.13a11.042 11.042 0 005.516 5.516l1.13-2.257a1 1 0 011.21-.502l4.493 1.498a1 1 0 01.684.948V19a2 2 0 01-2 2h-1C9.716 21 3 14.284 3 6V5z"/></svg>
-                        </div>
-                        <div class="ml-4">
-                            <h4 class="text-xl font-bold text-slate-800">Call Me</h4>
-                            <p class="text-slate-600">{phone}</p>
-                        </div>
-                    </div>
-                    <div class="flex items-start">
-                        <div class="flex-shrink-0 w-12 h-12 bg-violet-100 text-violet-600 rounded-2xl flex items-center justify-center text-2xl shadow-sm">
-                            <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path d="M3 8l7.89 5.26a2 2 0 002.22 0L21 8M5 19h14a2 2 0 002-2V7a2 2 0 00-2-2H5a2 2 0 00-2 2v10a2 2 0 002 2z"/></svg>
-                        </div>
-                        <div class="ml-4">
-                            <h4 class="text-xl font-bold text-slate-800">Email</h4>
-                            <p class="text-slate-600">{email}</p>
-                        </div>
-                    </div>
-                    <div class="flex items-start">
-                        <div class="flex-shrink-0 w-12 h-12 bg-violet-100 text-violet-600 rounded-2xl flex items-center justify-center text-2xl shadow-sm">
-                            <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path d="M17.657 16.657L13.414 20.9a1.998 1.998 0 01-2.827 0l-4.244-4.243a8 8 0 1111.314 0z"/><path d="M15 11a3 3 0 11-6 0 3 3 0 016 0z"/></svg>
-                        </div>
-                        <div class="ml-4">
-                            <h4 class="text-xl font-bold text-slate-800">Location</h4>
-                            <p class="text-slate-600">{location}</p>
-                        </div>
-                    </div>
-                </div>
-                <div class="lg:w-2/3 bg-white p-8 md:p-10 rounded-3xl shadow-xl">
-                    <form class="space-y-6">
-                        <div class="grid grid-cols-1 md:grid-cols-2 gap-6">
-                            <input type="text" placeholder="Your Name" class="w-full px-5 py-3 bg-slate-50 border border-slate-200 rounded-2xl focus:ring-1 focus:ring-violet-500 transition">
-                            <input type="email" placeholder="Your Email" class="w-full px-5 py-3 bg-slate-50 border border-slate-200 rounded-2xl focus:ring-1 focus:ring-violet-500 transition">
-                        </div>
-                        <textarea rows="5" placeholder="Message" class="w-full px-5 py-3 bg-slate-50 border border-slate-200 rounded-2xl focus:ring-1 focus:ring-violet-500 transition"></textarea>
-                        <button class="w-full md:w-auto px-10 py-3.5 bg-violet-600 text-white font-bold rounded-full shadow-md hover:bg-violet-700 transition">Send Message</button>
-                    </form>
-                </div>
-            </div>
-        </div>
-    </section>
-
-    <footer class="bg-slate-900 py-12 text-center text-slate-400">
-        <div class="container mx-auto px-6">
-            <h2 class="text-3xl font-bold text-white mb-4">{name}</h2>
-            <p class="mb-8">{role}</p>
-            <p class="text-sm">&#169; {time.strftime('%Y')} {name}. All rights reserved.</p>
-        </div>
-    </footer>
-
-    <div id="projectModal" class="fixed inset-0 z-[100] hidden bg-slate-900/60 backdrop-blur-sm flex items-center justify-center p-4">
-        <div class="bg-white rounded-3xl max-w-2xl w-full max-h-[90vh] overflow-y-auto shadow-2xl relative">
-            <button onclick="closeModal()" class="absolute top-4 right-4 bg-slate-100 p-2 rounded-full hover:bg-slate-200 transition">
-                <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path d="M6 18L18 6M6 6l12 12"/></svg>
-            </button>
-            <img id="modalImg" src="" class="w-full h-64 object-cover">
-            <div class="p-8">
-                <h3 id="modalTitle" class="text-2xl font-bold mb-4"></h3>
-                <p id="modalDesc" class="text-slate-600 leading-relaxed mb-8"></p>
-                <a id="modalLink" href="#" target="_blank" class="inline-block bg-violet-600 text-white px-8 py-3 rounded-full font-bold">View Live Project</a>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        function openModal(title, desc, img, link) {{
-            document.getElementById('modalTitle').innerText = title;
-            document.getElementById('modalDesc').innerText = desc;
-            document.getElementById('modalImg').src = img;
-            document.getElementById('modalLink').href = link;
-            document.getElementById('projectModal').classList.remove('hidden');
-            document.body.classList.add('modal-active');
-        }}
-        function closeModal() {{
-            document.getElementById('projectModal').classList.add('hidden');
-            document.body.classList.remove('modal-active');
-        }}
-    </script>
-</body>
-</html>"""
-        return jsonify({"html": html_template})
+        if not isinstance(user_data, dict) or not isinstance(user_data.get('projects') or [], list):
+            raise ValueError("userData must be an object with a list of projects")
+
+        project_images = {}
+        for i, proj in enumerate(user_data.get('projects') or []):
+            asset = save_portfolio_image(request.files.get(f'projectImage_{i}'))
+            if asset is not None:
+                project_images[i] = asset
+
+        def image_src(asset):
+            if asset is None:
+                return None
+            if image_mode == 'inline':
+                # Cache keys use the content-hash name, not the megabytes of base64.
+                return ImageSource(f"inline:{asset.name}", image_assets.data_uri(asset))
+            if image_mode == 'zip':
+                return f"assets/{asset.name}"
+            return url_for('api.asset_file', name=asset.name, _external=True)
+
+        sections = portfolio_renderer.sections(
+            user_data, image_src(hero_image), image_src(about_image),
+            {i: image_src(asset) for i, asset in project_images.items()}, resume_url
+        )
+        if image_mode == 'zip':
+            names = sorted({a.name for a in [hero_image, about_image, *project_images.values()] if a is not None})
+            entries = [('index.html', portfolio_renderer.stream(sections, as_json=False), True)]
+            entries += [(f"assets/{name}", image_assets.iter_file(name), False) for name in names]
+            response = Response(stream_zip(entries), mimetype='application/zip')
+            response.headers['Content-Disposition'] = 'attachment; filename=portfolio.zip'
+            return response
+        if request.args.get('format') == 'html':
+            return Response(portfolio_renderer.stream(sections, as_json=False), mimetype='text/html')
+        return Response(portfolio_renderer.stream(sections), mimetype='application/json')
+    except RequestEntityTooLarge:
+        raise
+    except ValueError as e:
+        # Malformed userData; sections() checks every field before the response starts.
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error: {e}")
         return jsonify({"error": str(e)}), 500
 
+_background_lock = threading.Lock()
+_background_started = False
+
+
+def start_background_tasks():
+    """Start per-process background work (LLM keep-alive, question pool prefill, upload cleanup) once."""
+    global _background_started
+    with _background_lock:
+        if _background_started:
+            return
+        _background_started = True
+    if os.getenv('LLM_WARM_ON_START', '1') == '1':
+        llm_client.start_keepalive(LLM_WARM_INTERVAL)
+    # Off by default: every worker would prefill every field, and all of them share one
+    # Ollama. Pools otherwise fill on first demand, one field at a time.
+    if os.getenv('QUESTION_POOL_PREWARM', '0') == '1':
+        question_pool.prefill(target=int(os.getenv('QUESTION_POOL_PREWARM_SIZE', 2)))
+    if UPLOAD_GC_INTERVAL > 0:
+        upload_janitor.start(UPLOAD_GC_INTERVAL)
+
+
+@api.before_app_request
+def ensure_background_tasks():
+    # Threads do not survive fork, so each worker starts its own on its first request.
+    if not _background_started:
+        start_background_tasks()
+
+
+READINESS_PING_TIMEOUT = float(os.getenv('READINESS_PING_TIMEOUT', 2))
+
+
+@api.route('/ready', methods=['GET'])
+@cross_origin()
+def readiness():
+    """Report which components are loaded; 503 until every required one is available."""
+    resources.load_required()
+    components = resources.status()
+    try:
+        with pymongo.timeout(READINESS_PING_TIMEOUT):
+            mongo_client.get().admin.command('ping')
+    except Exception as e:
+        components['mongodb'].update(available=False, error=str(e))
+    ready = all(c['available'] for c in components.values() if c['required'])
+    return jsonify({"ready": ready, "components": components}), 200 if ready else 503
+
+
+def create_app(preload=None):
+    """
+    Build the Flask app. Models and clients load lazily on first use; with `preload`
+    (default: APP_PRELOAD=1) the models load now, so workers forked from this process
+    share their memory copy-on-write.
+    """
+    app = Flask(__name__)
+    # Uploaded files are written straight to UPLOAD_FOLDER, hashed as they arrive.
+    app.request_class = StreamingUploadRequest
+    CORS(app)
+    app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+    app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+    # Let a fronting nginx/Apache send upload and asset files (X-Sendfile).
+    app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE', '0') == '1'
+    trusted_proxies = int(os.getenv('TRUSTED_PROXIES', 0))
+    if trusted_proxies:
+        # Behind nginx, take the client IP (used by the auth rate limits) from X-Forwarded-For.
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxies, x_proto=trusted_proxies)
+    # UPLOAD_FOLDER and ASSET_FOLDER are created by the stores on their first write.
+    app.register_blueprint(api)
+    if preload is None:
+        preload = os.getenv('APP_PRELOAD', '0') == '1'
+    if preload:
+        resources.preload()
+    return app
+
+
 if __name__ == '__main__':
-    if model is None:
+    app = create_app(preload=True)
+    start_background_tasks()
+    if career_model.get() is None:
         print("WARNING: Prediction Model failed to load")
         print("Career prediction features may not work...")
     else:
         print("All systems initialized successfully....")
-        print("  1) - Ollama: Ready (llama3.2:1b)")
+        print(f"  1) - LLM: Ready ({LLM_BACKEND}, {MODEL_NAME})")
         print("  2) - MongoDB: Connected")
         print("  3) - Prediction Model: Loaded")
     app.run(debug=True, port=5000, use_reloader=False)
@@ -0,0 +1,204 @@
+"""
+Flat-array inference for the fitted scikit-learn models.
+
+The estimators are converted once into contiguous NumPy arrays so a request only
+pays for a few vectorized array operations, not sklearn's per-call validation
+and per-tree Python dispatch. tests/test_compiled_model.py checks that predictions
+and decision values equal the pickled career model's; run this file directly to
+compare single-row latencies.
+"""
+import numpy as np
+
+
+# Rows per block when laying out libsvm's per-pair terms (~100 KB of floats per row).
+ROW_BLOCK = 256
+
+
+class CompiledLinearSVC:
+    """
+    One-vs-one linear SVC (sklearn SVC with kernel='linear') evaluated the way libsvm does.
+
+    Integer skill ratings put many rows exactly on a pairwise hyperplane, and libsvm
+    settles those ties by the rounding of its own sum: the kernel value against each
+    support vector times its dual coefficient, added one at a time in support-vector
+    order, then rho. coef_ @ x rounds differently and flips those votes, so each pair's
+    terms are laid out in libsvm's order and summed with a sequential cumsum. That
+    reproduces libsvm's decision values, and so sklearn's predictions, bit for bit.
+    """
+
+    def __init__(self, svc):
+        if getattr(svc, 'kernel', None) != 'linear':
+            raise TypeError("Only linear-kernel SVC models can be compiled.")
+        self.classes_ = np.asarray(svc.classes_)
+        n_classes = len(self.classes_)
+        # libsvm's own arrays (sklearn flips the public ones for binary problems).
+        dual_coef = np.asarray(svc._dual_coef_, dtype=np.float64)
+        self.intercept = np.ascontiguousarray(svc._intercept_, dtype=np.float64)
+        self.support_vectors = np.ascontiguousarray(svc.support_vectors_, dtype=np.float64)
+        n_support = np.asarray(svc._n_support)
+        start = np.concatenate([[0], np.cumsum(n_support)[:-1]])
+
+        # Pair k compares classes (i, j), i < j, in libsvm order. Its terms are class i's
+        # support vectors with dual_coef[j-1], then class j's with dual_coef[i]; shorter
+        # rows are padded at the end with zero terms, which leave the sum unchanged.
+        pairs = [(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)]
+        width = max(n_support[i] + n_support[j] for i, j in pairs)
+        self.term_index = np.zeros((len(pairs), width), dtype=np.intp)
+        self.term_coef = np.zeros((len(pairs), width), dtype=np.float64)
+        for k, (i, j) in enumerate(pairs):
+            first = np.arange(start[i], start[i] + n_support[i])
+            second = np.arange(start[j], start[j] + n_support[j])
+            self.term_index[k, :len(first) + len(second)] = np.concatenate([first, second])
+            self.term_coef[k, :len(first) + len(second)] = np.concatenate([dual_coef[j - 1, first], dual_coef[i, second]])
+
+        self.first_votes = np.zeros((len(pairs), n_classes))
+        self.second_votes = np.zeros((len(pairs), n_classes))
+        self.first_votes[np.arange(len(pairs)), [i for i, _ in pairs]] = 1
+        self.second_votes[np.arange(len(pairs)), [j for _, j in pairs]] = 1
+        # sklearn's one-vs-rest transform adds +dec to class i and -dec to class j, pair
+        # by pair; these list each class's pairs (and signs) in that order.
+        self.ovr_pairs = np.array([[k for k, (i, j) in enumerate(pairs) if c in (i, j)] for c in range(n_classes)],
+                                  dtype=np.intp)
+        self.ovr_signs = np.array([[1.0 if pairs[k][0] == c else -1.0 for k in row] for c, row in enumerate(self.ovr_pairs)])
+
+    def _pairwise(self, X):
+        """libsvm's one-vs-one decision values, (n_rows, n_pairs)."""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        dec = np.empty((X.shape[0], len(self.intercept)))
+        for begin in range(0, X.shape[0], ROW_BLOCK):
+            kernel = X[begin:begin + ROW_BLOCK] @ self.support_vectors.T
+            terms = kernel[:, self.term_index] * self.term_coef
+            dec[begin:begin + ROW_BLOCK] = np.cumsum(terms, axis=2)[:, :, -1] + self.intercept
+        return dec
+
+    def _votes(self, first_wins):
+        first_wins = first_wins.astype(np.float64)
+        return first_wins @ self.first_votes + (1 - first_wins) @ self.second_votes
+
+    def vote_counts(self, X):
+        """Pairwise wins per class as predict() counts them (class i wins when dec > 0)."""
+        return self._votes(self._pairwise(X) > 0)
+
+    def predict(self, X):
+        # Ties in votes go to the lowest class index, as in libsvm.
+        return self.classes_[np.argmax(self.vote_counts(X), axis=1)]
+
+    def decision_function(self, X):
+        """One-vs-rest scores, identical to SVC.decision_function(decision_function_shape='ovr')."""
+        dec = self._pairwise(X)
+        if len(self.classes_) == 2:
+            return -dec.ravel()
+        # sklearn counts dec == 0 as a win for class i here, unlike predict().
+        votes = self._votes(dec >= 0)
+        confidences = np.cumsum(dec[:, self.ovr_pairs] * self.ovr_signs, axis=2)[:, :, -1]
+        return votes + confidences / (3 * (np.abs(confidences) + 1))
+
+
+class CompiledForest:
+    """RandomForestClassifier flattened into one set of node arrays across all trees."""
+
+    def __init__(self, forest):
+        trees = [est.tree_ for est in forest.estimators_]
+        self.classes_ = np.asarray(forest.classes_)
+        n_classes = len(self.classes_)
+        offsets = np.cumsum([0] + [t.node_count for t in trees[:-1]])
+
+        feature, threshold, left, right, value = [], [], [], [], []
+        for offset, tree in zip(offsets, trees):
+            is_leaf = tree.children_left == -1
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            # Leaves point at themselves so every row can take the same number of steps.
+            node_ids = np.arange(tree.node_count) + offset
+            left.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            right.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            leaf_value = tree.value[:, 0, :n_classes]
+            value.append(leaf_value / leaf_value.sum(axis=1, keepdims=True))
+
+        self.feature = np.ascontiguousarray(np.concatenate(feature), dtype=np.intp)
+        self.threshold = np.ascontiguousarray(np.concatenate(threshold), dtype=np.float64)
+        self.left = np.ascontiguousarray(np.concatenate(left), dtype=np.intp)
+        self.right = np.ascontiguousarray(np.concatenate(right), dtype=np.intp)
+        self.value = np.ascontiguousarray(np.concatenate(value), dtype=np.float64)
+        self.roots = np.asarray(offsets, dtype=np.intp)
+        self.max_depth = max(t.max_depth for t in trees)
+        self.n_trees = len(trees)
+
+    def apply(self, X):
+        """Leaf node index of every (row, tree) pair."""
+        # sklearn trees compare float32 features against float64 thresholds.
+        X = np.atleast_2d(np.asarray(X, dtype=np.float32)).astype(np.float64)
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        return self.value[self.apply(X)].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def compile_model(estimator):
+    """Compile a fitted estimator into its flat-array equivalent."""
+    if hasattr(estimator, 'estimators_') and hasattr(estimator.estimators_[0], 'tree_'):
+        return CompiledForest(estimator)
+    if hasattr(estimator, 'coef_') and hasattr(estimator, 'intercept_') and hasattr(estimator, 'support_'):
+        return CompiledLinearSVC(estimator)
+    raise TypeError(f"Cannot compile estimator of type {type(estimator).__name__}")
+
+
+def _latency_percentiles(fn, rows, repeat=2000):
+    import time
+    samples = []
+    for i in range(repeat):
+        row = rows[i % len(rows)][None, :]
+        start = time.perf_counter()
+        fn(row)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def skill_grid(n_features, max_rated=3, levels=7):
+    """Every rating vector with at most `max_rated` non-zero skills: the sparse profiles most users send."""
+    from itertools import combinations, product
+    rows = [np.zeros(n_features)]
+    for rated in range(1, max_rated + 1):
+        for features in combinations(range(n_features), rated):
+            for values in product(range(1, levels), repeat=rated):
+                row = np.zeros(n_features)
+                row[list(features)] = values
+                rows.append(row)
+    return np.array(rows)
+
+
+def parity_inputs(X_dataset, n_random=100_000, seed=0):
+    """Named input sets for the parity check: the training CSV, random, sparse random and the sparse grid."""
+    rng = np.random.default_rng(seed)
+    n_features = X_dataset.shape[1]
+    uniform = rng.integers(0, 7, (n_random, n_features)).astype(np.float64)
+    sparse = uniform * (rng.random(uniform.shape) >= 0.7)
+    return {'dataset9000.csv': X_dataset, 'uniform random': uniform, 'sparse random (70% zero)': sparse,
+            'every profile with <= 3 rated skills': skill_grid(n_features)}
+
+
+if __name__ == '__main__':
+    import pickle
+    import warnings
+    import pandas as pd
+
+    warnings.filterwarnings("ignore")
+    with open('career_model.pkl', 'rb') as f:
+        model = pickle.load(f)
+    compiled = compile_model(model)
+    X = pd.read_csv('dataset9000.csv').iloc[:, :-1].apply(lambda col: col.map({
+        'Not Interested': 0, 'Poor': 1, 'Beginner': 2, 'Average': 3,
+        'Intermediate': 4, 'Excellent': 5, 'Professional': 6
+    })).fillna(0).to_numpy(dtype=np.float64)
+
+    for name, fn in [('sklearn', model.predict), ('compiled', compiled.predict)]:
+        p50, p99 = _latency_percentiles(fn, X)
+        print(f"{name:>8} single-row predict: p50 {p50:8.1f} us  p99 {p99:8.1f} us")
@@ -0,0 +1,36 @@
+# Production serving: gunicorn -c gunicorn.conf.py
+#
+# Worker model: a few processes, each running gevent. gunicorn monkey-patches the
+# standard library before importing the app, so every blocking socket call in the
+# routes (Ollama via httpx, Adzuna via requests, MongoDB via pymongo) yields to other
+# requests instead of pinning an OS thread; one worker holds up to
+# `worker_connections` in-flight requests. The app's background threads (log writer,
+# LLM keep-alive, question pool refills) and executors become greenlets too.
+#
+# Each process has its own models, caches and LLM scheduler, so the total number of
+# concurrent model calls is WEB_WORKERS x LLM_MAX_CONCURRENCY.
+import os
+
+# The app factory is called once per worker (or once in the master with APP_PRELOAD=1).
+wsgi_app = os.getenv('WSGI_APP', 'app:create_app()')
+bind = os.getenv('BIND', '0.0.0.0:5000')
+worker_class = os.getenv('WORKER_CLASS', 'gevent')
+workers = int(os.getenv('WEB_WORKERS', 2))
+# Workers inherit this, so per-process pools (the password hasher) can split the CPUs.
+os.environ['WEB_WORKERS'] = str(workers)
+worker_connections = int(os.getenv('WORKER_CONNECTIONS', 1000))
+# Cover letter streams and queued LLM jobs can legitimately run for minutes.
+timeout = int(os.getenv('WORKER_TIMEOUT', 300))
+graceful_timeout = int(os.getenv('WORKER_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('WORKER_KEEPALIVE', 5))
+accesslog = os.getenv('ACCESS_LOG', '-') or None
+
+# APP_PRELOAD=1 imports the app once in the master and loads the ML models there
+# (create_app preloads them), so forked workers share those pages copy-on-write
+# instead of each unpickling its own copy. Network clients and background threads
+# are still created lazily inside each worker. The master imports the app before
+# any gevent worker patches the standard library, so patch it here first.
+preload_app = os.getenv('APP_PRELOAD', '0') == '1'
+if preload_app and worker_class == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
@@ -0,0 +1,181 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised without touching the network while an upstream's circuit is open."""
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; lets one trial call through after `reset_timeout`."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.times_opened += 1
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            return {'state': self.state, 'consecutive_failures': self.failures, 'times_opened': self.times_opened}
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in milliseconds."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, ms):
+        index = next((i for i, bound in enumerate(self.buckets) if ms <= bound), len(self.buckets))
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ms += ms
+
+    def percentile(self, q):
+        """Upper bucket bound containing the q-th percentile (None if above the last bucket)."""
+        if not self.count:
+            return 0.0
+        target = q / 100 * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return None
+
+    def stats(self):
+        with self._lock:
+            labels = [f"le_{b}" for b in self.buckets] + ['le_inf']
+            return {
+                'count': self.count,
+                'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+                'p50_ms': self.percentile(50),
+                'p99_ms': self.percentile(99),
+                'buckets': dict(zip(labels, self.counts))
+            }
+
+
+class UpstreamClient:
+    """
+    Pooled HTTP client for one upstream service.
+
+    Connections are kept alive in a shared Session. 429/5xx responses and
+    connection errors are retried with full-jitter exponential backoff, and a
+    circuit breaker makes calls fail fast while the upstream is unhealthy.
+    """
+
+    def __init__(self, name, pool_size=20, max_retries=2, backoff_base=0.25, backoff_max=4.0,
+                 timeout=(3.05, 10), breaker=None):
+        self.name = name
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyHistogram()
+        self.counters = {'requests': 0, 'retries': 0, 'failures': 0, 'short_circuited': 0}
+        self._lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _backoff(self, attempt, response=None):
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get(self, url, **kwargs):
+        if not self.breaker.allow():
+            self._count('short_circuited')
+            raise CircuitOpenError(f"{self.name} circuit is open; failing fast")
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            response = self._get_with_retries(url, **kwargs)
+        except BaseException:
+            # Any error, not only connection errors and timeouts, must resolve the breaker:
+            # a half-open trial that ended without a verdict would block every later call.
+            self._count('failures')
+            self.breaker.record_failure()
+            raise
+        if response.status_code in RETRY_STATUSES:
+            self._count('failures')
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def _get_with_retries(self, url, **kwargs):
+        """GET, retrying connection errors, timeouts and 429/5xx with backoff; the last response is returned."""
+        for attempt in range(self.max_retries + 1):
+            self._count('requests')
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.latency.observe((time.perf_counter() - start) * 1000)
+                if attempt == self.max_retries:
+                    raise
+                self._count('retries')
+                time.sleep(self._backoff(attempt))
+                continue
+            except BaseException:
+                self.latency.observe((time.perf_counter() - start) * 1000)
+                raise
+            self.latency.observe((time.perf_counter() - start) * 1000)
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                self._count('retries')
+                time.sleep(self._backoff(attempt, response))
+                continue
+            return response
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {**counters, 'circuit': self.breaker.stats(), 'latency': self.latency.stats()}
@@ -0,0 +1,217 @@
+import base64
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from collections import namedtuple
+
+from ttl_cache import LRUCache
+from upload_store import CHUNK_BYTES, adopt, receive
+
+try:
+    from PIL import Image, ImageOps, UnidentifiedImageError
+except ImportError:  # Pillow is optional: without it images are stored as uploaded.
+    Image = ImageOps = UnidentifiedImageError = None
+
+
+MIME_BY_EXT = {'.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg',
+               '.gif': 'image/gif', '.webp': 'image/webp'}
+EXT_BY_MIME = {'image/png': '.png', 'image/jpeg': '.jpg', 'image/gif': '.gif', 'image/webp': '.webp'}
+
+ImageAsset = namedtuple('ImageAsset', ['name', 'mime', 'size', 'width', 'height'])
+
+
+def mime_for(name):
+    return MIME_BY_EXT.get(os.path.splitext(name)[1].lower(), 'image/jpeg')
+
+
+class ImageAssetStore:
+    """
+    Content-addressed store for uploaded portfolio images.
+
+    save() streams an upload to a temp file in `chunk_size` pieces while hashing it,
+    so an upload is never held in memory whole. A source already seen is answered
+    from the index without decoding it again. Otherwise, with Pillow installed, the
+    image is downscaled to fit `max_dimension` and recompressed; the smaller of that
+    and the original is kept. Files are named by the SHA-256 of their stored bytes,
+    so identical images from any user, worker or request share one file and its URL
+    can be cached forever.
+    """
+
+    def __init__(self, root, max_dimension=1600, jpeg_quality=82, chunk_size=CHUNK_BYTES, index_size=4096,
+                 inline_cache_size=32):
+        self.root = root
+        self.max_dimension = max_dimension
+        self.jpeg_quality = jpeg_quality
+        self.chunk_size = chunk_size
+        self._by_source = LRUCache(maxsize=index_size)
+        self._data_uris = LRUCache(maxsize=inline_cache_size)
+        self._lock = threading.Lock()
+        self.counters = {'uploads': 0, 'dedupe_hits': 0, 'resized': 0, 'recompressed': 0,
+                         'kept_original': 0, 'failures': 0, 'bytes_in': 0, 'bytes_stored': 0}
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self.counters[key] += delta
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def save(self, file_storage):
+        """
+        Store an uploaded image (a werkzeug FileStorage) and return its ImageAsset.
+        Raises ValueError if Pillow is installed and cannot read the file as an image.
+        """
+        temp_path, source_key, size = receive(file_storage, self.root, self.chunk_size)
+        try:
+            self._count(uploads=1, bytes_in=size)
+            known = self._by_source.get(source_key)
+            if known is not None and os.path.exists(self.path(known.name)):
+                os.utime(self.path(known.name))
+                self._count(dedupe_hits=1)
+                return known
+            asset = self._store(temp_path, size, source_key, mime_for(file_storage.filename or ''))
+            self._by_source.set(source_key, asset)
+            return asset
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _store(self, temp_path, size, source_key, mime):
+        chosen_path, ext, width, height = temp_path, EXT_BY_MIME.get(mime, '.jpg'), None, None
+        if Image is not None:
+            try:
+                optimized_path, ext, mime, width, height, resized = self._optimize(temp_path, size)
+            except UnidentifiedImageError:
+                self._count(failures=1)
+                raise ValueError("Upload is not a supported image")
+            except Exception as e:
+                self._count(failures=1)
+                print(f"Image optimization failed, storing original: {e}", file=sys.stderr)
+            else:
+                if optimized_path:
+                    chosen_path = optimized_path
+                    self._count(resized=int(resized), recompressed=int(not resized))
+                else:
+                    self._count(kept_original=1)
+        try:
+            content_key = source_key if chosen_path == temp_path else _file_digest(chosen_path, self.chunk_size)
+            name = content_key[:32] + ext
+            stored = self.path(name)
+            if adopt(chosen_path, stored):
+                self._count(bytes_stored=os.path.getsize(stored))
+            else:
+                self._count(dedupe_hits=1)
+            return ImageAsset(name, mime, os.path.getsize(stored), width, height)
+        finally:
+            if chosen_path != temp_path and os.path.exists(chosen_path):
+                os.remove(chosen_path)
+
+    def _optimize(self, source_path, source_size):
+        """
+        Downscale and recompress with Pillow. Returns (path, ext, mime, width, height, resized);
+        path is None when the original, in a web format and not oversized, is already smaller.
+        """
+        with Image.open(source_path) as img:
+            fmt = img.format
+            mime = Image.MIME.get(fmt, 'image/jpeg')
+            web_format = mime in EXT_BY_MIME
+            if fmt == 'GIF' and getattr(img, 'is_animated', False):
+                return None, '.gif', mime, img.width, img.height, False
+            resized = max(img.size) > self.max_dimension
+            if resized:
+                # Before exif_transpose, which loads the full image: a JPEG can then be
+                # decoded straight at 1/2, 1/4 or 1/8 scale (reducing_gap=1).
+                img.thumbnail((self.max_dimension, self.max_dimension), Image.LANCZOS, reducing_gap=1.0)
+            img = ImageOps.exif_transpose(img)
+            if fmt not in ('PNG', 'WEBP', 'GIF'):
+                fmt, mime = 'JPEG', 'image/jpeg'
+                if img.mode not in ('RGB', 'L'):
+                    img = img.convert('RGB')
+            fd, out_path = tempfile.mkstemp(dir=self.root, suffix='.optimized')
+            with os.fdopen(fd, 'wb') as out:
+                if fmt == 'JPEG':
+                    img.save(out, 'JPEG', quality=self.jpeg_quality, optimize=True)
+                elif fmt == 'WEBP':
+                    img.save(out, 'WEBP', quality=self.jpeg_quality, method=4)
+                else:
+                    img.save(out, fmt, optimize=True)
+            width, height = img.size
+        if web_format and not resized and os.path.getsize(out_path) >= source_size:
+            os.remove(out_path)
+            return None, EXT_BY_MIME[mime], mime, width, height, False
+        return out_path, EXT_BY_MIME[mime], mime, width, height, resized
+
+    def iter_file(self, name):
+        with open(self.path(name), 'rb') as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def data_uri(self, asset):
+        """Inline the stored (already downscaled) image as a base64 data URI, cached by content name."""
+        uri = self._data_uris.get(asset.name)
+        if uri is None:
+            with open(self.path(asset.name), 'rb') as f:
+                uri = f"data:{asset.mime};base64,{base64.b64encode(f.read()).decode('ascii')}"
+            self._data_uris.set(asset.name, uri)
+        return uri
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {**counters, 'pillow': Image is not None, 'max_dimension': self.max_dimension,
+                'source_index': self._by_source.stats(), 'inline_cache': self._data_uris.stats()}
+
+
+def _file_digest(path, chunk_size):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _ChunkSink:
+    """Write-only file object that collects what zipfile writes so it can be yielded."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_zip(entries):
+    """
+    Yield a ZIP archive as it is built. `entries` are (arcname, chunks, compress)
+    tuples where `chunks` is an iterable of bytes; nothing is buffered beyond one chunk
+    (sizes and CRCs go in data descriptors, since the output cannot seek back).
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w') as archive:
+        for arcname, chunks, compress in entries:
+            info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            with archive.open(info, 'w') as member:
+                for chunk in chunks:
+                    member.write(chunk)
+                    if sink.chunks:
+                        yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
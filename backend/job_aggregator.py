@@ -0,0 +1,91 @@
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+class SalaryStats:
+    """Running per-location salary aggregates, updated as listings arrive."""
+
+    def __init__(self):
+        self._by_location = {}
+
+    def add(self, listing):
+        low, high = listing.get('salary_min'), listing.get('salary_max')
+        if low is None and high is None:
+            return
+        low = high if low is None else low
+        high = low if high is None else high
+        entry = self._by_location.setdefault(listing.get('location') or 'Unknown',
+                                             {'min': low, 'max': high, 'midpoints': []})
+        entry['min'] = min(entry['min'], low)
+        entry['max'] = max(entry['max'], high)
+        entry['midpoints'].append((low + high) / 2)
+
+    def summary(self):
+        return {
+            location: {
+                'salary_min': entry['min'],
+                'salary_max': entry['max'],
+                'salary_median': statistics.median(entry['midpoints']),
+                'listings': len(entry['midpoints'])
+            }
+            for location, entry in self._by_location.items()
+        }
+
+
+def aggregate_listings(fetch, tasks, executor, deadline):
+    """
+    Run fetch(country, page) for every task on `executor` and yield events as pages arrive.
+
+    Yields {'type': 'partial', ...} per finished page with only the listings not seen
+    before (deduplicated by URL), then one {'type': 'summary', ...} with the merged
+    listings and per-location salary stats. Pages still running at `deadline`
+    (a time.monotonic() value) are abandoned and reported as timed out.
+    """
+    futures = {executor.submit(fetch, country, page): (country, page) for country, page in tasks}
+    pending = set(futures)
+    seen_urls = set()
+    merged = []
+    salaries = SalaryStats()
+    errors = []
+    total_count = 0
+
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            country, page = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                errors.append({'country': country, 'page': page, 'error': str(e)})
+                yield {'type': 'error', 'country': country, 'page': page, 'error': str(e)}
+                continue
+            fresh = []
+            for listing in result['listings']:
+                key = listing.get('url') or (listing.get('title'), listing.get('company'), listing.get('location'))
+                if key in seen_urls:
+                    continue
+                seen_urls.add(key)
+                listing = dict(listing, country=country)
+                fresh.append(listing)
+                salaries.add(listing)
+            if page == 1:
+                total_count += result.get('count', 0)
+            merged.extend(fresh)
+            yield {'type': 'partial', 'country': country, 'page': page, 'listings': fresh}
+
+    timed_out = [{'country': futures[f][0], 'page': futures[f][1]} for f in pending]
+    for future in pending:
+        future.cancel()
+    yield {
+        'type': 'summary',
+        'listings': merged,
+        'count': total_count,
+        'unique_listings': len(merged),
+        'salary_by_location': salaries.summary(),
+        'errors': errors,
+        'timed_out': timed_out
+    }
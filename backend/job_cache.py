@@ -0,0 +1,195 @@
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pymongo
+
+from ttl_cache import LRUCache
+
+
+class MongoCacheStore:
+    """
+    Persistent cache entries in a MongoDB collection, expired by a TTL index.
+
+    The store sits on the request path, so every call is bounded by `timeout` seconds
+    (pymongo.timeout, which also caps server selection), and after a failure the store
+    is skipped for `retry_after` seconds: with MongoDB down, requests fall through to
+    the memory cache and upstream instead of waiting on it.
+    """
+
+    def __init__(self, collection, timeout=0.5, retry_after=30):
+        self.collection = collection
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._down_until = 0.0
+        self._indexed = False
+
+    def _available(self):
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, action, e):
+        self._down_until = time.monotonic() + self.retry_after
+        print(f"Cache store {action} failed, skipping the store for {self.retry_after}s: {e}", file=sys.stderr)
+
+    def get(self, key):
+        if not self._available():
+            return None
+        try:
+            with pymongo.timeout(self.timeout):
+                doc = self.collection.find_one({'_id': key})
+        except Exception as e:
+            self._failed('read', e)
+            return None
+        if not doc:
+            return None
+        return doc['value'], doc['fetched_at']
+
+    def set(self, key, value, fetched_at, expires_in):
+        if not self._available():
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            with pymongo.timeout(self.timeout):
+                if not self._indexed:
+                    self.collection.create_index('expires_at', expireAfterSeconds=0)
+                    self._indexed = True
+                self.collection.replace_one(
+                    {'_id': key},
+                    {'value': value, 'fetched_at': fetched_at, 'expires_at': now + timedelta(seconds=expires_in)},
+                    upsert=True
+                )
+        except Exception as e:
+            self._failed('write', e)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class StaleWhileRevalidateCache:
+    """
+    TTL cache for upstream responses with stale-while-revalidate and single-flight loads.
+
+    Entries younger than `ttl` are served as-is. Entries up to `ttl + stale_ttl` old are
+    served immediately while one background refresh runs. Concurrent misses for the
+    same key share a single upstream call. Older entries are kept for up to `max_stale`
+    seconds so peek() can still offer degraded data when the upstream is down. An
+    optional persistent store keeps entries across restarts. Ages are measured with
+    `clock` (seconds since the epoch).
+    """
+
+    def __init__(self, ttl=900, stale_ttl=3600, max_stale=86400, maxsize=1024, store=None, clock=time.time):
+        self.ttl = ttl
+        self.clock = clock
+        self.stale_ttl = stale_ttl
+        self.max_stale = max(max_stale, ttl + stale_ttl)
+        self.store = store
+        self._memory = LRUCache(maxsize=maxsize, ttl=self.max_stale)
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'store_hits': 0,
+                         'coalesced': 0, 'refreshes': 0, 'refresh_errors': 0, 'degraded': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _lookup(self, key):
+        entry = self._memory.get(key)
+        if entry is None and self.store is not None:
+            stored = self.store.get(key)
+            if stored is not None:
+                value, fetched_at = stored
+                if fetched_at.tzinfo is None:
+                    fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+                age = self.clock() - fetched_at.timestamp()
+                if age < self.max_stale:
+                    entry = (value, fetched_at.timestamp())
+                    self._memory.set(key, entry, ttl=self.max_stale - age)
+                    self._count('store_hits')
+        return entry
+
+    def get(self, key, loader):
+        """Return (value, status) where status is 'hit', 'stale' or 'miss'."""
+        entry = self._lookup(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = self.clock() - fetched_at
+            if age < self.ttl:
+                self._count('hits')
+                return value, 'hit'
+            if age < self.ttl + self.stale_ttl:
+                self._count('stale_hits')
+                self._refresh_in_background(key, loader)
+                return value, 'stale'
+        self._count('misses')
+        return self._load(key, loader), 'miss'
+
+    def _load(self, key, loader):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.counters['coalesced'] += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        return self._fly(key, flight, loader)
+
+    def _fly(self, key, flight, loader):
+        try:
+            flight.value = loader()
+            self.set(key, flight.value)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _refresh_in_background(self, key, loader):
+        # The flight is registered before the thread starts, so stale hits that arrive
+        # meanwhile neither start another refresh nor count one.
+        with self._lock:
+            if key in self._flights:
+                return
+            flight = self._flights[key] = _Flight()
+
+        def refresh():
+            try:
+                self._fly(key, flight, loader)
+                self._count('refreshes')
+            except Exception as e:
+                self._count('refresh_errors')
+                print(f"Background refresh failed for {key}: {e}", file=sys.stderr)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def peek(self, key):
+        """Any cached value for key up to max_stale old, without triggering a load."""
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        self._count('degraded')
+        return entry[0]
+
+    def set(self, key, value):
+        fetched_at = self.clock()
+        self._memory.set(key, (value, fetched_at))
+        if self.store is not None:
+            self.store.set(key, value, datetime.fromtimestamp(fetched_at, timezone.utc), self.max_stale)
+
+    def stats(self):
+        with self._lock:
+            return {**self.counters, 'size': len(self._memory), 'ttl': self.ttl,
+                    'stale_ttl': self.stale_ttl, 'max_stale': self.max_stale}
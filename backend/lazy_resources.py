@@ -0,0 +1,81 @@
+import sys
+import threading
+import time
+
+
+class LazyResource:
+    """
+    A value built by `factory` on first use, exactly once, even under concurrent requests.
+
+    A factory that raises is not retried: get() returns None from then on and the
+    error is kept for the readiness report, matching the old load-at-import behaviour
+    where a missing model simply disabled its routes.
+    """
+
+    def __init__(self, name, factory, preload=False, required=False):
+        self.name = name
+        self.factory = factory
+        self.preload = preload
+        self.required = required
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._value = None
+        self.error = None
+        self.load_ms = None
+
+    def get(self):
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                started = time.perf_counter()
+                try:
+                    self._value = self.factory()
+                except Exception as e:
+                    self.error = str(e)
+                    print(f"WARNING: Could not load {self.name}: {e}", file=sys.stderr)
+                self.load_ms = round((time.perf_counter() - started) * 1000, 1)
+                self._loaded = True
+        return self._value
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def status(self):
+        return {
+            'loaded': self._loaded,
+            'available': self._loaded and self._value is not None,
+            'required': self.required,
+            'preload': self.preload,
+            'load_ms': self.load_ms,
+            'error': self.error
+        }
+
+
+class ResourceRegistry:
+    """Named LazyResources, so startup work can be preloaded and reported in one place."""
+
+    def __init__(self):
+        self._resources = {}
+
+    def register(self, name, factory, preload=False, required=False):
+        resource = self._resources[name] = LazyResource(name, factory, preload=preload, required=required)
+        return resource
+
+    def __getitem__(self, name):
+        return self._resources[name]
+
+    def preload(self):
+        """Load every resource marked preload (the fork-safe ones, like models)."""
+        for resource in self._resources.values():
+            if resource.preload:
+                resource.get()
+
+    def load_required(self):
+        for resource in self._resources.values():
+            if resource.required:
+                resource.get()
+
+    def status(self):
+        return {name: resource.status() for name, resource in self._resources.items()}
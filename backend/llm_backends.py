@@ -0,0 +1,196 @@
+import hashlib
+import json
+import re
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Every backend returns Ollama-shaped results: a dict with 'response', 'done' and the
+# *_duration (nanoseconds) / *_count fields, or an iterator of such dicts when streaming.
+
+
+class OllamaBackend:
+    """Local or remote Ollama server through the official client."""
+
+    name = 'ollama'
+    supports_keep_alive = True
+
+    def __init__(self, host=None):
+        import ollama
+        self._client = ollama.Client(host=host) if host else ollama
+
+    def generate(self, model, prompt, system=None, stream=False, format=None, options=None, keep_alive=None):
+        kwargs = {'model': model, 'prompt': prompt, 'stream': stream}
+        if system:
+            kwargs['system'] = system
+        if format:
+            kwargs['format'] = format
+        if options:
+            kwargs['options'] = options
+        if keep_alive is not None:
+            kwargs['keep_alive'] = keep_alive
+        return self._client.generate(**kwargs)
+
+
+class OpenAICompatibleBackend:
+    """
+    Any server exposing /v1/chat/completions (vLLM, llama.cpp server, LM Studio, ...).
+    Ollama options are mapped to their OpenAI equivalents; keep_alive is ignored.
+    """
+
+    name = 'openai'
+    supports_keep_alive = False
+    OPTION_MAP = {'temperature': 'temperature', 'top_p': 'top_p', 'seed': 'seed', 'num_predict': 'max_tokens'}
+
+    def __init__(self, base_url, api_key=None, timeout=(3.05, 300), pool_size=10):
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if api_key:
+            self.session.headers['Authorization'] = f"Bearer {api_key}"
+
+    def _payload(self, model, prompt, system, stream, format, options):
+        messages = ([{'role': 'system', 'content': system}] if system else []) + [{'role': 'user', 'content': prompt}]
+        payload = {'model': model, 'messages': messages, 'stream': stream}
+        for key, value in (options or {}).items():
+            if key in self.OPTION_MAP:
+                payload[self.OPTION_MAP[key]] = value
+        if format == 'json':
+            payload['response_format'] = {'type': 'json_object'}
+        if stream:
+            payload['stream_options'] = {'include_usage': True}
+        return payload
+
+    def generate(self, model, prompt, system=None, stream=False, format=None, options=None, keep_alive=None):
+        payload = self._payload(model, prompt, system, stream, format, options)
+        started = time.perf_counter()
+        response = self.session.post(self.url, json=payload, timeout=self.timeout, stream=stream)
+        response.raise_for_status()
+        if stream:
+            return self._stream(response, started)
+        body = response.json()
+        usage = body.get('usage') or {}
+        return {
+            'model': model,
+            'response': body['choices'][0]['message'].get('content') or '',
+            'done': True,
+            'prompt_eval_count': usage.get('prompt_tokens', 0),
+            'eval_count': usage.get('completion_tokens', 0),
+            'load_duration': 0,
+            'eval_duration': int((time.perf_counter() - started) * 1e9)
+        }
+
+    def _stream(self, response, started):
+        usage = {}
+        first_token_at = None
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[5:].strip()
+                if data == '[DONE]':
+                    break
+                event = json.loads(data)
+                usage = event.get('usage') or usage
+                for choice in event.get('choices') or []:
+                    token = (choice.get('delta') or {}).get('content')
+                    if token:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        yield {'response': token, 'done': False}
+            now = time.perf_counter()
+            yield {
+                'response': '',
+                'done': True,
+                'prompt_eval_count': usage.get('prompt_tokens', 0),
+                'eval_count': usage.get('completion_tokens', 0),
+                'load_duration': 0,
+                'prompt_eval_duration': int(((first_token_at or now) - started) * 1e9),
+                'eval_duration': int((now - (first_token_at or now)) * 1e9)
+            }
+        finally:
+            response.close()
+
+
+class StubBackend:
+    """
+    Deterministic in-process model for load-testing the web tier without a real LLM.
+
+    Output depends only on the model, seed option, system and prompt text. JSON
+    requests get an object whose keys are read from the `"key": ...` template in the
+    prompt, with integers for `integer` fields and 5 strings for list fields. Each call sleeps
+    `latency_ms` before the first token and then emits `tokens_per_sec` tokens.
+    """
+
+    name = 'stub'
+    supports_keep_alive = False
+    KEY_RE = re.compile(r'"(\w+)"\s*:\s*(\[|integer|"string"|[^,\n}]+)')
+    WORDS = ('scalable', 'design', 'latency', 'cache', 'service', 'team', 'data', 'impact',
+             'experience', 'pipeline', 'delivered', 'reliable', 'metrics', 'customer', 'system')
+
+    def __init__(self, latency_ms=200, tokens_per_sec=50, max_tokens=120):
+        self.latency_ms = latency_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.max_tokens = max_tokens
+
+    def _text(self, digest, count):
+        return ' '.join(self.WORDS[digest[i % len(digest)] % len(self.WORDS)] for i in range(count))
+
+    def _reply(self, model, prompt, system, format, seed):
+        digest = hashlib.sha256(f"{model}\x1f{seed}\x1f{system}\x1f{prompt}".encode('utf-8')).digest()
+        if format != 'json':
+            return [word + ' ' for word in self._text(digest, self.max_tokens).split()]
+        obj = {}
+        for index, (key, kind) in enumerate(self.KEY_RE.findall(f"{system or ''}\n{prompt}")):
+            if key in obj:
+                continue
+            if 'integer' in kind:
+                obj[key] = digest[index] % 11
+            elif kind == '[':
+                obj[key] = [self._text(digest[i:], 6) for i in range(5)]
+            else:
+                obj[key] = self._text(digest[index:], 12)
+        text = json.dumps(obj)
+        # Roughly four characters per token, like a real tokenizer.
+        return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+    def generate(self, model, prompt, system=None, stream=False, format=None, options=None, keep_alive=None):
+        seed = (options or {}).get('seed')
+        tokens = self._reply(model, prompt, system, format, seed) if prompt else []
+        if stream:
+            return self._stream(model, tokens)
+        time.sleep(self.latency_ms / 1000 + len(tokens) / self.tokens_per_sec)
+        return self._final(model, ''.join(tokens), len(tokens))
+
+    def _final(self, model, text, count):
+        return {
+            'model': model, 'response': text, 'done': True,
+            'load_duration': 0, 'prompt_eval_count': 0,
+            'prompt_eval_duration': int(self.latency_ms * 1e6),
+            'eval_count': count, 'eval_duration': int(count / self.tokens_per_sec * 1e9)
+        }
+
+    def _stream(self, model, tokens):
+        time.sleep(self.latency_ms / 1000)
+        for token in tokens:
+            time.sleep(1 / self.tokens_per_sec)
+            yield {'model': model, 'response': token, 'done': False}
+        yield self._final(model, '', len(tokens))
+
+
+def create_backend(kind, **settings):
+    """Build the backend named by LLM_BACKEND: 'ollama', 'openai' or 'stub'."""
+    if kind == 'ollama':
+        return OllamaBackend(host=settings.get('host'))
+    if kind == 'openai':
+        return OpenAICompatibleBackend(settings['base_url'], api_key=settings.get('api_key'))
+    if kind == 'stub':
+        return StubBackend(latency_ms=settings.get('latency_ms', 200),
+                           tokens_per_sec=settings.get('tokens_per_sec', 50),
+                           max_tokens=settings.get('max_tokens', 120))
+    raise ValueError(f"Unknown LLM backend '{kind}' (expected ollama, openai or stub)")
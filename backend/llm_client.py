@@ -0,0 +1,159 @@
+import sys
+import threading
+import time
+
+from http_client import LatencyHistogram
+
+
+LLM_LATENCY_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class _RouteMetrics:
+    def __init__(self):
+        self.load_ms = LatencyHistogram(LLM_LATENCY_BUCKETS_MS)
+        self.prompt_eval_ms = LatencyHistogram(LLM_LATENCY_BUCKETS_MS)
+        self.eval_ms = LatencyHistogram(LLM_LATENCY_BUCKETS_MS)
+        self.counters = {'calls': 0, 'cold_starts': 0, 'prompt_tokens': 0, 'eval_tokens': 0}
+
+    def stats(self):
+        return {**self.counters, 'load_ms': self.load_ms.stats(),
+                'prompt_eval_ms': self.prompt_eval_ms.stats(), 'eval_ms': self.eval_ms.stats()}
+
+
+class LLMClient:
+    """
+    One place for every LLM call made by the app, on top of a pluggable backend
+    (see llm_backends) and with an optional model override per route.
+
+    Each call passes `keep_alive` so the model stays resident between requests, and
+    start_keepalive() loads it at startup and re-pings it on a timer so idle periods
+    do not end in a cold load. Routes pass their static instructions as `system`;
+    keeping that text identical across calls gives Ollama a shared prompt prefix it
+    can reuse from its KV cache instead of re-evaluating. Load, prompt-eval and eval
+    time are recorded per route from Ollama's own durations, and calls whose load
+    time exceeds `cold_threshold_ms` are counted as cold starts.
+    """
+
+    def __init__(self, model, scheduler, backend, keep_alive='30m', cold_threshold_ms=500, route_models=None):
+        self.model = model
+        self.route_models = dict(route_models or {})
+        self.scheduler = scheduler
+        self.keep_alive = keep_alive
+        self.cold_threshold_ms = cold_threshold_ms
+        self.backend = backend
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._warm = {'pings': 0, 'failures': 0, 'last_load_ms': None, 'last_ping_at': None}
+        self._keepalive_thread = None
+
+    def model_for(self, route):
+        return self.route_models.get(route, self.model)
+
+    def _request(self, route, prompt, system, **kwargs):
+        return self.backend.generate(model=self.model_for(route), prompt=prompt, system=system,
+                                     keep_alive=self.keep_alive, **kwargs)
+
+    def record(self, route, response):
+        """Fold Ollama's duration fields (nanoseconds) from a final response into route metrics."""
+        load_ms = (response.get('load_duration') or 0) / 1e6
+        with self._lock:
+            metrics = self._metrics.setdefault(route, _RouteMetrics())
+            metrics.counters['calls'] += 1
+            metrics.counters['prompt_tokens'] += response.get('prompt_eval_count') or 0
+            metrics.counters['eval_tokens'] += response.get('eval_count') or 0
+            if load_ms > self.cold_threshold_ms:
+                metrics.counters['cold_starts'] += 1
+        metrics.load_ms.observe(load_ms)
+        metrics.prompt_eval_ms.observe((response.get('prompt_eval_duration') or 0) / 1e6)
+        metrics.eval_ms.observe((response.get('eval_duration') or 0) / 1e6)
+        if load_ms > self.cold_threshold_ms:
+            print(f"LLM cold start on '{route}': model load took {load_ms:.0f} ms")
+
+    def generate(self, route, user, prompt, system=None, **kwargs):
+        """Blocking generation, admitted through the scheduler under `route`."""
+        response = self.scheduler.run(route, user, self._request, route, prompt, system, **kwargs)
+        self.record(route, response)
+        return response
+
+    def stream(self, route, prompt, system=None, **kwargs):
+        """
+        Streaming generation. The caller must already hold a scheduler slot for `route`.
+        Closing the returned generator closes the Ollama stream, which stops generation;
+        a stream cut short is recorded with the tokens and time seen so far.
+        """
+        started = time.perf_counter()
+        tokens = 0
+        finished = False
+        chunks = self._request(route, prompt, system, stream=True, **kwargs)
+        try:
+            for chunk in chunks:
+                if chunk.get('done'):
+                    finished = True
+                    self.record(route, chunk)
+                elif chunk.get('response'):
+                    tokens += 1
+                yield chunk
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+            if not finished and tokens:
+                self.record(route, {'eval_count': tokens,
+                                    'eval_duration': int((time.perf_counter() - started) * 1e9)})
+
+    @property
+    def can_warm(self):
+        # Elsewhere an empty prompt is a real completion and keep_alive means nothing.
+        return getattr(self.backend, 'supports_keep_alive', False)
+
+    def warm(self):
+        """
+        Load every configured model (an empty prompt only loads it) and reset its
+        keep-alive timer. A no-op for backends without keep_alive.
+        """
+        if not self.can_warm:
+            return True
+        ok = True
+        for model in sorted({self.model, *self.route_models.values()}):
+            started = time.perf_counter()
+            try:
+                response = self.backend.generate(model=model, prompt='', keep_alive=self.keep_alive)
+            except Exception as e:
+                with self._lock:
+                    self._warm['failures'] += 1
+                print(f"LLM warm-up ping for {model} failed: {e}", file=sys.stderr)
+                ok = False
+                continue
+            load_ms = (response.get('load_duration') or 0) / 1e6
+            with self._lock:
+                self._warm['pings'] += 1
+                self._warm['last_load_ms'] = round(load_ms, 1)
+                self._warm['last_ping_at'] = time.time()
+            print(f"LLM {model} warm ({(time.perf_counter() - started) * 1000:.0f} ms, load {load_ms:.0f} ms)")
+        return ok
+
+    def start_keepalive(self, interval):
+        """Warm the model now in the background, then every `interval` seconds (0 warms once)."""
+        if self._keepalive_thread is not None:
+            return
+        if not self.can_warm:
+            backend = getattr(self.backend, 'name', type(self.backend).__name__)
+            print(f"LLM keep-alive disabled: the {backend} backend does not support keep_alive")
+            return
+
+        def loop():
+            while True:
+                self.warm()
+                if not interval:
+                    return
+                time.sleep(interval)
+
+        self._keepalive_thread = threading.Thread(target=loop, name='llm-keepalive', daemon=True)
+        self._keepalive_thread.start()
+
+    def stats(self):
+        with self._lock:
+            routes = dict(self._metrics)
+            warm = dict(self._warm)
+        return {'backend': getattr(self.backend, 'name', type(self.backend).__name__),
+                'model': self.model, 'route_models': self.route_models, 'keep_alive': self.keep_alive if self.can_warm else None, 'warm': warm,
+                'routes': {route: metrics.stats() for route, metrics in routes.items()}}
@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+from http_client import LatencyHistogram
+
+
+class SchedulerRejected(Exception):
+    """The LLM job was refused because its queue was full or it waited too long."""
+
+    def __init__(self, route, reason, retry_after=5):
+        super().__init__(f"LLM scheduler rejected '{route}' job: {reason}")
+        self.route = route
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RouteConfig:
+    def __init__(self, priority, max_concurrency=1, max_wait=30.0, max_queue=50):
+        self.priority = priority
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+
+
+class _Ticket:
+    __slots__ = ('route', 'user', 'enqueued_at', 'granted')
+
+    def __init__(self, route, user):
+        self.route = route
+        self.user = user
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+
+class LLMScheduler:
+    """
+    Admission control for calls into the single local LLM.
+
+    At most `max_concurrency` jobs run at once. A free slot goes to the waiting job
+    of the highest-priority route (lowest number) that is still under its own
+    concurrency cap; within a route, waiting users are served round-robin so one
+    user's burst cannot starve the others. Jobs that would exceed a route's queue
+    length, or that wait longer than its max_wait, are rejected with
+    SchedulerRejected so the caller can answer 503 immediately.
+    """
+
+    def __init__(self, routes, max_concurrency=2):
+        self.routes = dict(routes)
+        self.max_concurrency = max_concurrency
+        self._cond = threading.Condition()
+        self._waiting = {route: OrderedDict() for route in self.routes}
+        self._queued = {route: 0 for route in self.routes}
+        self._running = {route: 0 for route in self.routes}
+        self._total_running = 0
+        self._wait_ms = {route: LatencyHistogram() for route in self.routes}
+        self._counters = {route: {'completed': 0, 'failed': 0, 'rejected_full': 0, 'rejected_timeout': 0}
+                          for route in self.routes}
+
+    def _next_ticket(self, route):
+        users = self._waiting[route]
+        user, tickets = next(iter(users.items()))
+        ticket = tickets.popleft()
+        if tickets:
+            users.move_to_end(user)
+        else:
+            del users[user]
+        self._queued[route] -= 1
+        return ticket
+
+    def _dispatch(self):
+        granted = False
+        while self._total_running < self.max_concurrency:
+            candidates = [
+                r for r, users in self._waiting.items()
+                if users and self._running[r] < self.routes[r].max_concurrency
+            ]
+            if not candidates:
+                break
+            route = min(candidates, key=lambda r: self.routes[r].priority)
+            ticket = self._next_ticket(route)
+            ticket.granted = True
+            self._running[route] += 1
+            self._total_running += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _remove(self, ticket):
+        tickets = self._waiting[ticket.route].get(ticket.user)
+        if tickets is not None and ticket in tickets:
+            tickets.remove(ticket)
+            self._queued[ticket.route] -= 1
+            if not tickets:
+                del self._waiting[ticket.route][ticket.user]
+
+    def acquire(self, route, user='anonymous'):
+        """Block until the job may run; raises SchedulerRejected instead of waiting too long."""
+        config = self.routes[route]
+        with self._cond:
+            if self._queued[route] >= config.max_queue:
+                self._counters[route]['rejected_full'] += 1
+                raise SchedulerRejected(route, 'queue full', retry_after=max(1, int(config.max_wait)))
+            ticket = _Ticket(route, user)
+            self._waiting[route].setdefault(user, deque()).append(ticket)
+            self._queued[route] += 1
+            self._dispatch()
+            deadline = ticket.enqueued_at + config.max_wait
+            while not ticket.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._remove(ticket)
+                    self._counters[route]['rejected_timeout'] += 1
+                    raise SchedulerRejected(route, 'timed out waiting for a free model slot')
+                self._cond.wait(remaining)
+        self._wait_ms[route].observe((time.monotonic() - ticket.enqueued_at) * 1000)
+
+    def release(self, route, failed=False):
+        with self._cond:
+            self._running[route] -= 1
+            self._total_running -= 1
+            self._counters[route]['failed' if failed else 'completed'] += 1
+            self._dispatch()
+
+    def run(self, route, user, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) once a slot for `route` is free."""
+        self.acquire(route, user)
+        failed = True
+        try:
+            result = fn(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self.release(route, failed=failed)
+
+    def stats(self):
+        with self._cond:
+            routes = {
+                route: {
+                    **self._counters[route],
+                    'queue_depth': self._queued[route],
+                    'running': self._running[route],
+                    'priority': config.priority,
+                    'max_concurrency': config.max_concurrency,
+                    'max_wait_s': config.max_wait
+                }
+                for route, config in self.routes.items()
+            }
+            running = self._total_running
+        for route in routes:
+            routes[route]['wait_ms'] = self._wait_ms[route].stats()
+        return {'max_concurrency': self.max_concurrency, 'running': running, 'routes': routes}
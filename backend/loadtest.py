@@ -0,0 +1,99 @@
+"""
+Concurrent-request load test for the backend.
+
+Runs `--concurrency` client threads against one endpoint for `--duration` seconds
+and reports throughput, status codes and latency percentiles. Use it to compare
+the threaded dev server (`python app.py`) with the production gevent workers
+(`gunicorn -c gunicorn.conf.py`), ideally with LLM_BACKEND=stub so the model
+itself is not the bottleneck.
+
+    python loadtest.py --url http://localhost:5000/job-insights \\
+        --json '{"role": "Data Scientist", "location": "in"}' --unique role \\
+        --concurrency 200 --duration 20
+"""
+import argparse
+import itertools
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+
+import requests
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run(url, method, body, unique, concurrency, duration, timeout):
+    counter = itertools.count()
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker():
+        session = requests.Session()
+        while time.monotonic() < deadline:
+            payload = body
+            if unique and payload is not None:
+                payload = dict(payload, **{unique: f"{payload.get(unique, '')} {next(counter)}"})
+            started = time.perf_counter()
+            try:
+                response = session.request(method, url, json=payload, timeout=timeout)
+                status = response.status_code
+            except requests.exceptions.RequestException as e:
+                status = type(e).__name__
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                statuses[status] += 1
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    ok = sum(n for status, n in statuses.items() if isinstance(status, int) and status < 400)
+    return {
+        'requests': len(latencies),
+        'ok': ok,
+        'statuses': {str(status): n for status, n in statuses.items()},
+        'throughput_rps': round(len(latencies) / wall, 1),
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies), 1) if latencies else None,
+            'p50': round(percentile(latencies, 50), 1) if latencies else None,
+            'p95': round(percentile(latencies, 95), 1) if latencies else None,
+            'p99': round(percentile(latencies, 99), 1) if latencies else None,
+            'max': round(latencies[-1], 1) if latencies else None
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', required=True)
+    parser.add_argument('--method', default='POST')
+    parser.add_argument('--json', default=None, help='JSON request body')
+    parser.add_argument('--unique', default=None,
+                        help='JSON string field to suffix with a counter so every request misses the caches')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args()
+
+    body = json.loads(args.json) if args.json else None
+    result = run(args.url, args.method.upper(), body, args.unique, args.concurrency, args.duration, args.timeout)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+import atexit
+import json
+import queue
+import sys
+import threading
+import time
+
+
+OVERFLOW_POLICIES = ('drop', 'block', 'spill')
+_STOP = object()
+
+
+class BackgroundWriter:
+    """
+    A bounded queue drained by one worker thread, so callers never wait on the database.
+
+    The worker hands write(batch) up to batch_size items at a time, waiting at most
+    flush_interval seconds for a batch to fill. It is started on first use, so forked
+    server workers each get their own thread. What to do with items that do not fit,
+    or are still queued when close() gives up, is left to the owner.
+    """
+
+    def __init__(self, write, name, max_queue=10000, batch_size=500, flush_interval=1.0):
+        self.write = write
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._worker.start()
+
+    def put(self, item, timeout=None):
+        """Queue item, waiting up to `timeout` seconds for room (None: not at all); False if full."""
+        self._ensure_worker()
+        try:
+            if timeout:
+                self._queue.put(item, timeout=timeout)
+            else:
+                self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self.write(batch)
+            if stop:
+                break
+        batch = self._take_all()
+        if batch:
+            self.write(batch)
+
+    def _take_all(self):
+        items = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return items
+            if item is not _STOP:
+                items.append(item)
+
+    def close(self, timeout=10):
+        """
+        Write everything still queued and stop the worker, waiting at most about
+        `timeout` seconds. Returns the items that were not written by then.
+        """
+        if self._worker is None or not self._worker.is_alive():
+            batch = self._take_all()
+            if batch:
+                self.write(batch)
+            return []
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._worker.join(max(0.0, deadline - time.monotonic()))
+        return self._take_all() if self._worker.is_alive() else []
+
+    def stats(self):
+        return {'queue_depth': self._queue.qsize(), 'queue_capacity': self._queue.maxsize}
+
+
+class BatchedLogWriter:
+    """
+    Background writer for prediction log records.
+
+    Requests enqueue records and return immediately; a worker thread groups them
+    per collection and writes them with insert_many once batch_size records are
+    waiting or flush_interval seconds have passed. When the queue is full the
+    overflow policy decides whether to drop the record, block the caller for up to
+    block_timeout seconds, or spill it to a local JSONL file.
+    """
+
+    def __init__(self, db, max_queue=10000, batch_size=500, flush_interval=1.0,
+                 overflow='drop', block_timeout=0.5, spill_path='prediction_log_spill.jsonl'):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.db = db
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.spill_path = spill_path
+        self._writer = BackgroundWriter(self._flush, 'log-writer', max_queue, batch_size, flush_interval)
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._closed = False
+        self.counters = {
+            'enqueued': 0, 'written': 0, 'dropped': 0, 'spilled': 0,
+            'failed': 0, 'flushes': 0
+        }
+        self._flush_ms_total = 0.0
+        self._flush_ms_max = 0.0
+        self._flush_ms_last = 0.0
+        atexit.register(self.close)
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def submit(self, collection, record):
+        """Queue one record for insertion into `collection`. Never raises."""
+        if self._closed:
+            self._write_now(collection, [record])
+            return
+        item = (collection, record)
+        if self._writer.put(item, timeout=self.block_timeout if self.overflow == 'block' else None):
+            self._count('enqueued')
+        elif self.overflow == 'spill':
+            self._spill([item])
+        else:
+            self._count('dropped')
+
+    def submit_many(self, collection, records):
+        for record in records:
+            self.submit(collection, record)
+
+    def _flush(self, batch):
+        by_collection = {}
+        for collection, record in batch:
+            by_collection.setdefault(collection, []).append(record)
+        start = time.perf_counter()
+        for collection, records in by_collection.items():
+            self._write_now(collection, records)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.counters['flushes'] += 1
+            self._flush_ms_last = elapsed_ms
+            self._flush_ms_total += elapsed_ms
+            self._flush_ms_max = max(self._flush_ms_max, elapsed_ms)
+
+    def _write_now(self, collection, records):
+        try:
+            self.db[collection].insert_many(records, ordered=False)
+            self._count('written', len(records))
+        except Exception as e:
+            print(f"ERROR writing {len(records)} log records to {collection}: {e}", file=sys.stderr)
+            self._count('failed', len(records))
+            if self.overflow == 'spill':
+                self._spill([(collection, r) for r in records])
+
+    def _spill(self, items):
+        try:
+            with self._spill_lock, open(self.spill_path, 'a', encoding='utf-8') as f:
+                for collection, record in items:
+                    record = {k: v for k, v in record.items() if k != '_id'}
+                    f.write(json.dumps({'collection': collection, 'record': record}, default=str) + '\n')
+            self._count('spilled', len(items))
+        except OSError as e:
+            print(f"ERROR spilling log records to {self.spill_path}: {e}", file=sys.stderr)
+            self._count('dropped', len(items))
+
+    def close(self, timeout=10):
+        """
+        Flush everything still queued and stop the worker, waiting at most about
+        `timeout` seconds. Records the worker could not write by then (say, MongoDB is
+        unreachable) are spilled under the 'spill' policy and counted as dropped otherwise.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        left = self._writer.close(timeout)
+        if not left:
+            return
+        print(f"WARNING: {len(left)} log records were still queued at shutdown", file=sys.stderr)
+        if self.overflow == 'spill':
+            self._spill(left)
+        else:
+            self._count('dropped', len(left))
+
+    def stats(self):
+        with self._lock:
+            flushes = self.counters['flushes']
+            return {
+                **self.counters,
+                **self._writer.stats(),
+                'overflow_policy': self.overflow,
+                'flush_ms_last': round(self._flush_ms_last, 3),
+                'flush_ms_avg': round(self._flush_ms_total / flushes, 3) if flushes else 0.0,
+                'flush_ms_max': round(self._flush_ms_max, 3)
+            }
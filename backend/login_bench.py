@@ -0,0 +1,90 @@
+"""
+Login throughput benchmark for the password hasher.
+
+`--concurrency` threads, standing in for request workers, each check a password in
+a loop for `--duration` seconds, once with hashing inline on the thread (how
+/login used to run) and once per `--workers` pool size. Meanwhile a probe thread
+runs a small pure-Python task (~1 ms) over and over, standing in for the other
+requests a worker serves. The report shows sustained logins/sec, login latency,
+and how much the probe slowed down.
+
+    python login_bench.py --rounds 12 --concurrency 32 --workers 0 2 4 --duration 15
+"""
+import argparse
+import json
+import threading
+import time
+
+from loadtest import percentile
+from password_hasher import PasswordHasher, PasswordHasherBusy, _hash
+
+
+def p50_p95(sorted_values):
+    if not sorted_values:
+        return {'p50': None, 'p95': None}
+    return {'p50': round(percentile(sorted_values, 50), 1), 'p95': round(percentile(sorted_values, 95), 1)}
+
+
+def probe_task():
+    return sum(i * i for i in range(20_000))
+
+
+def run(workers, rounds, concurrency, duration, hashed):
+    hasher = PasswordHasher(rounds=rounds, workers=workers, max_pending=concurrency)
+    if workers:
+        hasher.check('warm up', hashed)
+    latencies, probes, rejected = [], [], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def login():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                hasher.check('correct horse battery staple', hashed)
+            except PasswordHasherBusy:
+                with lock:
+                    rejected[0] += 1
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    def probe():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            probe_task()
+            probes.append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=login) for _ in range(concurrency)] + [threading.Thread(target=probe)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    probes.sort()
+    return {'workers': workers or 'inline', 'logins': len(latencies), 'rejected': rejected[0],
+            'logins_per_sec': round(len(latencies) / elapsed, 1),
+            'latency_ms': p50_p95(latencies), 'probe_ms': p50_p95(probes)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt work factor')
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent login threads')
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2], help='pool sizes to compare (0 is inline)')
+    parser.add_argument('--duration', type=float, default=15)
+    args = parser.parse_args()
+
+    hashed = _hash('correct horse battery staple', args.rounds)
+    started = time.perf_counter()
+    probe_task()
+    baseline = round((time.perf_counter() - started) * 1000, 1)
+    results = [run(workers, args.rounds, args.concurrency, args.duration, hashed) for workers in args.workers]
+    print(json.dumps({'rounds': args.rounds, 'concurrency': args.concurrency, 'probe_idle_ms': baseline,
+                      'runs': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
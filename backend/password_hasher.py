@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt
+
+
+# bcrypt only reads the first 72 bytes; newer releases raise instead of truncating.
+MAX_PASSWORD_BYTES = 72
+
+
+class PasswordHasherBusy(Exception):
+    """The hash was refused because too many were queued, or it did not finish in time."""
+
+    def __init__(self, reason, retry_after=1):
+        super().__init__(f"Password hashing unavailable: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def _encode(password):
+    return password.encode('utf-8')[:MAX_PASSWORD_BYTES]
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(_encode(password), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(password, hashed):
+    try:
+        return bcrypt.checkpw(_encode(password), hashed.encode('utf-8'))
+    except ValueError:  # not a bcrypt hash
+        return False
+
+
+def cost_of(hashed):
+    """The log2 work factor of a `$2b$12$...` hash, or None if it is not one."""
+    try:
+        return int(hashed.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def workers_per_process(processes=1):
+    """An even share of the CPUs for each of `processes` server processes, at least 1."""
+    return max(1, (os.cpu_count() or 1) // max(1, processes))
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing and checking in a process pool, so its deliberate CPU cost runs
+    on other cores instead of holding the request thread (and the GIL) of a worker.
+
+    At most `max_pending` hashes may be queued or running; beyond that, or after
+    `timeout` seconds, PasswordHasherBusy is raised so the caller can answer 503
+    rather than pile requests up. New hashes use `rounds`; needs_rehash() tells
+    whether a stored hash was made with a different cost. With `workers=0` hashing
+    runs inline on the calling thread.
+    """
+
+    def __init__(self, rounds=12, workers=None, max_pending=64, timeout=10.0):
+        self.rounds = rounds
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pool = None
+        self._pool_pid = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.counters = {'hashed': 0, 'checked': 0, 'rehashed': 0, 'rejected_full': 0, 'timeouts': 0,
+                         'busy_ms_total': 0.0}
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self.counters[key] += delta
+
+    def _executor(self):
+        # Created on first use in each process: a pool inherited through fork has no workers.
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def _submit(self, fn, *args):
+        if not self.workers:
+            return None, fn(*args)
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.counters['rejected_full'] += 1
+                raise PasswordHasherBusy('queue full')
+            self._pending += 1
+        try:
+            future = self._executor().submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future, None
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    def _run(self, fn, *args):
+        started = time.perf_counter()
+        future, result = self._submit(fn, *args)
+        if future is not None:
+            try:
+                result = future.result(timeout=self.timeout)
+            except FutureTimeout:
+                future.cancel()
+                self._count(timeouts=1)
+                raise PasswordHasherBusy('timed out')
+        self._count(busy_ms_total=(time.perf_counter() - started) * 1000)
+        return result
+
+    def hash(self, password):
+        hashed = self._run(_hash, password, self.rounds)
+        self._count(hashed=1)
+        return hashed
+
+    def check(self, password, hashed):
+        ok = self._run(_check, password, hashed)
+        self._count(checked=1)
+        return ok
+
+    def needs_rehash(self, hashed):
+        return cost_of(hashed) != self.rounds
+
+    def rehash_async(self, password, on_done):
+        """
+        Hash `password` at the current cost in the background and pass the new hash to
+        `on_done`. Returns False (and does nothing) if the pool is full: the login that
+        asked can rehash next time.
+        """
+        def finished(future):
+            if future.exception() is None:
+                self._count(rehashed=1)
+                on_done(future.result())
+
+        try:
+            future, result = self._submit(_hash, password, self.rounds)
+        except PasswordHasherBusy:
+            return False
+        if future is None:
+            self._count(rehashed=1)
+            on_done(result)
+        else:
+            future.add_done_callback(finished)
+        return True
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            pending = self._pending
+        operations = counters['hashed'] + counters['checked']
+        counters['mean_ms'] = round(counters.pop('busy_ms_total') / operations, 1) if operations else None
+        return {**counters, 'rounds': self.rounds, 'workers': self.workers, 'pending': pending,
+                'max_pending': self.max_pending}
@@ -0,0 +1,588 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import namedtuple
+from json.encoder import encode_basestring_ascii
+
+from ttl_cache import LRUCache
+
+
+SLOT_RE = re.compile(r'\$(\w+)')
+STREAM_CHUNK_BYTES = 64 * 1024
+
+DEFAULT_HERO_IMAGE = "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?q=80&w=600&h=600&auto=format&fit=crop"
+DEFAULT_ABOUT_IMAGE = "https://images.unsplash.com/photo-1498050108023-c5249f4df085?q=80&w=600&h=800&auto=format&fit=crop"
+DEFAULT_PROJECT_IMAGE = "https://source.unsplash.com/random/800x600/?tech,website&sig={}"
+
+# A template bound to its slot values; rendered only when the page is written out.
+Fragment = namedtuple('Fragment', ['template', 'values'])
+
+
+class ImageSource:
+    """An image for the page: `src` goes into the markup, `key` (a content hash, say) into cache keys."""
+
+    __slots__ = ('key', 'src')
+
+    def __init__(self, key, src):
+        self.key = key
+        self.src = src
+
+
+def json_escape(text):
+    """`text` as the inside of a JSON string literal, ASCII-only like jsonify."""
+    return encode_basestring_ascii(text)[1:-1]
+
+
+class CompiledTemplate:
+    """
+    Markup with `$name` slots, compiled once at import.
+
+    The page-level static parts are kept as bytes, both raw and JSON-escaped, so
+    streaming a page only encodes what changes per request. Each template also keeps
+    its static text in both forms as a list with gaps for the slots, so a fragment
+    (a project card, say) is rendered by filling the gaps and one join. A slot value
+    may be a string, a Fragment or a list of either.
+    """
+
+    def __init__(self, source):
+        parts = SLOT_RE.split(source)
+        static = parts[0::2]
+        self.slots = parts[1::2]
+        # A name can fill several slots (a card's title appears three times); render it once.
+        self.names = list(dict.fromkeys(self.slots))
+        self._slot_index = [self.names.index(slot) for slot in self.slots]
+        self.static_bytes = [part.encode('utf-8') for part in static]
+        self.static_json = [json_escape(part).encode('ascii') for part in static]
+        self._layouts = {False: _layout(static), True: _layout([json_escape(part) for part in static])}
+
+    def bind(self, **values):
+        return Fragment(self, values)
+
+    def text(self, values, as_json=False):
+        """The markup as one string; with `as_json`, escaped for the inside of a JSON string."""
+        parts = self._layouts[as_json][:]
+        texts = [_value_text(values[name], as_json) for name in self.names]
+        parts[1::2] = [texts[i] for i in self._slot_index]
+        return ''.join(parts)
+
+    def render(self, **values):
+        return self.text(values)
+
+    def iter_chunks(self, values, as_json=False, chunk_size=STREAM_CHUNK_BYTES):
+        """Yield the markup in chunks of about `chunk_size` bytes, split between slots and list items."""
+        static = self.static_json if as_json else self.static_bytes
+        out = [static[0]]
+        size = len(static[0])
+        for slot, part in zip(self.slots, static[1:]):
+            value = values[slot]
+            for item in value if isinstance(value, list) else (value,):
+                piece = _value_text(item, as_json).encode('utf-8')
+                out.append(piece)
+                size += len(piece)
+                if size >= chunk_size:
+                    yield b''.join(out)
+                    out = []
+                    size = 0
+            out.append(part)
+            size += len(part)
+        yield b''.join(out)
+
+
+def _layout(static):
+    """[static0, None, static1, None, ..., staticN]: the Nones are where slot values go."""
+    layout = [None] * (2 * len(static) - 1)
+    layout[0::2] = static
+    return layout
+
+
+def _value_text(value, as_json):
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)[1:-1] if as_json else value
+    if isinstance(value, Fragment):
+        return value.template.text(value.values, as_json)
+    if isinstance(value, list):
+        return ''.join([_value_text(item, as_json) for item in value])
+    return json_escape(str(value)) if as_json else str(value)
+
+
+def compile_sections(source, markers):
+    """Split `source` where each (name, marker) starts; returns [(name, CompiledTemplate)] with 'head' first."""
+    sections = []
+    name, start = 'head', 0
+    for next_name, marker in markers:
+        index = source.index(marker, start)
+        sections.append((name, CompiledTemplate(source[start:index])))
+        name, start = next_name, index
+    sections.append((name, CompiledTemplate(source[start:])))
+    return sections
+
+
+# Page and fragment templates, compiled at import.
+PAGE_SOURCE = """<!DOCTYPE html>
+<html lang="en" class="scroll-smooth">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$name - Portfolio</title>
+    <script src="https://cdn.tailwindcss.com"></script>
+    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap" rel="stylesheet">
+    <style>
+        body { font-family: 'Poppins', sans-serif; }
+        .animate-blob { animation: blob 7s infinite; }
+        .animation-delay-2000 { animation-delay: 2s; }
+        .animation-delay-4000 { animation-delay: 4s; }
+        @keyframes blob {
+            0% { transform: translate(0px, 0px) scale(1); }
+            33% { transform: translate(30px, -50px) scale(1.1); }
+            66% { transform: translate(-20px, 20px) scale(0.9); }
+            100% { transform: translate(0px, 0px) scale(1); }
+        }
+        .modal-active { overflow: hidden; }
+    </style>
+</head>
+<body class="bg-slate-50 text-slate-800">
+    <header class="fixed w-full bg-white/80 backdrop-blur-md z-50 shadow-sm">
+        <nav class="container mx-auto px-6 py-4 flex justify-between items-center">
+            <a href="#" class="text-2xl font-bold text-violet-700">$first_name</a>
+            <div class="hidden md:flex space-x-8 font-medium text-slate-600">
+                <a href="#home" class="hover:text-violet-600 transition">Home</a>
+                <a href="#about" class="hover:text-violet-600 transition">About</a>
+                <a href="#skills" class="hover:text-violet-600 transition">Skills</a>
+                <a href="#education" class="hover:text-violet-600 transition">Education</a>
+                <a href="#portfolio" class="hover:text-violet-600 transition">Portfolio</a>
+                <a href="#contact" class="hover:text-violet-600 transition">Contact</a>
+            </div>
+            <a href="#contact" class="px-6 py-2 bg-violet-600 text-white font-semibold rounded-full hover:bg-violet-700 transition">Hire Me</a>
+        </nav>
+    </header>
+    <section id="home" class="pt-32 pb-20 overflow-hidden">
+        <div class="container mx-auto px-6 flex flex-col-reverse lg:flex-row items-center gap-12">
+            <div class="lg:w-1/2 text-center lg:text-left">
+                <h2 class="text-violet-600 font-bold text-xl mb-4">$role</h2>
+                <h1 class="text-4xl md:text-6xl font-bold mb-6">Hi, I'm <span class="text-violet-700">$name</span></h1>
+                <p class="text-lg text-slate-600 mb-10 leading-relaxed">$bio</p>
+                <div class="flex justify-center lg:justify-start gap-4">
+                    <a href="#contact" class="px-8 py-3 bg-violet-600 text-white font-bold rounded-full shadow-lg hover:-translate-y-1 transition-all">Contact Me</a>
+                    <a href="$resume_url" download class="px-8 py-3 bg-white text-violet-600 font-bold rounded-full border-2 border-violet-100 hover:bg-violet-50 transition-all flex items-center">
+                        Download CV <svg class="w-5 h-5 ml-2" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path d="M4 16v1a3 3 0 003 3h10a3 3 0 003-3v-1m-4-4l-4 4m0 0l-4-4m4 4V4"/></svg>
+                    </a>
+                </div>
+            </div>
+            <div class="lg:w-1/2">$hero_image</div>
+        </div>
+    </section>
+
+    <section id="about" class="py-20 bg-white">
+        <div class="container mx-auto px-6">
+            <div class="text-center mb-16">
+                <h2 class="text-3xl md:text-4xl font-bold text-slate-800">About <span class="text-violet-600">Me</span></h2>
+                <div class="w-20 h-1.5 bg-violet-600 mx-auto mt-4 rounded-full"></div>
+            </div>
+            <div class="flex flex-col lg:flex-row items-center gap-16">
+                $about_image
+                <div class="lg:w-1/2">
+                    <h3 class="text-2xl font-bold mb-6 text-slate-800">My Introduction</h3>
+                    <p class="text-slate-600 text-lg leading-relaxed mb-10">$bio</p>
+                    
+                    <div class="grid grid-cols-3 gap-6 text-center mb-10">
+                        <div class="p-4 bg-slate-50 rounded-2xl shadow-sm border border-slate-100">
+                            <h4 class="text-3xl font-bold text-violet-600">$exp_years</h4>
+                            <p class="text-sm text-slate-500 font-medium">Years Exp</p>
+                        </div>
+                        <div class="p-4 bg-slate-50 rounded-2xl shadow-sm border border-slate-100">
+                            <h4 class="text-3xl font-bold text-violet-600">$projects_completed</h4>
+                            <p class="text-sm text-slate-500 font-medium">Projects</p>
+                        </div>
+                        <div class="p-4 bg-slate-50 rounded-2xl shadow-sm border border-slate-100">
+                            <h4 class="text-3xl font-bold text-violet-600">$companies</h4>
+                            <p class="text-sm text-slate-500 font-medium">Companies</p>
+                        </div>
+                    </div>
+                </div>
+            </div>
+        </div>
+    </section>
+    <section id="skills" class="py-20 bg-slate-50">
+        <div class="container mx-auto px-6">
+            <div class="text-center mb-16">
+                <h2 class="text-3xl md:text-4xl font-bold text-slate-800">My <span class="text-violet-600">Skills</span></h2>
+                <div class="w-20 h-1.5 bg-violet-600 mx-auto mt-4 rounded-full"></div>
+                <p class="text-slate-600 mt-4">Technical Proficiency</p>
+            </div>
+            <div class="max-w-3xl mx-auto bg-white p-8 md:p-12 rounded-3xl shadow-xl">
+                $skills
+            </div>
+        </div>
+    </section>
+    $education
+    <section id="portfolio" class="py-20 bg-white">
+        <div class="container mx-auto px-6 text-center">
+            <h2 class="text-3xl md:text-4xl font-bold mb-16 text-slate-800">My <span class="text-violet-600">Portfolio</span></h2>
+            <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8 text-left">
+                $projects
+            </div>
+        </div>
+    </section>
+    <section id="contact" class="py-20 relative overflow-hidden bg-slate-50">
+        <div class="container mx-auto px-6 relative z-10">
+            <div class="text-center mb-16">
+                <h2 class="text-3xl md:text-4xl font-bold text-slate-800">Contact <span class="text-violet-600">Me</span></h2>
+                <div class="w-20 h-1.5 bg-violet-600 mx-auto mt-4 rounded-full"></div>
+            </div>
+            <div class="flex flex-col lg:flex-row gap-12 max-w-6xl mx-auto">
+                <div class="lg:w-1/3 space-y-8">
+                    <div class="flex items-start">
+                        <div class="flex-shrink-0 w-12 h-12 bg-violet-100 text-violet-600 rounded-2xl flex items-center justify-center text-2xl shadow-sm">
+                            <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path d="M3 5a2 2 0 012-2h3.28a1 1 0 01.948.684l1.498 4.493a1 1 0 01-.502 1.21l-2.257 1.13a11.042 11.042 0 005.516 5.516l1.13-2.257a1 1 0 011.21-.502l4.493 1.498a1 1 0 01.684.948V19a2 2 0 01-2 2h-1C9.716 21 3 14.284 3 6V5z"/></svg>
+                        </div>
+                        <div class="ml-4">
+                            <h4 class="text-xl font-bold text-slate-800">Call Me</h4>
+                            <p class="text-slate-600">$phone</p>
+                        </div>
+                    </div>
+                    <div class="flex items-start">
+                        <div class="flex-shrink-0 w-12 h-12 bg-violet-100 text-violet-600 rounded-2xl flex items-center justify-center text-2xl shadow-sm">
+                            <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path d="M3 8l7.89 5.26a2 2 0 002.22 0L21 8M5 19h14a2 2 0 002-2V7a2 2 0 00-2-2H5a2 2 0 00-2 2v10a2 2 0 002 2z"/></svg>
+                        </div>
+                        <div class="ml-4">
+                            <h4 class="text-xl font-bold text-slate-800">Email</h4>
+                            <p class="text-slate-600">$email</p>
+                        </div>
+                    </div>
+                    <div class="flex items-start">
+                        <div class="flex-shrink-0 w-12 h-12 bg-violet-100 text-violet-600 rounded-2xl flex items-center justify-center text-2xl shadow-sm">
+                            <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path d="M17.657 16.657L13.414 20.9a1.998 1.998 0 01-2.827 0l-4.244-4.243a8 8 0 1111.314 0z"/><path d="M15 11a3 3 0 11-6 0 3 3 0 016 0z"/></svg>
+                        </div>
+                        <div class="ml-4">
+                            <h4 class="text-xl font-bold text-slate-800">Location</h4>
+                            <p class="text-slate-600">$location</p>
+                        </div>
+                    </div>
+                </div>
+                <div class="lg:w-2/3 bg-white p-8 md:p-10 rounded-3xl shadow-xl">
+                    <form class="space-y-6">
+                        <div class="grid grid-cols-1 md:grid-cols-2 gap-6">
+                            <input type="text" placeholder="Your Name" class="w-full px-5 py-3 bg-slate-50 border border-slate-200 rounded-2xl focus:ring-1 focus:ring-violet-500 transition">
+                            <input type="email" placeholder="Your Email" class="w-full px-5 py-3 bg-slate-50 border border-slate-200 rounded-2xl focus:ring-1 focus:ring-violet-500 transition">
+                        </div>
+                        <textarea rows="5" placeholder="Message" class="w-full px-5 py-3 bg-slate-50 border border-slate-200 rounded-2xl focus:ring-1 focus:ring-violet-500 transition"></textarea>
+                        <button class="w-full md:w-auto px-10 py-3.5 bg-violet-600 text-white font-bold rounded-full shadow-md hover:bg-violet-700 transition">Send Message</button>
+                    </form>
+                </div>
+            </div>
+        </div>
+    </section>
+
+    <footer class="bg-slate-900 py-12 text-center text-slate-400">
+        <div class="container mx-auto px-6">
+            <h2 class="text-3xl font-bold text-white mb-4">$name</h2>
+            <p class="mb-8">$role</p>
+            <p class="text-sm">&#169; $year $name. All rights reserved.</p>
+        </div>
+    </footer>
+
+    <div id="projectModal" class="fixed inset-0 z-[100] hidden bg-slate-900/60 backdrop-blur-sm flex items-center justify-center p-4">
+        <div class="bg-white rounded-3xl max-w-2xl w-full max-h-[90vh] overflow-y-auto shadow-2xl relative">
+            <button onclick="closeModal()" class="absolute top-4 right-4 bg-slate-100 p-2 rounded-full hover:bg-slate-200 transition">
+                <svg class="w-6 h-6" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path d="M6 18L18 6M6 6l12 12"/></svg>
+            </button>
+            <img id="modalImg" src="" class="w-full h-64 object-cover">
+            <div class="p-8">
+                <h3 id="modalTitle" class="text-2xl font-bold mb-4"></h3>
+                <p id="modalDesc" class="text-slate-600 leading-relaxed mb-8"></p>
+                <a id="modalLink" href="#" target="_blank" class="inline-block bg-violet-600 text-white px-8 py-3 rounded-full font-bold">View Live Project</a>
+            </div>
+        </div>
+    </div>
+
+    <script>
+        function openModal(title, desc, img, link) {
+            document.getElementById('modalTitle').innerText = title;
+            document.getElementById('modalDesc').innerText = desc;
+            document.getElementById('modalImg').src = img;
+            document.getElementById('modalLink').href = link;
+            document.getElementById('projectModal').classList.remove('hidden');
+            document.body.classList.add('modal-active');
+        }
+        function closeModal() {
+            document.getElementById('projectModal').classList.add('hidden');
+            document.body.classList.remove('modal-active');
+        }
+    </script>
+</body>
+</html>"""
+
+# The page stays one document above but is compiled into sections, each rendered
+# and cached on its own inputs.
+PAGE_SECTIONS = compile_sections(PAGE_SOURCE, [
+    ('hero', '    <section id="home"'),
+    ('about', '    <section id="about"'),
+    ('skills', '    <section id="skills"'),
+    ('education', '    $education'),
+    ('projects', '    <section id="portfolio"'),
+    ('contact', '    <section id="contact"'),
+    ('footer', '    <footer')
+])
+
+HERO_IMAGE = CompiledTemplate("""
+            <div class="relative w-full max-w-lg mx-auto lg:mr-0">
+                <div class="absolute top-0 -left-4 w-72 h-72 bg-violet-300 rounded-full mix-blend-multiply filter blur-xl opacity-70 animate-blob"></div>
+                <div class="absolute top-0 -right-4 w-72 h-72 bg-purple-300 rounded-full mix-blend-multiply filter blur-xl opacity-70 animate-blob animation-delay-2000"></div>
+                <div class="absolute -bottom-8 left-20 w-72 h-72 bg-pink-300 rounded-full mix-blend-multiply filter blur-xl opacity-70 animate-blob animation-delay-4000"></div>
+                <div class="relative overflow-hidden" style="border-radius: 60% 40% 30% 70% / 60% 30% 70% 40%; box-shadow: 0 20px 25px -5px rgba(124, 58, 237, 0.2);">
+                    <img src="$img_src" alt="$name" class="w-full h-full object-cover transform hover:scale-105 transition duration-500">
+                </div>
+            </div>
+            """)
+
+ABOUT_IMAGE = CompiledTemplate("""
+            <div class="lg:w-1/2 mb-10 lg:mb-0">
+                <div class="relative w-full max-w-md mx-auto">
+                    <div class="absolute inset-0 bg-violet-200 rounded-3xl transform rotate-3 scale-105"></div>
+                    <img src="$img_src" alt="About $name" class="relative z-10 rounded-3xl shadow-xl w-full h-auto object-cover">
+                </div>
+            </div>
+            """)
+
+SKILL_ITEM = CompiledTemplate("""
+                    <div class="mb-5">
+                        <div class="flex justify-between mb-1">
+                            <span class="text-base font-medium text-slate-700">$name</span>
+                            <span class="text-sm font-medium text-violet-600">$level%</span>
+                        </div>
+                        <div class="w-full bg-slate-200 rounded-full h-2.5">
+                            <div class="bg-violet-600 h-2.5 rounded-full" style="width: $level%"></div>
+                        </div>
+                    </div>
+                    """)
+
+EDUCATION_SECTION = CompiledTemplate("""
+            <section id="education" class="py-20 bg-slate-50">
+                <div class="container mx-auto px-6">
+                    <div class="text-center mb-16">
+                        <h2 class="text-3xl md:text-4xl font-bold text-slate-800">My <span class="text-violet-600">Qualification</span></h2>
+                        <div class="w-20 h-1.5 bg-violet-600 mx-auto mt-4 rounded-full"></div>
+                    </div>
+                    <div class="max-w-3xl mx-auto">$items</div>
+                </div>
+            </section>
+            """)
+
+EDUCATION_ITEM = CompiledTemplate("""
+                <div class="relative pl-8 pb-10 border-l-2 border-violet-200 last:border-0">
+                    <div class="absolute -left-[9px] top-0 w-4 h-4 bg-violet-600 rounded-full border-4 border-white"></div>
+                    <span class="text-sm font-bold text-violet-600 uppercase tracking-wider">$year</span>
+                    <h4 class="text-xl font-bold text-slate-800 mt-1">$degree</h4>
+                    <p class="text-slate-500 font-medium">$institution</p>
+                </div>
+                """)
+
+PROJECT_CARD = CompiledTemplate("""
+                <div class="bg-white rounded-2xl shadow-lg overflow-hidden hover:-translate-y-2 transition-all duration-300 group">
+                    <div class="h-56 overflow-hidden relative">
+                        <img src="$img_src" alt="$title" class="w-full h-full object-cover transform group-hover:scale-110 transition duration-500">
+                        <div class="absolute inset-0 bg-violet-900 bg-opacity-0 group-hover:bg-opacity-30 transition duration-300 flex items-center justify-center opacity-0 group-hover:opacity-100">
+                             <button onclick="openModal('$title', `$desc`, '$img_src', '$link')" class="bg-white text-violet-600 px-6 py-2 rounded-full font-bold shadow-lg transform translate-y-4 group-hover:translate-y-0 transition duration-300">Quick View</button>
+                        </div>
+                    </div>
+                    <div class="p-6">
+                        <h3 class="text-xl font-bold text-slate-800 mb-2">$title</h3>
+                        <p class="text-slate-600 mb-4 line-clamp-2">$desc</p>
+                        <a href="$link" target="_blank" class="inline-flex items-center text-violet-600 font-semibold hover:text-violet-800 transition">
+                            View Project <svg xmlns="http://www.w3.org/2000/svg" class="h-5 w-5 ml-1" viewBox="0 0 20 20" fill="currentColor"><path fill-rule="evenodd" d="M12.293 5.293a1 1 0 011.414 0l6 6a1 1 0 010 1.414l-6 6a1 1 0 01-1.414-1.414L16.586 11H3a1 1 0 110-2h13.586l-4.293-4.293a1 1 0 010-1.414z" clip-rule="evenodd" /></svg>
+                        </a>
+                    </div>
+                </div>
+                """)
+
+
+def _image(value):
+    if value is None or isinstance(value, ImageSource):
+        return value
+    return ImageSource(value, value)
+
+
+def _text(data, key, default):
+    """data[key] as a string; numbers are accepted, anything else is a ValueError."""
+    value = data.get(key)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"'{key}' must be a string")
+    return str(value)
+
+
+def _records(data, key):
+    """data[key] as a list of objects (missing: empty); anything else is a ValueError."""
+    value = data.get(key)
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(item, dict) for item in value):
+        raise ValueError(f"'{key}' must be a list of objects")
+    return value
+
+
+def _cache_token(value):
+    if isinstance(value, ImageSource):
+        return value.key
+    return str(value)
+
+
+class PortfolioRenderer:
+    """
+    Renders /generate-portfolio pages section by section from PAGE_SECTIONS.
+
+    sections() reads and type-checks every field up front, so the section builders
+    only ever see strings and bad input raises ValueError before the response
+    starts; it reduces each section to its inputs. A section's output is cached
+    under a hash of those inputs (images count by their key, not their bytes), so a
+    regenerate after a small edit only re-renders the sections that changed.
+    Sections larger than `max_entry_bytes` (inline images) are streamed but not
+    cached. stream() writes the page in chunks of about `chunk_size` bytes, so the
+    whole document is never held in memory at once.
+    """
+
+    def __init__(self, chunk_size=STREAM_CHUNK_BYTES, cache_size=256, max_entry_bytes=256 * 1024):
+        self.chunk_size = chunk_size
+        self.max_entry_bytes = max_entry_bytes
+        self.cache = LRUCache(maxsize=cache_size)
+        self._lock = threading.Lock()
+        self._counters = {name: {'hits': 0, 'misses': 0, 'uncacheable': 0} for name, _ in PAGE_SECTIONS}
+        self._builders = {
+            'head': self._head, 'hero': self._hero, 'about': self._about, 'skills': self._skills,
+            'education': self._education, 'projects': self._projects, 'contact': self._contact,
+            'footer': self._footer
+        }
+
+    def sections(self, user_data, hero_image=None, about_image=None, project_images=None, resume_url='#'):
+        """
+        {section: inputs} for the page, from the form's userData. Images are URLs, data
+        URIs or ImageSources; missing ones get the stock photos.
+        """
+        if not isinstance(user_data, dict):
+            raise ValueError("userData must be an object")
+        name = _text(user_data, 'name', 'User Name')
+        role = _text(user_data, 'role', 'Creative Professional')
+        bio = _text(user_data, 'bio', 'Passionate about creating digital experiences.')
+        contact = user_data.get('contact') or {}
+        if not isinstance(contact, dict):
+            raise ValueError("'contact' must be an object")
+        skills = [(_text(skill, 'name', ''), _text(skill, 'level', '80')) for skill in _records(user_data, 'skills')]
+        project_images = project_images or {}
+        return {
+            'head': {'name': name},
+            'hero': {'name': name, 'role': role, 'bio': bio, 'resume_url': resume_url,
+                     'image': _image(hero_image or DEFAULT_HERO_IMAGE) if user_data.get('hasHeroImage', True) else None},
+            'about': {'name': name, 'bio': bio,
+                      'image': _image(about_image or DEFAULT_ABOUT_IMAGE) if user_data.get('hasAboutImage', True) else None,
+                      'exp_years': _text(user_data, 'experienceYears', '1+'),
+                      'projects_completed': _text(user_data, 'projectsCompleted', '10+'),
+                      'companies': _text(user_data, 'companiesWorked', '1+')},
+            'skills': [(skill_name, level) for skill_name, level in skills if skill_name],
+            'education': [(_text(item, 'degree', 'Degree'), _text(item, 'institution', 'Institution'),
+                           _text(item, 'year', 'Year'))
+                          for item in _records(user_data, 'education')],
+            'projects': [(_text(proj, 'title', f'Project {i+1}'), _text(proj, 'desc', 'No description provided.'),
+                          _text(proj, 'githubLink', '#'), _image(project_images.get(i, DEFAULT_PROJECT_IMAGE.format(i))))
+                         for i, proj in enumerate(_records(user_data, 'projects'))],
+            'contact': {'email': _text(contact, 'email', 'contact@example.com'),
+                        'phone': _text(contact, 'phone', '+123 456 7890'),
+                        'location': _text(contact, 'location', 'Remote')},
+            'footer': {'name': name, 'role': role, 'year': time.strftime('%Y')}
+        }
+
+    def _head(self, inputs):
+        return {'name': inputs['name'], 'first_name': inputs['name'].split(' ')[0]}
+
+    def _hero(self, inputs):
+        image = inputs['image']
+        return {'role': inputs['role'], 'name': inputs['name'], 'bio': inputs['bio'], 'resume_url': inputs['resume_url'],
+                'hero_image': HERO_IMAGE.bind(img_src=image.src, name=inputs['name']) if image else ''}
+
+    def _about(self, inputs):
+        image = inputs['image']
+        return {'bio': inputs['bio'], 'exp_years': inputs['exp_years'],
+                'projects_completed': inputs['projects_completed'], 'companies': inputs['companies'],
+                'about_image': ABOUT_IMAGE.bind(img_src=image.src, name=inputs['name']) if image else ''}
+
+    def _skills(self, inputs):
+        return {'skills': [SKILL_ITEM.bind(name=name, level=level) for name, level in inputs]}
+
+    def _education(self, inputs):
+        if not inputs:
+            return {'education': ''}
+        items = [EDUCATION_ITEM.bind(degree=degree, institution=institution, year=year)
+                 for degree, institution, year in inputs]
+        return {'education': EDUCATION_SECTION.bind(items=items)}
+
+    def _projects(self, inputs):
+        return {'projects': [PROJECT_CARD.bind(title=title, desc=desc, link=link, img_src=image.src)
+                             for title, desc, link, image in inputs]}
+
+    def _contact(self, inputs):
+        return inputs
+
+    def _footer(self, inputs):
+        return inputs
+
+    def _key(self, name, inputs, as_json):
+        payload = json.dumps([name, as_json, inputs], sort_keys=True, default=_cache_token)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _count(self, name, outcome):
+        with self._lock:
+            self._counters[name][outcome] += 1
+
+    def _section_chunks(self, name, template, inputs, as_json):
+        key = self._key(name, inputs, as_json)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._count(name, 'hits')
+            yield cached
+            return
+        self._count(name, 'misses')
+        chunks, size = [], 0
+        for chunk in template.iter_chunks(self._builders[name](inputs), as_json=as_json, chunk_size=self.chunk_size):
+            if chunks is not None:
+                size += len(chunk)
+                if size <= self.max_entry_bytes:
+                    chunks.append(chunk)
+                else:
+                    chunks = None
+            yield chunk
+        if chunks is None:
+            self._count(name, 'uncacheable')
+        else:
+            self.cache.set(key, b''.join(chunks))
+
+    def stream(self, sections, as_json=True):
+        """
+        Yield the page in chunks. With `as_json` the body is `{"html": "..."}`, the
+        same document jsonify() would produce, so existing clients keep working.
+        """
+        out = [b'{"html":"'] if as_json else []
+        size = 0
+        for name, template in PAGE_SECTIONS:
+            for chunk in self._section_chunks(name, template, sections[name], as_json):
+                out.append(chunk)
+                size += len(chunk)
+                if size >= self.chunk_size:
+                    yield b''.join(out)
+                    out = []
+                    size = 0
+        if as_json:
+            out.append(b'"}\n')
+        yield b''.join(out)
+
+    def render(self, sections):
+        return b''.join(self.stream(sections, as_json=False)).decode('utf-8')
+
+    def stats(self):
+        with self._lock:
+            counters = {name: dict(c) for name, c in self._counters.items()}
+        for c in counters.values():
+            lookups = c['hits'] + c['misses']
+            c['hit_rate'] = round(c['hits'] / lookups, 4) if lookups else 0.0
+        return {'cache': self.cache.stats(), 'max_entry_bytes': self.max_entry_bytes, 'sections': counters}
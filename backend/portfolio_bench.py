@@ -0,0 +1,117 @@
+"""
+Render-time and peak-memory benchmark for the /generate-portfolio renderer.
+
+Builds a synthetic portfolio (`--projects` projects, `--skills` skills, optional
+inline images of `--image-kb` each) and times ways of producing the response body:
+
+- sections: reducing userData to per-section inputs;
+- joined: rendering the whole page as one string and wrapping it with json.dumps,
+  which is what jsonify() did;
+- streamed: consuming PortfolioRenderer.stream() chunk by chunk, as the route does.
+
+These three run with the section cache disabled. Peak memory is measured with
+tracemalloc over a single render of each. Then, with the cache on:
+
+- unchanged: regenerating the same portfolio;
+- one_edit: regenerating after changing one skill level, so only the skills
+  section is re-rendered.
+
+    python portfolio_bench.py --projects 50 --skills 60 --image-kb 200
+"""
+import argparse
+import base64
+import itertools
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+from portfolio import ImageSource, PortfolioRenderer
+
+
+def sample_portfolio(projects, skills, education, image_kb):
+    user_data = {
+        'name': 'Ada Lovelace',
+        'role': 'Full Stack Developer',
+        'bio': 'Builds reliable web services and the tooling around them. ' * 4,
+        'experienceYears': '6+',
+        'projectsCompleted': f'{projects}+',
+        'companiesWorked': '3',
+        'skills': [{'name': f'Skill {i}', 'level': 40 + i % 60} for i in range(skills)],
+        'projects': [{'title': f'Project {i}', 'desc': 'A service that does useful things. ' * 6,
+                      'githubLink': f'https://github.com/example/project-{i}'} for i in range(projects)],
+        'education': [{'degree': 'B.Tech (8.1)', 'institution': 'Some University', 'year': 2015 + i}
+                      for i in range(education)],
+        'contact': {'email': 'ada@example.com', 'phone': '+44 20 0000 0000', 'location': 'London'}
+    }
+    images = {}
+    if image_kb:
+        data_uri = 'data:image/jpeg;base64,' + base64.b64encode(os.urandom(image_kb * 1024)).decode('ascii')
+        images = {i: ImageSource(f'inline:{i}', data_uri) for i in range(projects)}
+    return user_data, images
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {'mean_ms': round(statistics.fmean(samples), 3),
+            'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3)}
+
+
+def peak_kb(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--projects', type=int, default=50)
+    parser.add_argument('--skills', type=int, default=60)
+    parser.add_argument('--education', type=int, default=4)
+    parser.add_argument('--image-kb', type=int, default=0, help='size of an inline image per project (0 uses URLs)')
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    user_data, images = sample_portfolio(args.projects, args.skills, args.education, args.image_kb)
+    edits = itertools.count()
+
+    def joined(renderer):
+        return json.dumps({'html': renderer.render(renderer.sections(user_data, project_images=images))}).encode('utf-8')
+
+    def streamed(renderer):
+        size = 0
+        for chunk in renderer.stream(renderer.sections(user_data, project_images=images)):
+            size += len(chunk)
+        return size
+
+    def one_edit(renderer):
+        user_data['skills'][0]['level'] = next(edits)
+        return streamed(renderer)
+
+    uncached = PortfolioRenderer(cache_size=0)
+    cached = PortfolioRenderer()
+    body_bytes = streamed(cached)
+    result = {
+        'projects': args.projects, 'skills': args.skills, 'image_kb': args.image_kb,
+        'body_kb': round(body_bytes / 1024, 1),
+        'sections': timed(lambda: uncached.sections(user_data, project_images=images), args.iterations),
+        'joined': dict(timed(lambda: joined(uncached), args.iterations), peak_kb=peak_kb(lambda: joined(uncached))),
+        'streamed': dict(timed(lambda: streamed(uncached), args.iterations), peak_kb=peak_kb(lambda: streamed(uncached))),
+        'unchanged': timed(lambda: streamed(cached), args.iterations),
+        'one_edit': timed(lambda: one_edit(cached), args.iterations),
+        'section_hit_rates': {name: c['hit_rate'] for name, c in cached.stats()['sections'].items()}
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
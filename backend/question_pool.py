@@ -0,0 +1,156 @@
+import random
+import re
+import sys
+import threading
+import zlib
+from collections import deque
+
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text, n=3):
+    """Hashed word n-grams of the normalized text (lowercased, punctuation dropped)."""
+    words = WORD_RE.findall(text.lower())
+    if len(words) < n:
+        return frozenset([zlib.crc32(" ".join(words).encode())])
+    return frozenset(zlib.crc32(" ".join(words[i:i + n]).encode()) for i in range(len(words) - n + 1))
+
+
+def similarity(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _FieldPool:
+    def __init__(self, history):
+        self.questions = []
+        self.fingerprints = []
+        self.recent = deque(maxlen=history)
+        self.refilling = False
+
+
+class QuestionPool:
+    """
+    Per-field pools of pre-generated interview questions.
+
+    take() serves a random pooled question from memory and, once a pool drops to
+    `low_water`, starts one background refill that calls generate(field) until the
+    pool is back at `target`. A new question is dropped when its word-shingle
+    Jaccard similarity to a pooled or recently served question reaches
+    `max_similarity`, so the pool keeps variety instead of near-identical rewordings.
+    Only the given `fields` are pooled: a refill costs up to 3 * target generations,
+    so a field sent by a client that is not on the list is never pooled or refilled.
+    """
+
+    def __init__(self, generate, fields, target=8, low_water=3, max_similarity=0.6, history=50):
+        self.generate = generate
+        self.target = target
+        self.low_water = low_water
+        self.max_similarity = max_similarity
+        self.history = history
+        self._pools = {field: _FieldPool(history) for field in fields}
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'unpooled': 0, 'generated': 0, 'duplicates': 0,
+                         'refills': 0, 'refill_errors': 0}
+
+    @property
+    def fields(self):
+        return list(self._pools)
+
+    def _is_duplicate(self, pool, fingerprint):
+        return any(similarity(fingerprint, seen) >= self.max_similarity
+                   for seen in list(pool.fingerprints) + list(pool.recent))
+
+    def add(self, field, question):
+        """Pool a question unless it is a near-duplicate; returns whether it was kept."""
+        fingerprint = shingles(question)
+        with self._lock:
+            pool = self._pools.get(field)
+            if pool is None:
+                return False
+            if self._is_duplicate(pool, fingerprint):
+                self.counters['duplicates'] += 1
+                return False
+            pool.questions.append(question)
+            pool.fingerprints.append(fingerprint)
+            return True
+
+    def remember(self, field, question):
+        """Record a question served outside the pool so refills avoid repeating it."""
+        with self._lock:
+            pool = self._pools.get(field)
+            if pool is not None:
+                pool.recent.append(shingles(question))
+
+    def take(self, field):
+        """
+        A pooled question for field, or None if its pool is empty (a refill is started
+        either way) or the field is not pooled at all.
+        """
+        with self._lock:
+            pool = self._pools.get(field)
+            if pool is None:
+                self.counters['unpooled'] += 1
+                return None
+            question = None
+            if pool.questions:
+                index = random.randrange(len(pool.questions))
+                question = pool.questions.pop(index)
+                pool.recent.append(pool.fingerprints.pop(index))
+                self.counters['hits'] += 1
+            else:
+                self.counters['misses'] += 1
+            needs_refill = len(pool.questions) <= self.low_water and not pool.refilling
+            if needs_refill:
+                pool.refilling = True
+        if needs_refill:
+            threading.Thread(target=self._refill, args=(field, self.target), daemon=True).start()
+        return question
+
+    def prefill(self, fields=None, target=None):
+        """
+        Start background refills for fields (default: all) up to `target` questions each
+        (default: the pool target) before the first request needs them.
+        """
+        target = self.target if target is None else target
+        for field in self.fields if fields is None else fields:
+            with self._lock:
+                pool = self._pools.get(field)
+                if pool is None or pool.refilling:
+                    continue
+                pool.refilling = True
+            threading.Thread(target=self._refill, args=(field, target), daemon=True).start()
+
+    def _refill(self, field, target):
+        with self._lock:
+            self.counters['refills'] += 1
+        try:
+            attempts = target * 3
+            while attempts > 0:
+                with self._lock:
+                    if len(self._pools[field].questions) >= target:
+                        break
+                attempts -= 1
+                question = self.generate(field)
+                if question:
+                    with self._lock:
+                        self.counters['generated'] += 1
+                    self.add(field, question)
+        except Exception as e:
+            with self._lock:
+                self.counters['refill_errors'] += 1
+            print(f"Question pool refill failed for {field}: {e}", file=sys.stderr)
+        finally:
+            with self._lock:
+                self._pools[field].refilling = False
+
+    def stats(self):
+        with self._lock:
+            total = self.counters['hits'] + self.counters['misses']
+            return {
+                **self.counters,
+                'hit_rate': round(self.counters['hits'] / total, 4) if total else 0.0,
+                'pool_sizes': {field: len(pool.questions) for field, pool in self._pools.items()}
+            }
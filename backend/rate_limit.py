@@ -0,0 +1,57 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class RateLimiter:
+    """
+    Thread-safe token buckets per key (an IP address, an email): up to `burst`
+    attempts at once, refilled at `per_minute`. Only the `max_keys` most recently
+    seen keys are tracked; a key evicted from that LRU starts again with a full bucket.
+    Limits are per process, so with several workers the effective limit is multiplied.
+    """
+
+    def __init__(self, per_minute, burst, max_keys=100_000):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def _tokens(self, key, now):
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def _wait(self, tokens):
+        return (1 - tokens) / self.rate if self.rate else float('inf')
+
+    def retry_after(self, key):
+        """Seconds until `key` may try again (0 if it may now), without using an attempt."""
+        with self._lock:
+            tokens = self._tokens(key, time.monotonic())
+            if tokens >= 1:
+                return 0.0
+            self.limited += 1
+            return self._wait(tokens)
+
+    def hit(self, key):
+        """Use one attempt for `key`; returns 0 if allowed, else seconds until it would be."""
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._tokens(key, now)
+            if tokens < 1:
+                self.limited += 1
+                return self._wait(tokens)
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            self.allowed += 1
+            return 0.0
+
+    def stats(self):
+        with self._lock:
+            return {'keys': len(self._buckets), 'max_keys': self.max_keys, 'allowed': self.allowed,
+                    'limited': self.limited, 'per_minute': round(self.rate * 60, 3), 'burst': self.burst}
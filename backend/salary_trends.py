@@ -0,0 +1,200 @@
+import atexit
+import math
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+from log_writer import BackgroundWriter
+
+
+# Log-spaced salary bins: 20 per decade from 1e3 to 1e8, which covers annual salaries in
+# every Adzuna currency with roughly 12% resolution per bin.
+BIN_LOW = 1e3
+BINS_PER_DECADE = 20
+N_BINS = 5 * BINS_PER_DECADE
+
+
+def salary_bin(salary):
+    if salary <= BIN_LOW:
+        return 0
+    return min(int(math.log10(salary / BIN_LOW) * BINS_PER_DECADE), N_BINS - 1)
+
+
+def bin_midpoint(index):
+    return BIN_LOW * 10 ** ((index + 0.5) / BINS_PER_DECADE)
+
+
+def histogram_percentile(hist, total, q):
+    """Approximate q-th percentile from a {bin: count} histogram."""
+    target = q / 100 * total
+    seen = 0
+    for index in sorted(hist):
+        seen += hist[index]
+        if seen >= target:
+            return round(bin_midpoint(index), 2)
+    return None
+
+
+def listing_salary(listing):
+    """Midpoint of a listing's advertised range, or None if it has no salary."""
+    low, high = listing.get('salary_min'), listing.get('salary_max')
+    if low is None and high is None:
+        return None
+    low = high if low is None else low
+    high = low if high is None else high
+    return (low + high) / 2
+
+
+def listing_id(listing):
+    return listing.get('url') or f"{listing.get('title')}|{listing.get('company')}|{listing.get('location')}"
+
+
+def period_start(day, interval):
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    return day
+
+
+class SalaryTrendStore:
+    """
+    Daily salary rollups per (role, location), built from job insight snapshots.
+
+    Every fetched listing set is folded into one document per role, location and
+    day holding count/sum/min/max and a log-spaced salary histogram, so trend
+    queries read at most one small document per day instead of raw listings.
+    A listing counts once per day however often it is fetched: each document keeps
+    the ids (redirect URLs) it has seen that day. record() only queues the snapshot;
+    a BackgroundWriter thread does the writes, off the request path.
+    """
+
+    def __init__(self, collection, max_queue=1000, flush_interval=1.0):
+        self.collection = collection
+        self._writer = BackgroundWriter(self._write_batch, 'salary-trends', max_queue,
+                                        batch_size=100, flush_interval=flush_interval)
+        self._lock = threading.Lock()
+        self._indexed = False
+        self._closed = False
+        self.counters = {'enqueued': 0, 'dropped': 0, 'recorded': 0, 'duplicates': 0, 'failed': 0}
+        atexit.register(self.close)
+
+    @staticmethod
+    def _normalize(role, location):
+        return role.strip().lower(), location.strip().lower()
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def record(self, role, location, listings, when=None):
+        """Queue one snapshot of listings for today's rollup. Never blocks or raises."""
+        item = (role, location, listings, when or datetime.now(timezone.utc))
+        if self._closed:
+            self.record_now(*item)
+            return
+        self._count('enqueued' if self._writer.put(item) else 'dropped')
+
+    def _write_batch(self, items):
+        for item in items:
+            self.record_now(*item)
+
+    def _ensure_index(self):
+        if self._indexed:
+            return
+        try:
+            self.collection.create_index([('role', 1), ('location', 1), ('day', 1)], unique=True)
+        except Exception as e:
+            print(f"WARNING: Could not create salary trend index: {e}", file=sys.stderr)
+        self._indexed = True
+
+    def record_now(self, role, location, listings, when=None):
+        """Fold the listings not yet seen today into today's rollup; returns how many were new."""
+        observations = {}
+        for listing in listings:
+            salary = listing_salary(listing)
+            if salary is not None:
+                observations[listing_id(listing)] = salary
+        if not observations:
+            return 0
+        role, location = self._normalize(role, location)
+        when = when or datetime.now(timezone.utc)
+        key = {'role': role, 'location': location, 'day': datetime(when.year, when.month, when.day)}
+        self._ensure_index()
+        try:
+            # Adding the ids and reading the set as it was before is one atomic step, so
+            # concurrent workers recording the same listings split them instead of both counting them.
+            before = self.collection.find_one_and_update(
+                key, {'$addToSet': {'seen': {'$each': list(observations)}}},
+                projection={'_id': 0, 'seen': 1}, upsert=True
+            )
+            seen = set((before or {}).get('seen', ()))
+            salaries = [salary for id_, salary in observations.items() if id_ not in seen]
+            self._count('duplicates', len(observations) - len(salaries))
+            if not salaries:
+                return 0
+            increments = {'count': len(salaries), 'salary_sum': sum(salaries), 'snapshots': 1}
+            for salary in salaries:
+                bin_key = f"hist.{salary_bin(salary)}"
+                increments[bin_key] = increments.get(bin_key, 0) + 1
+            self.collection.update_one(
+                key,
+                {'$inc': increments, '$min': {'salary_min': min(salaries)}, '$max': {'salary_max': max(salaries)}}
+            )
+        except Exception as e:
+            print(f"ERROR recording salary snapshot: {e}", file=sys.stderr)
+            self._count('failed')
+            return 0
+        self._count('recorded', len(salaries))
+        return len(salaries)
+
+    def close(self, timeout=10):
+        """Write everything still queued, waiting at most about `timeout` seconds, and stop the worker."""
+        if self._closed:
+            return
+        self._closed = True
+        left = self._writer.close(timeout)
+        if left:
+            print(f"WARNING: {len(left)} salary snapshots were still queued at shutdown", file=sys.stderr)
+            self._count('dropped', len(left))
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {**counters, **self._writer.stats()}
+
+    def query(self, role, location, start, end, interval='day'):
+        """Salary percentiles per day/week/month between start and end (inclusive)."""
+        role, location = self._normalize(role, location)
+        cursor = self.collection.find(
+            {'role': role, 'location': location, 'day': {'$gte': start, '$lte': end}, 'count': {'$gt': 0}},
+            {'_id': 0, 'day': 1, 'count': 1, 'salary_sum': 1, 'salary_min': 1, 'salary_max': 1, 'hist': 1}
+        ).sort('day', 1)
+
+        periods = {}
+        for doc in cursor:
+            key = period_start(doc['day'], interval)
+            bucket = periods.setdefault(key, {'count': 0, 'salary_sum': 0.0, 'min': None, 'max': None, 'hist': {}})
+            bucket['count'] += doc['count']
+            bucket['salary_sum'] += doc['salary_sum']
+            bucket['min'] = doc['salary_min'] if bucket['min'] is None else min(bucket['min'], doc['salary_min'])
+            bucket['max'] = doc['salary_max'] if bucket['max'] is None else max(bucket['max'], doc['salary_max'])
+            for index, n in doc.get('hist', {}).items():
+                bucket['hist'][int(index)] = bucket['hist'].get(int(index), 0) + n
+
+        series = []
+        for key in sorted(periods):
+            bucket = periods[key]
+            total = bucket['count']
+            series.append({
+                'period': key.date().isoformat(),
+                'observations': total,
+                'salary_min': bucket['min'],
+                'salary_max': bucket['max'],
+                'salary_avg': round(bucket['salary_sum'] / total, 2),
+                'p25': histogram_percentile(bucket['hist'], total, 25),
+                'p50': histogram_percentile(bucket['hist'], total, 50),
+                'p75': histogram_percentile(bucket['hist'], total, 75),
+                'p90': histogram_percentile(bucket['hist'], total, 90)
+            })
+        return series
@@ -0,0 +1,96 @@
+import numpy as np
+
+
+# Roadmap step levels; the level of a skill is looked up by its (ideal - user) gap.
+NO_GAP, CRITICAL_GAP, IMPROVEMENT_NEEDED = 0, 1, 2
+
+STEP_TEMPLATES = {
+    CRITICAL_GAP: {
+        "status": "Critical Gap",
+        "priority": 1,
+        "note": "High priority: Essential for this role."
+    },
+    IMPROVEMENT_NEEDED: {
+        "status": "Improvement Needed",
+        "priority": 2,
+        "note": "Moderate priority: Refine these skills."
+    }
+}
+
+
+class SkillGapEngine:
+    """Skill-gap and roadmap calculations over a precompiled role x skill matrix."""
+
+    def __init__(self, feature_order, ideal_skills, max_rating=6, default_role="Default Career"):
+        self.features = list(feature_order)
+        self.roles = list(ideal_skills)
+        self.role_index = {role: i for i, role in enumerate(self.roles)}
+        self.default_role = default_role
+        self.default_index = self.role_index[default_role]
+        self.ideal_matrix = np.array([ideal_skills[r] for r in self.roles], dtype=np.int16)
+        self.ideal_matrix.setflags(write=False)
+        self.max_rating = max_rating
+
+        gaps = np.arange(-max_rating, max_rating + 1)
+        self._level_by_gap = np.where(gaps > 2, CRITICAL_GAP, np.where(gaps > 0, IMPROVEMENT_NEEDED, NO_GAP))
+        # Per role, per skill: roadmap level for every possible user rating.
+        ratings = np.arange(max_rating + 1)
+        self._level_tables = [
+            [self._level_by_gap[ideal - ratings + max_rating].tolist() for ideal in row]
+            for row in self.ideal_matrix.tolist()
+        ]
+        self._steps = {
+            level: [dict(skill=skill, **template) for skill in self.features]
+            for level, template in STEP_TEMPLATES.items()
+        }
+        # Roles considered by closest_roles(); the placeholder default role is not a real career.
+        self._candidate_mask = np.array([r != default_role for r in self.roles])
+
+    def ideal_scores(self, role):
+        """Ideal rating vector for a role, falling back to the default role's profile."""
+        return self.ideal_matrix[self.role_index.get(role, self.default_index)].tolist()
+
+    def role_indices(self, roles):
+        """Map role names to matrix rows; unknown roles map to the default role."""
+        return np.array([self.role_index.get(r, self.default_index) for r in roles], dtype=np.intp)
+
+    def _levels(self, user_matrix, ideal_matrix):
+        gaps = np.clip(ideal_matrix - user_matrix, -self.max_rating, self.max_rating)
+        return self._level_by_gap[gaps + self.max_rating]
+
+    def _build_roadmap(self, level_row):
+        roadmap = [dict(self._steps[CRITICAL_GAP][i]) for i in np.flatnonzero(level_row == CRITICAL_GAP)]
+        roadmap.extend(dict(self._steps[IMPROVEMENT_NEEDED][i]) for i in np.flatnonzero(level_row == IMPROVEMENT_NEEDED))
+        return roadmap
+
+    def roadmap(self, user_scores, role):
+        """Roadmap steps for a single user, critical gaps first."""
+        index = self.role_index.get(role, self.default_index)
+        # A single row is cheaper as plain table lookups than as array operations.
+        levels = [table[u] for table, u in zip(self._level_tables[index], user_scores)]
+        roadmap = [dict(step) for step, level in zip(self._steps[CRITICAL_GAP], levels) if level == CRITICAL_GAP]
+        roadmap.extend(dict(step) for step, level in zip(self._steps[IMPROVEMENT_NEEDED], levels) if level == IMPROVEMENT_NEEDED)
+        return roadmap
+
+    def roadmaps(self, user_matrix, roles):
+        """Roadmaps for a batch of users, one role per row."""
+        user_matrix = np.asarray(user_matrix, dtype=np.int16)
+        ideal_matrix = self.ideal_matrix[self.role_indices(roles)]
+        return [self._build_roadmap(row) for row in self._levels(user_matrix, ideal_matrix)]
+
+    def gap_matrix(self, user_matrix):
+        """Shortfall of each user against every role, shape (N, roles, skills)."""
+        user_matrix = np.atleast_2d(np.asarray(user_matrix, dtype=np.int16))
+        return np.maximum(self.ideal_matrix[None, :, :] - user_matrix[:, None, :], 0)
+
+    def closest_roles(self, user_matrix, k=3):
+        """The k roles with the smallest total skill shortfall for each user."""
+        totals = self.gap_matrix(user_matrix).sum(axis=2)
+        candidates = np.flatnonzero(self._candidate_mask)
+        totals = totals[:, candidates]
+        k = min(k, len(candidates))
+        order = np.argsort(totals, axis=1, kind='stable')[:, :k]
+        return [
+            [{"career": self.roles[candidates[j]], "gap": int(row_totals[j])} for j in row_order]
+            for row_order, row_totals in zip(order, totals)
+        ]
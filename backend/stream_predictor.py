@@ -0,0 +1,90 @@
+"""
+Fast path for the Class 11 stream prediction pipeline.
+
+The saved pipeline is a ColumnTransformer (numeric passthrough + one-hot encoded
+hobby/activity) in front of a RandomForestClassifier. Building a pandas DataFrame
+for every request dominates single-row latency, so the fitted encodings are
+precomputed here and numeric arrays are fed straight to the (compiled) classifier.
+tests/test_stream_predictor.py checks parity with the pipeline; run this file directly
+to compare single-row latencies.
+"""
+import numpy as np
+
+from compiled_model import compile_model
+
+
+class StreamPredictor:
+    """Array-based equivalent of the fitted stream prediction Pipeline."""
+
+    def __init__(self, pipeline):
+        preprocessor = pipeline.named_steps['preprocessor']
+        classifier = pipeline.named_steps['classifier']
+        self.numeric_columns = []
+        self.numeric_slots = []
+        # (column, {category: output slot}) for every one-hot encoded column.
+        self.categorical_columns = []
+        width = 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == 'drop' or name == 'remainder':
+                if transformer != 'drop' and len(columns):
+                    raise TypeError("Pipelines with a passthrough remainder are not supported.")
+                continue
+            # Fitted passthrough columns show up as an identity FunctionTransformer.
+            if transformer == 'passthrough' or getattr(transformer, 'func', False) is None:
+                self.numeric_columns.extend(columns)
+                self.numeric_slots.extend(range(width, width + len(columns)))
+                width += len(columns)
+            elif hasattr(transformer, 'categories_'):
+                if getattr(transformer, 'drop_idx_', None) is not None:
+                    raise TypeError("OneHotEncoder(drop=...) is not supported.")
+                for column, categories in zip(columns, transformer.categories_):
+                    slots = {category: width + i for i, category in enumerate(categories.tolist())}
+                    self.categorical_columns.append((column, slots))
+                    width += len(categories)
+            else:
+                raise TypeError(f"Unsupported transformer in stream pipeline: {transformer!r}")
+        self.width = width
+        self.numeric_slots = np.array(self.numeric_slots, dtype=np.intp)
+
+        try:
+            self.classifier = compile_model(classifier)
+        except TypeError:
+            self.classifier = classifier
+
+    def encode(self, rows):
+        """Encode a list of input dicts into the pipeline's feature matrix."""
+        X = np.zeros((len(rows), self.width), dtype=np.float64)
+        X[:, self.numeric_slots] = [[row[c] for c in self.numeric_columns] for row in rows]
+        for column, slots in self.categorical_columns:
+            # Unknown categories encode as all zeros, like handle_unknown='ignore'.
+            hits = [(i, slots[row[column]]) for i, row in enumerate(rows) if row[column] in slots]
+            if hits:
+                row_ids, col_ids = zip(*hits)
+                X[list(row_ids), list(col_ids)] = 1.0
+        return X
+
+    def predict(self, rows):
+        return self.classifier.predict(self.encode(rows))
+
+
+if __name__ == '__main__':
+    import time
+    import warnings
+    import joblib
+    import pandas as pd
+
+    warnings.filterwarnings("ignore")
+    pipeline = joblib.load('10_stream_predictor_model.pkl')
+    fast = StreamPredictor(pipeline)
+
+    rows = pd.read_csv('stream_dataset.csv').drop(columns=['stream']).to_dict('records')
+
+    for name, fn in [('pipeline', lambda row: pipeline.predict(pd.DataFrame([row]))),
+                     ('fast', lambda row: fast.predict([row]))]:
+        samples = []
+        for i in range(1000):
+            start = time.perf_counter()
+            fn(rows[i % len(rows)])
+            samples.append((time.perf_counter() - start) * 1e6)
+        print(f"{name:>8} single-row predict: p50 {np.percentile(samples, 50):9.1f} us  "
+              f"p99 {np.percentile(samples, 99):9.1f} us")
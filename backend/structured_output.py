@@ -0,0 +1,247 @@
+import json
+import re
+import threading
+
+
+TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+class StructuredOutputError(ValueError):
+    """The model never produced valid values for every field; `partial` holds the ones that were valid."""
+
+    def __init__(self, missing, partial):
+        super().__init__(f"LLM output missing or invalid fields: {', '.join(missing)}")
+        self.missing = missing
+        self.partial = partial
+
+
+class JSONObjectScanner:
+    """
+    Incremental, string-aware brace matcher for the first JSON object in a text stream.
+
+    Text before the first '{' (prose, a ```json fence) is skipped. feed() returns True
+    as soon as that object's closing brace arrives, so a stream can be cut there.
+    """
+
+    def __init__(self):
+        self.buffer = []
+        self.started = False
+        self.complete = False
+        self.stack = []
+        self.in_string = False
+        self.escaped = False
+        self.length = 0
+        self.commas = []
+
+    def feed(self, text):
+        for char in text:
+            if self.complete:
+                break
+            if not self.started:
+                if char != '{':
+                    continue
+                self.started = True
+            self.buffer.append(char)
+            self.length += 1
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.stack.append(char)
+            elif char in '}]':
+                if self.stack:
+                    self.stack.pop()
+                if not self.stack:
+                    self.complete = True
+            elif char == ',':
+                self.commas.append((self.length - 1, tuple(self.stack)))
+        return self.complete
+
+    @staticmethod
+    def _closers(stack):
+        return ''.join('}' if opener == '{' else ']' for opener in reversed(stack))
+
+    def candidates(self):
+        """The object text as read, then progressively truncated and closed variants."""
+        text = ''.join(self.buffer)
+        if self.complete:
+            yield text
+            return
+        tail = text + ('"' if self.in_string else '')
+        yield tail.rstrip().rstrip(',') + self._closers(self.stack)
+        for position, stack in reversed(self.commas):
+            yield text[:position] + self._closers(stack)
+
+
+def repair_json(text):
+    """
+    Parse the first JSON object in `text`, tolerating code fences, trailing prose,
+    trailing commas and output cut off before its closing braces.
+    """
+    scanner = JSONObjectScanner()
+    scanner.feed(text)
+    if not scanner.started:
+        raise ValueError("No JSON object found in LLM output")
+    for candidate in scanner.candidates():
+        for attempt in (candidate, TRAILING_COMMA_RE.sub(r'\1', candidate)):
+            try:
+                value = json.loads(attempt)
+            except ValueError:
+                continue
+            if isinstance(value, dict):
+                return value
+    raise ValueError("Could not repair JSON object in LLM output")
+
+
+class Field:
+    def __init__(self, description):
+        self.description = description
+
+    def clean(self, value):
+        """Return the cleaned value or raise ValueError."""
+        raise NotImplementedError
+
+
+class IntField(Field):
+    def __init__(self, description, minimum, maximum):
+        super().__init__(description)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def clean(self, value):
+        if isinstance(value, bool):
+            raise ValueError("not a number")
+        if isinstance(value, str):
+            match = re.search(r"-?\d+(\.\d+)?", value)
+            if not match:
+                raise ValueError("not a number")
+            value = float(match.group())
+        value = int(round(float(value)))
+        if not self.minimum <= value <= self.maximum:
+            raise ValueError("out of range")
+        return value
+
+
+class TextField(Field):
+    def clean(self, value):
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError("empty text")
+        return value.strip()
+
+
+class TextListField(Field):
+    def __init__(self, description, length):
+        super().__init__(description)
+        self.length = length
+
+    def clean(self, value):
+        if not isinstance(value, list):
+            raise ValueError("not a list")
+        items = [item.strip() for item in value if isinstance(item, str) and item.strip()]
+        if len(items) < self.length:
+            raise ValueError("too few items")
+        return items[:self.length]
+
+
+class Schema:
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def validate(self, obj):
+        """Return (valid_fields, missing_field_names)."""
+        valid, missing = {}, []
+        for name, field in self.fields.items():
+            try:
+                valid[name] = field.clean(obj[name])
+            except (KeyError, TypeError, ValueError):
+                missing.append(name)
+        return valid, missing
+
+    def describe(self, names):
+        return "{\n" + ",\n".join(f'    "{name}": {self.fields[name].description}' for name in names) + "\n}"
+
+
+class StructuredGenerator:
+    """
+    JSON generation on top of LLMClient that does not throw away slightly broken output.
+
+    The response is streamed and cut as soon as the first complete JSON object has
+    arrived. The text is repaired (fences, trailing text, missing closing braces)
+    and validated against a Schema. If some fields are still missing or invalid,
+    only those fields are requested again, up to `max_followups` times.
+    """
+
+    def __init__(self, llm_client, max_followups=1):
+        self.llm = llm_client
+        self.max_followups = max_followups
+        self._lock = threading.Lock()
+        self.counters = {'calls': 0, 'early_stops': 0, 'repaired': 0, 'unparseable': 0,
+                         'followups': 0, 'failures': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _read(self, route, user, prompt, system, **kwargs):
+        scheduler = self.llm.scheduler
+        scheduler.acquire(route, user)
+        failed = True
+        scanner = JSONObjectScanner()
+        raw = []
+        try:
+            stream = self.llm.stream(route, prompt, system=system, format='json', **kwargs)
+            try:
+                for chunk in stream:
+                    token = chunk['response']
+                    raw.append(token)
+                    if scanner.feed(token):
+                        if not chunk.get('done'):
+                            self._count('early_stops')
+                        break
+            finally:
+                stream.close()
+            failed = False
+        finally:
+            scheduler.release(route, failed=failed)
+
+        text = ''.join(raw)
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+        try:
+            value = repair_json(text)
+            self._count('repaired')
+            return value
+        except ValueError:
+            self._count('unparseable')
+            return {}
+
+    def generate(self, route, user, prompt, schema, system=None, **kwargs):
+        self._count('calls')
+        result, missing = schema.validate(self._read(route, user, prompt, system, **kwargs))
+        for _ in range(self.max_followups):
+            if not missing:
+                break
+            self._count('followups')
+            followup = (f"{prompt}\n\nYour previous reply was missing or had invalid values for: "
+                        f"{', '.join(missing)}.\nReturn ONLY a JSON object with exactly these keys:\n"
+                        f"{schema.describe(missing)}")
+            extra, _ = schema.validate(self._read(route, user, followup, system, **kwargs))
+            for name, value in extra.items():
+                result.setdefault(name, value)
+            missing = [name for name in schema.fields if name not in result]
+        if missing:
+            self._count('failures')
+            raise StructuredOutputError(missing, result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
@@ -0,0 +1,93 @@
+import os
+import sys
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+# Model files are opened relative to the backend folder, as when running `python app.py`.
+os.chdir(BACKEND)
+# No keep-alive pings, question prefill or upload cleanup threads during tests.
+os.environ.setdefault('LLM_WARM_ON_START', '0')
+os.environ.setdefault('QUESTION_POOL_PREWARM', '0')
+os.environ.setdefault('UPLOAD_GC_INTERVAL', '0')
+
+from stubs import FakeAdzuna, FakeOllama  # noqa: E402
+
+
+def pytest_addoption(parser):
+    parser.addoption('--runslow', action='store_true', help='also run the tests marked slow')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'slow: exhaustive checks that take minutes; run with --runslow')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--runslow'):
+        return
+    skip = pytest.mark.skip(reason='slow; run with --runslow')
+    for item in items:
+        if 'slow' in item.keywords:
+            item.add_marker(skip)
+
+
+class MemoryCacheStore:
+    """MongoCacheStore's interface over a dict, so warm entries can outlive a cache instance."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value, fetched_at, expires_in):
+        self.entries[key] = (value, fetched_at)
+
+
+class RecordedTrends:
+    def __init__(self):
+        self.recorded = []
+
+    def record(self, role, location, listings):
+        self.recorded.append((role, location, listings))
+
+
+@pytest.fixture
+def adzuna(monkeypatch):
+    """A FakeAdzuna wired into the app with a fresh cache, client and salary recorder."""
+    import app as appmod
+    from http_client import CircuitBreaker, UpstreamClient
+    from job_cache import StaleWhileRevalidateCache
+
+    with FakeAdzuna() as server:
+        monkeypatch.setattr(appmod, 'ADZUNA_API_URL', server.url)
+        monkeypatch.setattr(appmod, 'ADZUNA_APP_ID', 'test-id')
+        monkeypatch.setattr(appmod, 'ADZUNA_APP_KEY', 'test-key')
+        server.store = MemoryCacheStore()
+        monkeypatch.setattr(appmod, 'job_insights_cache', StaleWhileRevalidateCache(ttl=60, stale_ttl=60, store=server.store))
+        server.client = UpstreamClient('adzuna', max_retries=1, backoff_base=0.01, timeout=(1, 2),
+                                       breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.3))
+        monkeypatch.setattr(appmod, 'adzuna_client', server.client)
+        server.trends = RecordedTrends()
+        monkeypatch.setattr(appmod, 'salary_trends', server.trends)
+        yield server
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    """A FakeOllama behind the app's LLM client, with an empty response cache."""
+    import app as appmod
+    from llm_backends import OllamaBackend
+    from ttl_cache import LRUCache
+
+    with FakeOllama() as server:
+        monkeypatch.setattr(appmod.llm_client, 'backend', OllamaBackend(host=server.url))
+        monkeypatch.setattr(appmod, 'llm_response_cache', LRUCache(maxsize=16))
+        yield server
+
+
+@pytest.fixture
+def app_client():
+    import app as appmod
+    return appmod.create_app().test_client()
@@ -0,0 +1,151 @@
+"""Local HTTP servers that stand in for Adzuna and Ollama in tests."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StubServer:
+    """A threaded HTTP server on a free localhost port; use as a context manager."""
+
+    def __init__(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.handle(self, 'GET')
+
+            def do_POST(self):
+                server.handle(self, 'POST')
+
+        self.lock = threading.Lock()
+        self.calls = 0
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, request, method):
+        with self.lock:
+            self.calls += 1
+        self.respond(request, method)
+
+    def respond(self, request, method):
+        raise NotImplementedError
+
+    @staticmethod
+    def send_json(request, body, status=200, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(payload)
+
+
+class FakeAdzuna(StubServer):
+    """
+    Adzuna's /jobs/<country>/search/<page> with `delay` seconds of latency. Queue
+    failures in `script`: an HTTP status code, 'drop' to close the connection without
+    answering, or 'redirect' to answer with a redirect to itself.
+    """
+
+    def __init__(self, delay=0.0, results_per_page=5):
+        super().__init__()
+        self.delay = delay
+        self.results_per_page = results_per_page
+        self.script = []
+
+    def respond(self, request, method):
+        time.sleep(self.delay)
+        with self.lock:
+            step = self.script.pop(0) if self.script else 200
+        if step == 'drop':
+            request.close_connection = True
+            request.connection.close()
+            return
+        if step == 'redirect':
+            request.send_response(302)
+            request.send_header('Location', request.path)
+            request.send_header('Content-Length', '0')
+            request.end_headers()
+            return
+        url = urlparse(request.path)
+        query = parse_qs(url.query)
+        country, page = url.path.split('/')[-3], int(url.path.split('/')[-1])
+        n = int(query.get('results_per_page', [self.results_per_page])[0])
+        role = query.get('what', [''])[0]
+        results = [{
+            'title': f"{role} {i}",
+            'company': {'display_name': 'Acme'},
+            'location': {'display_name': f"City {country}"},
+            'salary_min': 1000 * (i + 1),
+            'salary_max': 2000 * (i + 1),
+            'redirect_url': f"https://jobs.example/{country}/{page}/{i}",
+            'description': 'A job.'
+        } for i in range(n)]
+        self.send_json(request, {'count': 123, 'results': results}, status=step)
+
+
+class FakeOllama(StubServer):
+    """Ollama's /api/generate, producing `tokens` at `rate` tokens per second."""
+
+    def __init__(self, tokens=None, rate=200.0):
+        super().__init__()
+        self.tokens = tokens or [f"word{i} " for i in range(20)]
+        self.rate = rate
+        self.completed = 0
+        self.aborted = 0
+        self.prompts = []
+
+    def respond(self, request, method):
+        body = json.loads(request.rfile.read(int(request.headers['Content-Length'])))
+        with self.lock:
+            self.prompts.append(body.get('prompt'))
+        done = {'model': body.get('model'), 'response': '', 'done': True, 'eval_count': len(self.tokens),
+                'eval_duration': int(len(self.tokens) / self.rate * 1e9)}
+        if not body.get('stream', True):
+            time.sleep(len(self.tokens) / self.rate)
+            self.send_json(request, dict(done, response=''.join(self.tokens)))
+            self._finished('completed')
+            return
+        request.send_response(200)
+        request.send_header('Content-Type', 'application/x-ndjson')
+        request.send_header('Transfer-Encoding', 'chunked')
+        request.end_headers()
+        try:
+            for token in self.tokens:
+                time.sleep(1 / self.rate)
+                self._write_chunk(request, {'model': body.get('model'), 'response': token, 'done': False})
+            self._write_chunk(request, done)
+            request.wfile.write(b'0\r\n\r\n')
+            request.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self._finished('aborted')
+            return
+        self._finished('completed')
+
+    @staticmethod
+    def _write_chunk(request, message):
+        line = (json.dumps(message) + '\n').encode('utf-8')
+        request.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+        request.wfile.flush()
+
+    def _finished(self, outcome):
+        with self.lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
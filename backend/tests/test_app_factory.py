@@ -0,0 +1,26 @@
+import io
+import os
+import subprocess
+import sys
+
+from werkzeug.datastructures import FileStorage
+
+from upload_store import UploadStore
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_and_create_app_leave_the_disk_alone(tmp_path):
+    script = "import app; assert not hasattr(app, 'app'); app.create_app(preload=False)"
+    env = dict(os.environ, PYTHONPATH=BACKEND)
+    env.pop('ASSET_FOLDER', None)
+    subprocess.run([sys.executable, '-c', script], cwd=tmp_path, env=env, check=True, capture_output=True)
+    assert os.listdir(tmp_path) == []
+
+
+def test_store_creates_its_folder_on_first_write(tmp_path):
+    root = tmp_path / 'uploads'
+    store = UploadStore(str(root))
+    assert not root.exists()
+    stored = store.save(FileStorage(io.BytesIO(b'%PDF-1.4 resume'), filename='cv.pdf'))
+    assert (root / stored.name).read_bytes() == b'%PDF-1.4 resume'
@@ -0,0 +1,57 @@
+import pytest
+
+import app as appmod
+from password_hasher import PasswordHasher
+from rate_limit import RateLimiter
+
+
+class FakeUsers:
+    """The users collection calls signup and login make, over a list."""
+
+    def __init__(self, *users):
+        self.users = list(users)
+
+    def find_one(self, query):
+        emails = query['email']['$in']
+        return next((user for user in self.users if user['email'] in emails), None)
+
+    def insert_one(self, user):
+        self.users.append(user)
+
+
+@pytest.fixture
+def users(monkeypatch):
+    users = FakeUsers()
+    monkeypatch.setattr(appmod, 'users_collection', users)
+    monkeypatch.setattr(appmod, 'password_hasher', PasswordHasher(rounds=4, workers=0))
+    monkeypatch.setattr(appmod, 'auth_ip_limiter', RateLimiter(per_minute=600, burst=100))
+    monkeypatch.setattr(appmod, 'login_email_limiter', RateLimiter(per_minute=60, burst=10))
+    return users
+
+
+def test_signup_requires_a_name(app_client, users):
+    for body in ({'email': 'ada@example.com', 'password': 'pw'},
+                 {'name': ' ', 'email': 'ada@example.com', 'password': 'pw'},
+                 {'name': ['Ada'], 'email': 'ada@example.com', 'password': 'pw'},
+                 {'name': 'Ada', 'password': 'pw'}, ['Ada']):
+        response = app_client.post('/signup', json=body)
+        assert response.status_code == 400
+        assert 'message' in response.get_json()
+    assert users.users == []
+
+
+def test_emails_are_stored_and_looked_up_normalized(app_client, users):
+    body = {'name': 'Ada', 'email': ' Ada@Example.com ', 'password': 'pw'}
+    assert app_client.post('/signup', json=body).status_code == 201
+    assert users.users[0]['email'] == 'ada@example.com'
+    assert app_client.post('/signup', json={**body, 'email': 'ADA@example.com'}).status_code == 400
+
+    response = app_client.post('/login', json={'email': 'ada@EXAMPLE.com', 'password': 'pw'})
+    assert response.status_code == 200 and response.get_json()['name'] == 'Ada'
+
+
+def test_accounts_stored_before_normalization_can_still_log_in(app_client, users):
+    users.users.append({'name': 'Grace', 'email': 'Grace@Example.com',
+                        'password': appmod.password_hasher.hash('pw')})
+    response = app_client.post('/login', json={'email': 'Grace@Example.com', 'password': 'pw'})
+    assert response.status_code == 200 and response.get_json()['name'] == 'Grace'
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import app as appmod
+
+
+def random_profiles(n, zero_fraction, seed):
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(0, 7, (n, len(appmod.FEATURE_ORDER)))
+    return matrix * (rng.random(matrix.shape) >= zero_fraction)
+
+
+@pytest.mark.parametrize('zero_fraction', [0.0, 0.7])
+def test_top_career_is_the_predicted_career(zero_fraction):
+    appmod.prediction_cache.clear()
+    matrix = random_profiles(3000, zero_fraction, seed=1)
+    indices, confidences = appmod.career_scores(matrix)
+    careers = appmod.career_model.get().label_encoder.inverse_transform(indices)
+    for career, row in zip(careers, confidences):
+        ranked = appmod.top_careers(row, 3)
+        assert ranked[0]['career'] == career
+        assert [c['confidence'] for c in ranked] == sorted((c['confidence'] for c in ranked), reverse=True)
+
+
+def test_cached_scores_match_uncached():
+    matrix = random_profiles(200, 0.5, seed=2)
+    appmod.prediction_cache.clear()
+    first = appmod.career_scores(matrix)
+    second = appmod.career_scores(matrix)
+    assert (first[0] == second[0]).all()
+    assert all((a == b).all() for a, b in zip(first[1], second[1]))
+
+
+@pytest.mark.parametrize('top_k', ['x', None, [3], True, 'nan'])
+def test_invalid_top_k_is_a_400(app_client, top_k):
+    for path, body in [('/predict', {'skills': {}}), ('/predict/batch', {'profiles': [{'skills': {}}]}),
+                       ('/skill-gap', {'skills': {}})]:
+        response = app_client.post(path, json={**body, 'top_k': top_k})
+        assert response.status_code == 400, path
+        assert "'top_k'" in response.get_json()['error']
+
+
+@pytest.mark.parametrize('top_k, expected', [(0, 1), (-5, 1), (2, 2), ('4', 4), (10_000, None)])
+def test_top_k_is_clamped(top_k, expected):
+    n_classes = len(appmod.career_model.get().label_encoder.classes_)
+    assert appmod.bounded_number({'top_k': top_k}, 'top_k', 3, 1, n_classes) == (expected or n_classes)
@@ -0,0 +1,51 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from compiled_model import compile_model, parity_inputs
+
+pytestmark = [
+    pytest.mark.skipif(not os.path.exists('career_model.pkl'), reason='career_model.pkl is not present'),
+    pytest.mark.filterwarnings('ignore:X does not have valid feature names')
+]
+
+RATING_MAP = {'Not Interested': 0, 'Poor': 1, 'Beginner': 2, 'Average': 3,
+              'Intermediate': 4, 'Excellent': 5, 'Professional': 6}
+
+
+@pytest.fixture(scope='module')
+def models():
+    with open('career_model.pkl', 'rb') as f:
+        model = pickle.load(f)
+    return model, compile_model(model)
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    df = pd.read_csv('dataset9000.csv')
+    return df[df.columns[:-1]].apply(lambda col: col.map(RATING_MAP)).fillna(0).to_numpy(dtype=np.float64)
+
+
+def assert_parity(model, compiled, X):
+    np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+    if hasattr(compiled, 'decision_function'):
+        np.testing.assert_array_equal(compiled.decision_function(X), model.decision_function(X))
+
+
+def test_matches_sklearn_on_the_training_data(models, dataset):
+    assert_parity(*models, dataset)
+
+
+def test_matches_sklearn_on_random_profiles(models, dataset):
+    inputs = parity_inputs(dataset, n_random=5000)
+    assert_parity(*models, inputs['uniform random'])
+    assert_parity(*models, inputs['sparse random (70% zero)'])
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('name', ['uniform random', 'sparse random (70% zero)', 'every profile with <= 3 rated skills'])
+def test_matches_sklearn_exhaustively(models, dataset, name):
+    assert_parity(*models, parity_inputs(dataset)[name])
@@ -0,0 +1,60 @@
+import json
+import time
+
+import app as appmod
+
+LETTER = {'userName': 'Ada Lovelace', 'jobDescription': 'Backend engineer working on Python services.'}
+
+
+def events(body):
+    parsed = []
+    for message in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in message.split('\n'))
+        parsed.append((lines.get('event'), json.loads(lines['data'])))
+    return parsed
+
+
+def test_repeated_request_is_served_from_cache(ollama, app_client):
+    first = app_client.post('/api/generate_cover_letter', json=LETTER)
+    second = app_client.post('/api/generate_cover_letter', json=LETTER)
+    assert (first.status_code, first.headers['X-Cache']) == (200, 'MISS')
+    assert (second.status_code, second.headers['X-Cache']) == (200, 'HIT')
+    assert second.get_json() == first.get_json() == {'cover_letter': ''.join(ollama.tokens).strip()}
+    assert ollama.calls == 1
+
+    other = app_client.post('/api/generate_cover_letter', json=dict(LETTER, userName='Grace Hopper'))
+    regenerated = app_client.post('/api/generate_cover_letter', json=dict(LETTER, regenerate=True))
+    assert (other.headers['X-Cache'], regenerated.headers['X-Cache']) == ('MISS', 'BYPASS')
+    assert ollama.calls == 3
+
+
+def test_stream_sends_every_token_then_metrics(ollama, app_client):
+    # Closing the response, as the WSGI server does, releases the model slot.
+    with app_client.post('/api/generate_cover_letter/stream', json=LETTER) as response:
+        assert response.mimetype == 'text/event-stream'
+        messages = events(response.get_data(as_text=True))
+
+    assert [data['token'] for event, data in messages[:-1]] == ollama.tokens
+    event, done = messages[-1]
+    assert event == 'done'
+    assert done['cover_letter'] == ''.join(ollama.tokens).strip()
+    assert done['metrics']['tokens'] == len(ollama.tokens)
+    assert done['metrics']['ttft_ms'] is not None and done['metrics']['tokens_per_sec'] > 0
+    assert ollama.completed == 1
+    assert appmod.llm_scheduler.stats()['routes']['cover_letter']['running'] == 0
+
+
+def test_client_disconnect_stops_generation_and_frees_the_slot(ollama, app_client):
+    ollama.tokens = [f"word{i} " for i in range(200)]
+    ollama.rate = 50.0
+    response = app_client.post('/api/generate_cover_letter/stream', json=LETTER, buffered=False)
+    received = response.iter_encoded()
+    for _ in range(3):
+        assert b'"token"' in next(received)
+    response.close()
+
+    deadline = time.monotonic() + 5
+    while ollama.aborted == 0 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert (ollama.aborted, ollama.completed) == (1, 0)
+    assert appmod.llm_scheduler.stats()['routes']['cover_letter']['running'] == 0
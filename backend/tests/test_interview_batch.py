@@ -0,0 +1,23 @@
+import app as appmod
+
+
+def evaluate_batch(client, answers):
+    return client.post('/mock-interview', json={'action': 'evaluate_batch', 'field': 'Data Science', 'answers': answers})
+
+
+def test_malformed_items_get_a_json_400(app_client):
+    for answers in ([{'question': 'q', 'answer': 5}], [{'question': None, 'answer': 'a'}],
+                    [{'answer': 'a b c d e f'}], [{'question': 'q', 'answer': ['a']}], ['q']):
+        response = evaluate_batch(app_client, answers)
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+
+
+def test_short_and_missing_answers_are_graded_without_the_llm(app_client, monkeypatch):
+    monkeypatch.setattr(appmod, 'evaluate_answer', lambda *args: {'score': 7, 'feedback': 'ok', 'ideal_answer': 'x'})
+    response = evaluate_batch(app_client, [{'question': 'q1'}, {'question': 'q2', 'answer': 'too short'},
+                                           {'question': 'q3', 'answer': 'a long enough answer about the topic'}])
+    body = response.get_json()
+    assert [r['graded_by'] for r in body['results']] == ['heuristic', 'heuristic', 'llm']
+    assert [r['score'] for r in body['results']] == [0, 1, 7]
+    assert body['aggregate']['total_score'] == 8
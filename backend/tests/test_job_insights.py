@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pymongo
+
+import app as appmod
+from job_cache import MongoCacheStore, StaleWhileRevalidateCache
+
+
+def ask(client, role='Software Developer', location='gb'):
+    return client.post('/job-insights', json={'role': role, 'location': location})
+
+
+def concurrently(n, fn):
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def run(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_misses_share_one_upstream_call(adzuna):
+    adzuna.delay = 0.3
+    app = appmod.create_app()
+    responses = concurrently(20, lambda: ask(app.test_client()))
+    assert [r.status_code for r in responses] == [200] * 20
+    assert adzuna.calls == 1
+    assert len({r.get_data() for r in responses}) == 1
+    assert appmod.job_insights_cache.stats()['coalesced'] == 19
+
+    again = ask(app.test_client())
+    assert again.headers['X-Cache'] == 'HIT'
+    assert adzuna.calls == 1
+
+
+def test_cache_is_keyed_by_role_and_location(adzuna, app_client):
+    ask(app_client, 'Data Scientist', 'gb')
+    ask(app_client, 'data scientist ', 'GB')
+    ask(app_client, 'Data Scientist', 'us')
+    ask(app_client, 'Web Developer', 'gb')
+    assert adzuna.calls == 3
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(adzuna, monkeypatch, app_client):
+    now = [1_000_000.0]
+    cache = StaleWhileRevalidateCache(ttl=60, stale_ttl=600, clock=lambda: now[0])
+    monkeypatch.setattr(appmod, 'job_insights_cache', cache)
+    assert ask(app_client).headers['X-Cache'] == 'MISS'
+    now[0] += 61
+    adzuna.delay = 0.3
+    app = appmod.create_app()
+    started = time.perf_counter()
+    responses = concurrently(10, lambda: ask(app.test_client()))
+    assert time.perf_counter() - started < 0.3
+    assert {r.headers['X-Cache'] for r in responses} == {'STALE'}
+
+    deadline = time.monotonic() + 5
+    while cache.stats()['refreshes'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.stats()['refreshes'] == 1
+    assert adzuna.calls == 2
+    assert ask(app_client).headers['X-Cache'] == 'HIT'
+
+
+def test_persistent_store_keeps_entries_across_restarts(adzuna, monkeypatch, app_client):
+    assert ask(app_client).headers['X-Cache'] == 'MISS'
+    # A new process starts with an empty memory cache but the same store.
+    monkeypatch.setattr(appmod, 'job_insights_cache', StaleWhileRevalidateCache(ttl=60, stale_ttl=60, store=adzuna.store))
+    response = ask(app_client)
+    assert response.headers['X-Cache'] == 'HIT'
+    assert adzuna.calls == 1
+    assert appmod.job_insights_cache.stats()['store_hits'] == 1
+
+
+def test_unreachable_store_fails_fast_and_is_skipped_afterwards(adzuna, monkeypatch, app_client):
+    client = pymongo.MongoClient('mongodb://127.0.0.1:9/', connect=False)
+    store = MongoCacheStore(client['db']['job_insights_cache'], timeout=0.3, retry_after=60)
+    monkeypatch.setattr(appmod, 'job_insights_cache', StaleWhileRevalidateCache(ttl=60, stale_ttl=60, store=store))
+    started = time.monotonic()
+    assert ask(app_client, 'Developer').headers['X-Cache'] == 'MISS'
+    assert time.monotonic() - started < 1.5
+    started = time.monotonic()
+    assert ask(app_client, 'Designer').headers['X-Cache'] == 'MISS'
+    assert ask(app_client, 'Designer').headers['X-Cache'] == 'HIT'
+    assert time.monotonic() - started < 0.5
+    client.close()
+
+
+def test_aggregate_rejects_non_numeric_paging_and_clamps_the_rest(adzuna, app_client):
+    aggregate = lambda **params: app_client.post('/job-insights/aggregate',
+                                                 json=dict(role='Developer', countries=['gb'], **params))
+    for params in ({'pages': 'x'}, {'results_per_page': [5]}, {'timeout': 'nan'}, {'pages': True}):
+        response = aggregate(**params)
+        assert response.status_code == 400
+        assert 'must be' in response.get_json()['error']
+
+    body = aggregate(pages=50, results_per_page=0, timeout=0).get_json()
+    assert adzuna.calls == 10
+    assert body['unique_listings'] == 10 and body['timed_out'] == []
@@ -0,0 +1,26 @@
+from llm_backends import OllamaBackend, OpenAICompatibleBackend, StubBackend
+from llm_client import LLMClient
+from llm_scheduler import LLMScheduler, RouteConfig
+
+
+def client(backend):
+    scheduler = LLMScheduler({'cover_letter': RouteConfig(0)})
+    return LLMClient('model-a', scheduler, backend, route_models={'cover_letter': 'model-b'})
+
+
+def test_warm_pings_every_ollama_model(ollama):
+    llm = client(OllamaBackend(host=ollama.url))
+    assert llm.warm()
+    assert ollama.prompts == ['', '']
+    assert llm.stats()['warm']['pings'] == 2
+
+
+def test_backends_without_keep_alive_are_never_warmed(ollama):
+    # An OpenAI-compatible server would run a full chat completion per ping.
+    for backend in (OpenAICompatibleBackend(ollama.url), StubBackend()):
+        llm = client(backend)
+        assert llm.warm()
+        llm.start_keepalive(0.01)
+        assert llm._keepalive_thread is None
+        assert llm.stats()['warm']['pings'] == 0 and llm.stats()['keep_alive'] is None
+    assert ollama.calls == 0
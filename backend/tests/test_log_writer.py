@@ -0,0 +1,58 @@
+import json
+import threading
+import time
+
+from log_writer import BatchedLogWriter
+
+
+class SlowDatabase:
+    """insert_many blocks until `release` is set, like a MongoDB that cannot be reached."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.written = []
+
+    def __getitem__(self, collection):
+        return self
+
+    def insert_many(self, records, ordered=False):
+        self.release.wait(5)
+        self.written.extend(records)
+
+
+def test_records_are_written_in_batches():
+    db = SlowDatabase()
+    db.release.set()
+    writer = BatchedLogWriter(db, batch_size=10, flush_interval=0.05)
+    writer.submit_many('predictions', [{'i': i} for i in range(25)])
+    writer.close()
+    assert [r['i'] for r in db.written] == list(range(25))
+    assert writer.stats()['written'] == 25
+
+
+def test_close_gives_up_on_a_stuck_worker_and_counts_what_is_left():
+    db = SlowDatabase()
+    writer = BatchedLogWriter(db, max_queue=4, batch_size=1, flush_interval=0.01)
+    writer.submit('predictions', {'i': 0})
+    time.sleep(0.1)
+    writer.submit_many('predictions', [{'i': i} for i in range(1, 6)])
+
+    started = time.monotonic()
+    writer.close(timeout=0.3)
+    assert time.monotonic() - started < 1
+    stats = writer.stats()
+    assert stats['enqueued'] == 5 and stats['dropped'] == 5 and stats['queue_depth'] == 0
+    db.release.set()
+
+
+def test_close_spills_what_is_left_under_the_spill_policy(tmp_path):
+    db = SlowDatabase()
+    spill = tmp_path / 'spill.jsonl'
+    writer = BatchedLogWriter(db, max_queue=4, batch_size=1, flush_interval=0.01, overflow='spill',
+                              spill_path=str(spill))
+    writer.submit('predictions', {'i': 0})
+    time.sleep(0.1)
+    writer.submit_many('predictions', [{'i': i} for i in range(1, 4)])
+    writer.close(timeout=0.3)
+    assert [json.loads(line)['record']['i'] for line in spill.read_text().splitlines()] == [1, 2, 3]
+    db.release.set()
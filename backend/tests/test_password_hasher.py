@@ -0,0 +1,15 @@
+import password_hasher
+from password_hasher import PasswordHasher, workers_per_process
+
+
+def test_pool_size_is_split_across_web_workers(monkeypatch):
+    monkeypatch.setattr(password_hasher.os, 'cpu_count', lambda: 8)
+    assert [workers_per_process(n) for n in (1, 2, 3, 8, 16, 0)] == [8, 4, 2, 1, 1, 8]
+
+
+def test_hash_and_check_in_the_pool():
+    hasher = PasswordHasher(rounds=4, workers=1)
+    hashed = hasher.hash('correct horse')
+    assert hasher.check('correct horse', hashed) and not hasher.check('wrong', hashed)
+    assert PasswordHasher(rounds=5, workers=0).needs_rehash(hashed)
+    assert hasher.stats()['workers'] == 1
@@ -0,0 +1,22 @@
+import json
+
+
+def generate(client, user_data, **params):
+    return client.post('/generate-portfolio', query_string=params, data={'userData': json.dumps(user_data)})
+
+
+def test_numbers_are_rendered_as_text(app_client):
+    response = generate(app_client, {'name': 5, 'skills': [{'name': 'Python', 'level': 90}],
+                                     'contact': {'phone': 5551234}})
+    assert response.status_code == 200
+    html = json.loads(response.get_data(as_text=True))['html']
+    assert '<title>5' in html and 'Python' in html and '5551234' in html and html.rstrip().endswith('</html>')
+
+
+def test_malformed_user_data_gets_a_json_400_before_streaming(app_client):
+    for user_data in ({'name': {'first': 'Ada'}}, {'skills': ['Python']}, {'education': {'degree': 'BSc'}},
+                      {'contact': 'me@example.com'}, {'projects': 'none'}, ['Ada']):
+        for params in ({}, {'format': 'html'}):
+            response = generate(app_client, user_data, **params)
+            assert response.status_code == 400
+            assert 'error' in response.get_json()
@@ -0,0 +1,63 @@
+import threading
+import time
+
+import app as appmod
+from question_pool import QuestionPool
+
+
+class Generator:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, field):
+        with self.lock:
+            self.calls.append(field)
+            return f"{field} question {len(self.calls)} about topic {len(self.calls) * 7919}"
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_only_listed_fields_are_pooled():
+    generate = Generator()
+    pool = QuestionPool(generate, ['Data Science'], target=4, low_water=1)
+
+    assert pool.take('Astrology') is None
+    pool.remember('Astrology', 'What is your sign?')
+    assert not pool.add('Astrology', 'Which planet rules Mondays?')
+    assert pool.stats()['pool_sizes'] == {'Data Science': 0}
+    assert pool.stats()['unpooled'] == 1
+
+    assert pool.take('Data Science') is None
+    assert wait_for(lambda: pool.stats()['pool_sizes']['Data Science'] == 4)
+    assert set(generate.calls) == {'Data Science'}
+    assert pool.take('Data Science').startswith('Data Science question')
+
+
+def test_prefill_covers_every_frontend_field_up_to_its_own_target():
+    generate = Generator()
+    pool = QuestionPool(generate, appmod.INTERVIEW_FIELDS, target=8)
+    pool.prefill(target=1)
+    assert wait_for(lambda: pool.stats()['refills'] == len(appmod.INTERVIEW_FIELDS)
+                    and not any(p.refilling for p in pool._pools.values()))
+    assert set(pool.stats()['pool_sizes'].values()) == {1}
+    assert sorted(generate.calls) == sorted(appmod.INTERVIEW_FIELDS)
+    frontend = open('../frontend/src/components/MockInterview.js', encoding='utf-8').read()
+    assert all(f"name: '{field}'" in frontend for field in appmod.INTERVIEW_FIELDS if field != 'General Technology')
+
+
+def test_unknown_field_costs_one_live_generation(ollama, app_client, monkeypatch):
+    monkeypatch.setattr(appmod, 'question_pool', QuestionPool(appmod.question_pool.generate, ['Data Science']))
+    response = app_client.post('/mock-interview', json={'action': 'get_question', 'field': 'Astrology'})
+    assert response.get_json() == {'question': ''.join(ollama.tokens).strip()}
+    time.sleep(0.2)
+    assert ollama.calls == 1
+    assert appmod.question_pool.stats()['pool_sizes'] == {'Data Science': 0}
+
+    response = app_client.post('/mock-interview', json={'action': 'get_question', 'field': ['Astrology']})
+    assert response.status_code == 400
@@ -0,0 +1,100 @@
+import threading
+from datetime import datetime, timedelta
+
+from salary_trends import SalaryTrendStore
+
+
+class MemoryCollection:
+    """The slice of a pymongo collection SalaryTrendStore uses, with atomic updates."""
+
+    def __init__(self):
+        self.docs = {}
+        self.lock = threading.Lock()
+
+    def create_index(self, keys, unique=False):
+        pass
+
+    def _doc(self, key, upsert):
+        k = (key['role'], key['location'], key['day'])
+        if k not in self.docs and upsert:
+            self.docs[k] = dict(key)
+        return self.docs.get(k)
+
+    def find_one_and_update(self, key, update, projection=None, upsert=False):
+        with self.lock:
+            doc = self._doc(key, False)
+            before = {'seen': list(doc.get('seen', []))} if doc else None
+            doc = self._doc(key, upsert)
+            seen = doc.setdefault('seen', [])
+            seen.extend(v for v in update['$addToSet']['seen']['$each'] if v not in seen)
+            return before
+
+    def update_one(self, key, update, upsert=False):
+        with self.lock:
+            doc = self._doc(key, upsert)
+            for field, n in update['$inc'].items():
+                if field.startswith('hist.'):
+                    hist = doc.setdefault('hist', {})
+                    hist[field[5:]] = hist.get(field[5:], 0) + n
+                else:
+                    doc[field] = doc.get(field, 0) + n
+            for field, value in update['$min'].items():
+                doc[field] = min(doc.get(field, value), value)
+            for field, value in update['$max'].items():
+                doc[field] = max(doc.get(field, value), value)
+
+    def find(self, query, projection):
+        docs = [d for d in self.docs.values() if d['role'] == query['role'] and d['location'] == query['location']
+                and query['day']['$gte'] <= d['day'] <= query['day']['$lte'] and d.get('count', 0) > 0]
+
+        class Cursor(list):
+            def sort(self, field, direction):
+                return sorted(self, key=lambda d: d[field])
+        return Cursor(docs)
+
+
+def listings(ids, salary=50_000):
+    return [{'url': f"https://jobs.example/{i}", 'salary_min': salary, 'salary_max': salary} for i in ids]
+
+
+def test_refetched_listings_count_once_per_day():
+    store = SalaryTrendStore(MemoryCollection())
+    day = datetime(2026, 3, 2, 12)
+    assert store.record_now('Developer', 'gb', listings(range(5)), when=day) == 5
+    assert store.record_now(' developer', 'GB', listings(range(5)), when=day) == 0
+    assert store.record_now('Developer', 'gb', listings(range(3, 8), 80_000), when=day) == 3
+    assert store.record_now('Developer', 'gb', listings(range(5)), when=day + timedelta(days=1)) == 5
+
+    series = store.query('Developer', 'gb', datetime(2026, 3, 1), datetime(2026, 3, 4))
+    assert [(p['period'], p['observations']) for p in series] == [('2026-03-02', 8), ('2026-03-03', 5)]
+    assert series[0]['salary_max'] == 80_000
+    assert store.stats()['duplicates'] == 7
+
+
+def test_concurrent_snapshots_of_the_same_listings_are_split_not_double_counted():
+    store = SalaryTrendStore(MemoryCollection())
+    day = datetime(2026, 3, 2)
+    threads = [threading.Thread(target=store.record_now, args=('Developer', 'gb', listings(range(50)), day))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.stats()['recorded'] == 50
+
+
+def test_record_queues_for_the_background_writer():
+    collection = MemoryCollection()
+    store = SalaryTrendStore(collection, max_queue=2)
+    release = threading.Event()
+    original = collection.find_one_and_update
+    collection.find_one_and_update = lambda *a, **kw: (release.wait(5), original(*a, **kw))[1]
+
+    for i in range(4):
+        store.record('Developer', 'gb', listings([i]))
+    stats = store.stats()
+    assert stats['recorded'] == 0 and stats['enqueued'] + stats['dropped'] == 4 and stats['dropped'] >= 1
+
+    release.set()
+    store.close()
+    assert store.stats()['recorded'] == store.stats()['enqueued']
@@ -0,0 +1,45 @@
+import os
+
+import joblib
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from stream_predictor import StreamPredictor
+
+NUMERIC = ['math_marks', 'science_marks', 'social_marks', 'english_marks',
+           'logic_score', 'creative_score', 'leadership_score']
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    df = pd.read_csv('stream_dataset.csv')
+    return df.drop(columns=['stream']), df['stream']
+
+
+def assert_parity(pipeline, X):
+    rows = X.to_dict('records')
+    assert list(StreamPredictor(pipeline).predict(rows)) == list(pipeline.predict(X))
+
+
+@pytest.mark.skipif(not os.path.exists('10_stream_predictor_model.pkl'),
+                    reason='10_stream_predictor_model.pkl is not present')
+def test_matches_the_saved_pipeline(dataset):
+    assert_parity(joblib.load('10_stream_predictor_model.pkl'), dataset[0])
+
+
+def test_matches_a_pipeline_of_the_same_shape(dataset):
+    X, y = dataset
+    pipeline = Pipeline([
+        ('preprocessor', ColumnTransformer([
+            ('num', 'passthrough', NUMERIC),
+            ('cat', OneHotEncoder(handle_unknown='ignore'), ['hobby', 'activity'])
+        ])),
+        ('classifier', RandomForestClassifier(n_estimators=25, random_state=0))
+    ]).fit(X, y)
+    assert_parity(pipeline, X)
+    unseen = X.head(50).assign(hobby='Knitting')
+    assert_parity(pipeline, unseen)
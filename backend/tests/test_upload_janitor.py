@@ -0,0 +1,47 @@
+import os
+import time
+
+import app as appmod
+from upload_store import UploadJanitor
+
+
+def touch(path, age_days):
+    path.write_bytes(b'x')
+    stamp = time.time() - age_days * 86400
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_assets_outlive_retention_and_only_temp_files_are_collected(tmp_path):
+    uploads, assets = tmp_path / 'uploads', tmp_path / 'uploads' / 'assets'
+    assets.mkdir(parents=True)
+    old_resume = touch(uploads / 'resume_aa.pdf', 40)
+    new_resume = touch(uploads / 'resume_bb.pdf', 1)
+    old_asset = touch(assets / 'cc.jpg', 400)
+    stale_temp = touch(assets / 'tmp1.upload', 1)
+    stale_optimized = touch(assets / 'tmp2.optimized', 1)
+
+    janitor = UploadJanitor({str(uploads): 30 * 86400, str(assets): 0})
+    assert janitor.collect() == 3
+    assert not old_resume.exists() and new_resume.exists() and old_asset.exists()
+    assert not stale_temp.exists() and not stale_optimized.exists()
+
+
+def test_app_never_ages_out_assets():
+    assert appmod.upload_janitor.roots[appmod.ASSET_FOLDER] == 0
+    assert appmod.upload_janitor.roots[appmod.UPLOAD_FOLDER] == appmod.UPLOAD_RETENTION_DAYS * 86400
+
+
+def test_in_flight_temp_files_are_not_served(tmp_path, monkeypatch):
+    monkeypatch.setattr(appmod, 'ASSET_FOLDER', str(tmp_path))
+    app = appmod.create_app()
+    app.config['UPLOAD_FOLDER'] = str(tmp_path)
+    client = app.test_client()
+    for name in ('ab12.jpg', 'tmp1.upload', 'tmp2.optimized'):
+        (tmp_path / name).write_bytes(b'x')
+
+    assert client.get('/assets/ab12.jpg').status_code == 200
+    assert client.get('/uploads/ab12.jpg').status_code == 200
+    for name in ('tmp1.upload', 'tmp2.optimized'):
+        assert client.get(f'/assets/{name}').status_code == 404
+        assert client.get(f'/uploads/{name}').status_code == 404
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+import requests
+
+import app as appmod
+from http_client import CircuitOpenError
+from job_cache import StaleWhileRevalidateCache
+
+
+def search(adzuna):
+    return adzuna.client.get(f"{adzuna.url}/jobs/gb/search/1", params={'what': 'Developer'})
+
+
+def test_retries_5xx_and_dropped_connections(adzuna):
+    adzuna.script = [503]
+    assert search(adzuna).status_code == 200
+    adzuna.script = ['drop']
+    assert search(adzuna).status_code == 200
+    stats = adzuna.client.stats()
+    assert (adzuna.calls, stats['requests'], stats['retries'], stats['failures']) == (4, 4, 2, 0)
+    assert stats['latency']['count'] == 4
+    assert stats['circuit']['state'] == 'closed'
+
+
+def test_breaker_trips_fails_fast_and_recovers(adzuna):
+    adzuna.script = [500] * 4
+    assert search(adzuna).status_code == 500
+    assert search(adzuna).status_code == 500
+    assert adzuna.client.breaker.state == 'open'
+
+    calls = adzuna.calls
+    with pytest.raises(CircuitOpenError):
+        search(adzuna)
+    assert adzuna.calls == calls
+    assert adzuna.client.stats()['short_circuited'] == 1
+
+    time.sleep(0.35)
+    assert search(adzuna).status_code == 200
+    assert adzuna.client.breaker.state == 'closed'
+
+
+def test_failed_half_open_trial_reopens_for_any_request_error(adzuna):
+    adzuna.script = [500] * 4
+    search(adzuna)
+    search(adzuna)
+    time.sleep(0.35)
+    # requests gives up after 30 redirects with TooManyRedirects, which is not retried.
+    adzuna.script = ['redirect'] * 31
+    with pytest.raises(requests.exceptions.TooManyRedirects):
+        search(adzuna)
+    assert adzuna.script == []
+    assert adzuna.client.breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        search(adzuna)
+
+    time.sleep(0.35)
+    assert search(adzuna).status_code == 200
+    assert adzuna.client.breaker.state == 'closed'
+
+
+def test_route_serves_degraded_data_while_upstream_is_down(adzuna, monkeypatch, app_client):
+    monkeypatch.setattr(appmod, 'job_insights_cache', StaleWhileRevalidateCache(ttl=0.1, stale_ttl=0.1, max_stale=60))
+    ask = lambda role: app_client.post('/job-insights', json={'role': role, 'location': 'gb'})
+    assert ask('Developer').headers['X-Cache'] == 'MISS'
+    time.sleep(0.25)
+
+    adzuna.script = [500] * 4
+    for _ in range(2):
+        response = ask('Developer')
+        assert (response.status_code, response.headers['X-Cache']) == (200, 'DEGRADED')
+    assert adzuna.client.breaker.state == 'open'
+
+    calls = adzuna.calls
+    response = ask('Developer')
+    assert (response.status_code, response.headers['X-Cache']) == (200, 'DEGRADED')
+    assert ask('Designer').status_code == 503
+    assert adzuna.calls == calls
@@ -0,0 +1,218 @@
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+from flask import Request, current_app
+
+
+CHUNK_BYTES = 64 * 1024
+TEMP_SUFFIX = '.upload'
+# Left behind only if a worker dies mid-request; the janitor removes them after an hour.
+TEMP_SUFFIXES = (TEMP_SUFFIX, '.optimized')
+
+StoredUpload = namedtuple('StoredUpload', ['name', 'size', 'sha256', 'deduplicated'])
+
+
+class UploadTooLarge(ValueError):
+    def __init__(self, limit):
+        super().__init__(f"Upload is larger than the {limit / (1024 * 1024):g} MB limit")
+        self.limit = limit
+
+
+def make_temp(root):
+    """(fd, path) of a new temp file in root, creating the folder on first use."""
+    os.makedirs(root, exist_ok=True)
+    return tempfile.mkstemp(dir=root, suffix=TEMP_SUFFIX)
+
+
+class HashingFile:
+    """
+    Temp file in the upload folder that SHA-256s everything written to it.
+
+    StreamingUploadRequest hands these to Werkzeug's multipart parser, so file parts
+    go straight to disk in the parser's chunks and arrive already hashed. A store
+    adopts the file by renaming it; anything not adopted is deleted on close().
+    """
+
+    def __init__(self, root):
+        fd, self.path = make_temp(root)
+        self._file = os.fdopen(fd, 'w+b')
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self._digest.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+    def close(self):
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __getattr__(self, name):
+        # read/seek/tell/flush/... for Werkzeug's FileStorage
+        return getattr(self._file, name)
+
+
+class StreamingUploadRequest(Request):
+    """Flask request whose uploaded files are streamed to HashingFiles in UPLOAD_FOLDER."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return HashingFile(current_app.config['UPLOAD_FOLDER'])
+
+
+def receive(file_storage, root, chunk_size=CHUNK_BYTES):
+    """
+    (temp_path, sha256, size) for an uploaded file. A HashingFile is used as is;
+    any other stream is copied into `root` in `chunk_size` pieces while hashing.
+    The caller renames or deletes temp_path.
+    """
+    stream = file_storage.stream
+    if isinstance(stream, HashingFile):
+        stream.flush()
+        return stream.path, stream.hexdigest(), stream.size
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = make_temp(root)
+    with os.fdopen(fd, 'wb') as out:
+        for chunk in iter(lambda: stream.read(chunk_size), b''):
+            digest.update(chunk)
+            out.write(chunk)
+            size += len(chunk)
+    return temp_path, digest.hexdigest(), size
+
+
+def adopt(temp_path, path):
+    """Move a received file to its content-addressed `path`; False if that content was already stored."""
+    if os.path.exists(path):
+        # Reuse counts as a write for retention, so the janitor keeps files still in use.
+        os.utime(path)
+        os.remove(temp_path)
+        return False
+    # A plain rename unless the folders are on different filesystems.
+    shutil.move(temp_path, path)
+    return True
+
+
+class UploadStore:
+    """
+    Content-addressed storage for uploaded documents (resumes).
+
+    Files are named `<prefix>_<sha256[:32]><ext>`, so the same resume uploaded again,
+    by anyone, maps to the one stored file and URL. Files over `max_bytes` or with an
+    extension outside `allowed_extensions` are rejected.
+    """
+
+    def __init__(self, root, max_bytes=10 * 1024 * 1024, allowed_extensions=('.pdf',), chunk_size=CHUNK_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.allowed_extensions = tuple(allowed_extensions)
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self.counters = {'uploads': 0, 'deduplicated': 0, 'rejected': 0, 'bytes_in': 0, 'bytes_stored': 0}
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self.counters[key] += delta
+
+    def save(self, file_storage, prefix='resume'):
+        """Store an upload and return its StoredUpload; raises ValueError (or UploadTooLarge) if rejected."""
+        ext = os.path.splitext(file_storage.filename or '')[1].lower()
+        if self.allowed_extensions and ext not in self.allowed_extensions:
+            self._count(rejected=1)
+            raise ValueError(f"Unsupported file type '{ext or file_storage.filename}', expected {', '.join(self.allowed_extensions)}")
+        temp_path, digest, size = receive(file_storage, self.root, self.chunk_size)
+        try:
+            if size > self.max_bytes:
+                self._count(rejected=1)
+                raise UploadTooLarge(self.max_bytes)
+            name = f"{prefix}_{digest[:32]}{ext}"
+            stored = adopt(temp_path, os.path.join(self.root, name))
+            self._count(uploads=1, bytes_in=size, deduplicated=int(not stored), bytes_stored=size if stored else 0)
+            return StoredUpload(name, size, digest, not stored)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {**counters, 'max_bytes': self.max_bytes, 'allowed_extensions': list(self.allowed_extensions)}
+
+
+class UploadJanitor:
+    """
+    Retention for upload folders. `roots` maps each folder to the age in seconds after
+    which files not written or reused are deleted (0 keeps them forever); temp files
+    older than `temp_max_age` are deleted everywhere. Only the top level of each
+    folder is scanned; subfolders are listed separately.
+    """
+
+    def __init__(self, roots, temp_max_age=3600):
+        self.roots = dict(roots)
+        self.temp_max_age = temp_max_age
+        self._lock = threading.Lock()
+        self._thread = None
+        self.counters = {'runs': 0, 'removed': 0, 'removed_bytes': 0, 'errors': 0,
+                         'last_run_at': None, 'last_run_ms': None}
+
+    def collect(self):
+        started = time.perf_counter()
+        now = time.time()
+        removed = removed_bytes = errors = 0
+        for root, max_age in self.roots.items():
+            try:
+                entries = list(os.scandir(root))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    info = entry.stat(follow_symlinks=False)
+                    limit = self.temp_max_age if entry.name.endswith(TEMP_SUFFIXES) else max_age
+                    if limit and now - info.st_mtime > limit:
+                        os.remove(entry.path)
+                        removed += 1
+                        removed_bytes += info.st_size
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    errors += 1
+                    print(f"Upload cleanup failed for {entry.path}: {e}", file=sys.stderr)
+        with self._lock:
+            self.counters['runs'] += 1
+            self.counters['removed'] += removed
+            self.counters['removed_bytes'] += removed_bytes
+            self.counters['errors'] += errors
+            self.counters['last_run_at'] = now
+            self.counters['last_run_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return removed
+
+    def start(self, interval):
+        """Collect now in the background, then every `interval` seconds."""
+        if self._thread is not None:
+            return
+
+        def loop():
+            while True:
+                self.collect()
+                time.sleep(interval)
+
+        self._thread = threading.Thread(target=loop, name='upload-janitor', daemon=True)
+        self._thread.start()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {**counters, 'max_age': self.roots, 'temp_max_age': self.temp_max_age}